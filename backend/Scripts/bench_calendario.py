@@ -0,0 +1,249 @@
+# Scripts/bench_calendario.py
+# Parser benchmark for the ACB calendario page: single-pass walker vs the legacy parser.
+#
+#   cd backend
+#   python -m Scripts.bench_calendario                       # synthetic 34-jornada season
+#   python -m Scripts.bench_calendario --rounds 68 --games 9 # bigger synthetic page
+#   python -m Scripts.bench_calendario --html calendario.html --repeat 3
+#
+# Both parsers must return the same fixtures; mismatches are printed.
+
+import argparse
+import random
+import time
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+from app.scrapers.acb_calendario import (
+    JORNADA_RE,
+    SCORE_RE,
+    TEAM_ID_RE,
+    ParsedFixture,
+    _extract_team_id,
+    _fixture_sort_key,
+    _parse_es_date,
+    _parse_time,
+    parse_calendario_html,
+)
+
+MONTHS = ["enero", "febrero", "marzo", "abril", "mayo", "junio", "julio", "agosto",
+          "septiembre", "octubre", "noviembre", "diciembre"]
+
+SOURCE_URL = "https://www.acb.com/es/calendario?temporada=bench"
+
+
+def _team_link(team_id: int) -> str:
+    return (f'<a href="/club/plantilla/id/{team_id}" class="equipo">'
+            f'<img src="/logo/{team_id}.png" alt=""><span class="nombre">Equipo {team_id}</span></a>')
+
+
+def synth_calendar(rounds: int, games: int, seed: int = 1) -> str:
+    rng = random.Random(seed)
+    teams = list(range(1, 2 * games + 1))
+    day = date(2025, 9, 27)
+    parts = ["<html><head><title>Calendario</title></head><body><div class='calendario'>"]
+    for j in range(1, rounds + 1):
+        rng.shuffle(teams)
+        parts.append(f"<section class='jornada'><h2>Jornada {j}</h2>")
+        for g in range(games):
+            if g % 3 == 0:
+                d = day + timedelta(days=g // 3)
+                parts.append(f"<h3 class='fecha'>{d.day} de {MONTHS[d.month - 1]} de {d.year}</h3>")
+            home, away = teams[2 * g], teams[2 * g + 1]
+            finished = j < rounds // 2
+            hour = "XX:XX" if rng.random() < 0.1 else f"{rng.choice([12, 17, 18, 19, 20, 21])}:{rng.choice(['00', '30'])}"
+            score = f"<span class='resultado'>{rng.randint(60, 110)} - {rng.randint(60, 110)}</span>" if finished else ""
+            flag = "<span class='aviso'>Aplazado</span>" if rng.random() < 0.02 else ""
+            parts.append(
+                "<div class='partido'><div class='cabecera'><span class='hora'>"
+                f"{hour}</span>{flag}</div><div class='equipos'>"
+                f"<div class='local'>{_team_link(home)}</div>{score}"
+                f"<div class='visitante'>{_team_link(away)}</div></div>"
+                "<div class='enlaces'><a href='/partido/previa'>Previa</a><!-- tv --></div></div>"
+            )
+        parts.append("</section>")
+        day += timedelta(days=7)
+    parts.append("</div></body></html>")
+    return "".join(parts)
+
+
+def _nearest_previous_jornada_number(block) -> Optional[int]:
+    s = block.find_previous(string=JORNADA_RE)
+    if not s:
+        return None
+    m = JORNADA_RE.search(str(s))
+    return int(m.group(1)) if m else None
+
+
+def _nearest_previous_date(block) -> Optional[Tuple[int, int, int]]:
+    # Walk backwards through text nodes until we find a Spanish long date line
+    node = block
+    for _ in range(300):  # bounded so we never go crazy
+        node = node.find_previous(string=True)
+        if not node:
+            return None
+        dp = _parse_es_date(str(node))
+        if dp:
+            return dp
+    return None
+
+
+def _parse_calendario_html_legacy(html: str, *, source_url: str) -> List[ParsedFixture]:
+    # Previous per-link parser (climb + find_all per level, backwards text search
+    # per block), the reference the walker is checked against.
+    soup = BeautifulSoup(html, "lxml")
+
+    # 1) Find match blocks: nodes that contain exactly 2 team links.
+    #    We start from each team link and climb to a “small” parent that has the pair.
+    fixtures: List[ParsedFixture] = []
+    seen_blocks = set()
+
+    team_links_all = soup.find_all("a", href=TEAM_ID_RE)
+    if not team_links_all:
+        return []
+
+    for a in team_links_all:
+        block = a
+        for _ in range(8):
+            if not block or not hasattr(block, "find_all"):
+                break
+            links_in = block.find_all("a", href=TEAM_ID_RE)
+            if len(links_in) == 2:
+                break
+            block = block.parent
+
+        if not block or not hasattr(block, "find_all"):
+            continue
+
+        # Dedup by object identity
+        bid = id(block)
+        if bid in seen_blocks:
+            continue
+
+        links_in = block.find_all("a", href=TEAM_ID_RE)
+        if len(links_in) != 2:
+            continue
+
+        home_a, away_a = links_in[0], links_in[1]
+        home_id = _extract_team_id(home_a)
+        away_id = _extract_team_id(away_a)
+        if not home_id or not away_id or home_id == away_id:
+            continue
+
+        seen_blocks.add(bid)
+
+        # 2) Round number: nearest previous “Jornada N”
+        round_number = _nearest_previous_jornada_number(block)
+        if round_number is None:
+            # Without jornada, we can’t safely store this record.
+            continue
+
+        # 3) Date/time
+        date_parts = _nearest_previous_date(block)
+
+        # time usually appears inside the block (or as XX:XX)
+        time_parts: Optional[Tuple[int, int]] = None
+        block_lines = [t.strip() for t in block.get_text("\n", strip=True).split("\n") if t.strip()]
+        has_xx = any(line.strip().upper() == "XX:XX" for line in block_lines)
+        for line in block_lines:
+            tp = _parse_time(line)
+            if tp:
+                time_parts = tp
+                break
+
+        kickoff_at: Optional[datetime] = None
+        if date_parts:
+            y, mon, d = date_parts
+            if time_parts:
+                hh, mm = time_parts
+                kickoff_at = datetime(y, mon, d, hh, mm)
+            elif has_xx:
+                kickoff_at = None
+
+        # 4) Scores / finished
+        block_text = block.get_text(" ", strip=True)
+        sm = SCORE_RE.search(block_text)
+        if sm:
+            home_score = int(sm.group(1))
+            away_score = int(sm.group(2))
+            is_finished = True
+        else:
+            home_score = None
+            away_score = None
+            is_finished = False
+
+        # 5) Postponed / advanced (best-effort from text)
+        low = block_text.lower()
+        is_postponed = ("aplaz" in low) or ("suspend" in low)
+        is_advanced = ("adelant" in low)
+
+        fixtures.append(
+            ParsedFixture(
+                round_number=round_number,
+                home_team_id=str(home_id),
+                away_team_id=str(away_id),
+                kickoff_at=kickoff_at,
+                is_finished=is_finished,
+                home_score=home_score,
+                away_score=away_score,
+                is_postponed=is_postponed,
+                is_advanced=is_advanced,
+                source_url=source_url,
+            )
+        )
+
+    fixtures.sort(key=_fixture_sort_key)
+    return fixtures
+
+
+def _time(fn, html: str, repeat: int):
+    best = None
+    out = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn(html, source_url=SOURCE_URL)
+        dt = time.perf_counter() - t0
+        best = dt if best is None else min(best, dt)
+    return best, out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--html", help="Saved calendario page (default: synthetic season)")
+    ap.add_argument("--rounds", type=int, default=34)
+    ap.add_argument("--games", type=int, default=9, help="Games per jornada")
+    ap.add_argument("--repeat", type=int, default=5, help="Best-of-N timing")
+    args = ap.parse_args()
+
+    if args.html:
+        with open(args.html, encoding="utf-8") as f:
+            html = f.read()
+        label = args.html
+    else:
+        html = synth_calendar(args.rounds, args.games)
+        label = f"synthetic {args.rounds} jornadas x {args.games} games"
+
+    print(f"{label}: {len(html) / 1024:.0f} KiB")
+    t_new, new = _time(parse_calendario_html, html, args.repeat)
+    t_old, old = _time(_parse_calendario_html_legacy, html, args.repeat)
+
+    print("parser   | best_s  | fixtures")
+    print(f"legacy   | {t_old:7.3f} | {len(old)}")
+    print(f"walker   | {t_new:7.3f} | {len(new)}")
+    print(f"speedup  | {t_old / t_new:6.1f}x")
+
+    if new != old:
+        a, b = set(new), set(old)
+        print(f"MISMATCH: only walker={len(a - b)} only legacy={len(b - a)}")
+        for fx in sorted(a - b, key=repr)[:5]:
+            print("  walker:", fx)
+        for fx in sorted(b - a, key=repr)[:5]:
+            print("  legacy:", fx)
+        raise SystemExit(1)
+    print("outputs identical")
+
+
+if __name__ == "__main__":
+    main()
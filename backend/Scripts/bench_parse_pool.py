@@ -0,0 +1,234 @@
+# Scripts/bench_parse_pool.py
+# Parse-stage scaling report for bulk stats ingestion: legacy BeautifulSoup parser,
+# lxml parser in-process, and lxml in the parser process pool at several sizes
+# (the pool runs the full box-score parser, as fetch_games_stats does).
+#
+#   cd backend
+#   python -m Scripts.bench_parse_pool                        # 306 synthetic box scores
+#   python -m Scripts.bench_parse_pool --games 612 --workers 1,2,4,8,16
+#   python -m Scripts.bench_parse_pool --html estadisticas.html --games 200
+#
+# Every variant must return the same rows as the legacy parser; mismatches abort.
+
+import argparse
+import os
+import random
+import time
+from typing import Any
+
+from bs4 import BeautifulSoup
+
+from app.scrapers.acb_live_stats import (
+    _extract_acb_player_id,
+    _mmss_to_seconds,
+    parse_box_score_tuples,
+    parse_minutes_plusminus_tuples,
+    rows_from_box,
+    rows_from_tuples,
+)
+from app.scrapers.parse_pool import get_parse_pool, shutdown_parse_pool
+
+COLUMNS = ["D", "Nombre", "Min", "P", "T2", "T2 %", "T3", "T3 %", "T1", "T1 %", "T", "D", "O", "A",
+           "BR", "BP", "C", "F", "C", "M", "C", "R", "+/-", "V"]
+
+
+def _team_section(rng: random.Random, cls: str, base_id: int) -> str:
+    head = "".join(f"<th>{c}</th>" for c in COLUMNS)
+    rows = []
+    for i in range(12):
+        pid = base_id + i
+        dorsal = f"*{i}" if i < 5 else str(i)
+        mins = f"{rng.randint(0, 36):02d}:{rng.randint(0, 59):02d}" if i < 11 else "&nbsp;"
+        cells = [f'<td class="dorsal">{dorsal}</td>',
+                 f'<td class="nombre jugador"><a href="/jugador/ver/{pid}-J.-Jugador{i}.html">J. Jugador{i}</a></td>',
+                 f"<td>{mins}</td>"]
+        cells += [f"<td>{rng.randint(0, 20)}</td>" if "%" in c or not c.startswith("T") or c == "T"
+                  else f"<td>{rng.randint(0, 5)}/{rng.randint(5, 10)}</td>" for c in COLUMNS[3:-2]]
+        cells += [f"<td>{rng.randint(-20, 20)}</td>", f"<td>{rng.randint(-5, 30)}</td>"]
+        rows.append(f"<tr>{''.join(cells)}</tr>")
+    rows.append('<tr class="equipo"><td></td><td class="nombre">Equipo</td>' + "<td></td>" * (len(COLUMNS) - 2) + "</tr>")
+    rows.append('<tr><td></td><td class="nombre entrenador">E. Entrenador</td>' + "<td></td>" * (len(COLUMNS) - 2) + "</tr>")
+    rows.append('<tr class="totales"><td></td><td>Total</td><td>200:00</td>' + "<td>0</td>" * (len(COLUMNS) - 3) + "</tr>")
+    return (f'<section class="{cls}"><h2>Equipo</h2><table data-toggle="table-estadisticas">'
+            f'<thead><tr><th colspan="3">&nbsp;</th><th colspan="20">Tiros</th></tr><tr>{head}</tr></thead>'
+            f"<tbody>{''.join(rows)}</tbody></table></section>")
+
+
+def synth_box_score(seed: int) -> str:
+    rng = random.Random(seed)
+    chrome = "".join(f"<li><a href='/menu/{i}'>Menú {i}</a></li>" for i in range(300))
+    scripts = "<script>" + "var a=1;" * 2000 + "</script>"
+    return ("<html><head><title>Estadísticas</title>" + scripts + "</head><body>"
+            f"<nav><ul>{chrome}</ul></nav><div class='datos_fecha'>12/10/2025 - 18:30</div>"
+            + _team_section(rng, "partido", 30000000 + seed * 100)
+            + _team_section(rng, "partido visitante", 30000050 + seed * 100)
+            + f"<footer>{chrome}</footer></body></html>")
+
+
+def _clean_text(node) -> str:
+    if node is None:
+        return ""
+    txt = node.get_text(strip=True)
+    return "" if txt == "\xa0" else txt
+
+
+def _parse_minutes_plusminus_legacy(html: str) -> list[dict]:
+    """
+    BeautifulSoup version of parse_minutes_plusminus, the baseline every variant is checked against.
+    Drop-in compatible return schema (same keys as your current live scraper):
+      - acb_player_id: str
+      - play_time: str | None
+      - minutes_seconds: int | None
+      - plus_minus: int | None
+      - is_started: bool | None
+
+    Parses OFFICIAL FINAL stats from acb.com HTML tables.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    out: list[dict[str, Any]] = []
+
+    # Two team sections:
+    # - Home: section.partido (not .visitante)
+    # - Away: section.partido.visitante
+    sections = [
+        soup.select_one("section.partido:not(.visitante)"),
+        soup.select_one("section.partido.visitante"),
+    ]
+
+    for sec in sections:
+        if not sec:
+            continue
+
+        table = sec.select_one("table[data-toggle='table-estadisticas']")
+        if not table:
+            continue
+
+        # Find the header row that contains the actual column names (Min, +/-)
+        header: list[str] | None = None
+        for tr in table.select("thead tr"):
+            ths = [th.get_text(strip=True) for th in tr.find_all("th")]
+            if "Min" in ths and "+/-" in ths:
+                header = ths
+                break
+        if not header:
+            continue
+
+        col_min = header.index("Min")
+        col_pm = header.index("+/-")
+
+        for tr in table.select("tbody tr"):
+            classes = tr.get("class", [])
+
+            # Skip non-player rows
+            if "equipo" in classes or "totales" in classes:
+                continue
+            if tr.select_one("td.nombre.entrenador") or tr.select_one("td.nombre_eliminados5f"):
+                continue
+
+            a = tr.select_one("td.nombre.jugador a[href^='/jugador/ver/']")
+            if not a:
+                continue
+
+            acb_player_id = _extract_acb_player_id(a.get("href", ""))
+            if not acb_player_id:
+                continue
+
+            tds = tr.find_all("td")
+            if len(tds) <= max(col_min, col_pm):
+                continue
+
+            # Starters are marked with '*' in dorsal cell (e.g. "*0", "*2")
+            dorsal_txt = _clean_text(tr.select_one("td.dorsal"))
+            is_started = True if dorsal_txt.startswith("*") else False
+
+            play_time = _clean_text(tds[col_min]) or None
+            pm_txt = _clean_text(tds[col_pm])
+
+            minutes_seconds = _mmss_to_seconds(play_time) if play_time else None
+
+            plus_minus = None
+            if pm_txt:
+                try:
+                    plus_minus = int(pm_txt)
+                except ValueError:
+                    plus_minus = None
+
+            out.append(
+                {
+                    "acb_player_id": str(acb_player_id),
+                    "play_time": play_time,
+                    "minutes_seconds": minutes_seconds,
+                    "plus_minus": plus_minus,
+                    "is_started": is_started,
+                }
+            )
+
+    # Deduplicate by player id (keep last)
+    uniq: dict[str, dict] = {}
+    for row in out:
+        uniq[row["acb_player_id"]] = row
+    return list(uniq.values())
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--html", help="Saved estadisticas page, parsed --games times (default: synthetic pages)")
+    ap.add_argument("--games", type=int, default=306, help="Pages per run (306 = one regular season)")
+    ap.add_argument("--workers", default=None, help="Comma-separated pool sizes (default: 1,2,4,... up to CPUs)")
+    ap.add_argument("--skip-legacy", action="store_true", help="Don't time the BeautifulSoup parser")
+    args = ap.parse_args()
+
+    if args.html:
+        with open(args.html, encoding="utf-8") as f:
+            page = f.read()
+        pages = [page] * args.games
+    else:
+        pages = [synth_box_score(i) for i in range(args.games)]
+
+    cpus = os.cpu_count() or 1
+    if args.workers:
+        sizes = [int(w) for w in args.workers.split(",") if w.strip()]
+    else:
+        sizes = [w for w in (1, 2, 4, 8, 16, 32) if w <= cpus] or [1]
+
+    print(f"{len(pages)} pages, {sum(map(len, pages)) / len(pages) / 1024:.0f} KiB avg, {cpus} CPUs")
+    expected = None
+    results = []  # (label, seconds)
+
+    if not args.skip_legacy:
+        t0 = time.perf_counter()
+        expected = [_parse_minutes_plusminus_legacy(p) for p in pages]
+        results.append(("bs4 html.parser, 1 thread", time.perf_counter() - t0))
+
+    t0 = time.perf_counter()
+    serial = [rows_from_tuples(parse_minutes_plusminus_tuples(p)) for p in pages]
+    results.append(("lxml min/+/-, in-process", time.perf_counter() - t0))
+    expected = expected or serial
+    if serial != expected:
+        raise SystemExit("MISMATCH: lxml parser vs legacy parser")
+
+    t0 = time.perf_counter()
+    full = [rows_from_box(parse_box_score_tuples(p)) for p in pages]
+    results.append(("lxml box score, in-process", time.perf_counter() - t0))
+    baseline = results[-1][1]
+    if full != expected:
+        raise SystemExit("MISMATCH: box-score parser vs legacy parser")
+
+    for n in sizes:
+        pool = get_parse_pool(n)
+        list(pool.map(parse_box_score_tuples, pages[: n * 2]))  # warm up: spawn + imports
+        t0 = time.perf_counter()
+        out = [rows_from_box(r) for r in pool.map(parse_box_score_tuples, pages, chunksize=4)]
+        results.append((f"lxml box score, pool x{n}", time.perf_counter() - t0))
+        shutdown_parse_pool()  # one size at a time
+        if out != expected:
+            raise SystemExit(f"MISMATCH: pool x{n}")
+
+    print(f"{'parser':<30}| {'wall_s':>7} | {'ms/page':>7} | {'pages/s':>8} | vs in-process")
+    for label, dt in results:
+        print(f"{label:<30}| {dt:7.3f} | {dt / len(pages) * 1000:7.2f} | {len(pages) / dt:8.0f} | {baseline / dt:5.2f}x")
+    print("outputs identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# Scripts/bench_reseed_offline.py
+# Offline throughput benchmark for the final-stats reseed pipeline.
+#
+# 1) Record a corpus once (needs network), e.g. run a normal season reseed with:
+#      SCRAPER_HTTP_MODE=record SCRAPER_CORPUS_DIR=./acb_corpus uvicorn app.main:app
+# 2) Replay it anywhere (no network):
+#      cd backend
+#      python -m Scripts.bench_reseed_offline --corpus ./acb_corpus --latency-ms 150 --jitter-ms 100
+#      python -m Scripts.bench_reseed_offline --corpus ./acb_corpus --concurrency 1,4,8,16 --error-rate 0.02
+
+import argparse
+import re
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db.base import Base
+import app.models  # noqa: F401
+from app.crud.crud_game_player_stat import upsert_game_player_stats
+from app.scrapers import http
+from app.scrapers.replay import iter_corpus_urls
+from app.services.stats_fetch import fetch_games_stats
+
+RX_STATS_GAME_ID = re.compile(r"/partido/estadisticas/id/(\d+)")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--corpus", default=settings.SCRAPER_CORPUS_DIR, help="Recorded corpus directory")
+    ap.add_argument("--season-id", default="2025-26")
+    ap.add_argument("--concurrency", default="1,4,8,16", help="Comma-separated list to sweep")
+    ap.add_argument("--latency-ms", type=float, default=100.0)
+    ap.add_argument("--jitter-ms", type=float, default=50.0)
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--seed", type=int, default=1234)
+    ap.add_argument("--no-db", action="store_true", help="Skip DB writes (network + parse only)")
+    args = ap.parse_args()
+
+    # Replay only, and no HTML cache (otherwise the second run never "downloads")
+    settings.SCRAPER_HTTP_MODE = "replay"
+    settings.SCRAPER_CORPUS_DIR = args.corpus
+    settings.SCRAPER_REPLAY_LATENCY_MS = args.latency_ms
+    settings.SCRAPER_REPLAY_JITTER_MS = args.jitter_ms
+    settings.SCRAPER_REPLAY_ERROR_RATE = args.error_rate
+    settings.SCRAPER_REPLAY_SEED = args.seed
+    settings.SCRAPER_CACHE_ENABLED = False
+    http.close_clients()
+
+    game_ids = []
+    for url in iter_corpus_urls(args.corpus):
+        m = RX_STATS_GAME_ID.search(url)
+        if m:
+            game_ids.append(m.group(1))
+    game_ids = sorted(set(game_ids))
+    if not game_ids:
+        raise SystemExit(f"No stats pages found in corpus: {args.corpus}")
+
+    print(f"corpus={args.corpus} games={len(game_ids)} latency={args.latency_ms}+{args.jitter_ms}ms "
+          f"error_rate={args.error_rate}")
+    print("concurrency | elapsed_s | games/s | ok | errors | rows")
+
+    for n in [int(x) for x in args.concurrency.split(",") if x.strip()]:
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine, autoflush=False)()
+
+        stats = {"ok": 0, "errors": 0, "rows": 0}
+
+        def _store(res):
+            if res.error is not None:
+                stats["errors"] += 1
+                return
+            stats["ok"] += 1
+            stats["rows"] += len(res.rows or [])
+            if not args.no_db:
+                upsert_game_player_stats(db, args.season_id, res.acb_game_id, res.rows or [])
+
+        t0 = time.perf_counter()
+        fetch_games_stats(game_ids, concurrency=n, on_result=_store)
+        dt = time.perf_counter() - t0
+        db.close()
+        engine.dispose()
+
+        print(f"{n:11d} | {dt:9.2f} | {len(game_ids) / dt:7.1f} | {stats['ok']:2d} | {stats['errors']:6d} | {stats['rows']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+# Scripts/bench_round_commit.py
+# Round commit (draft -> base for every user at market close) on synthetic leagues:
+# set-based market_utils.commit_all_rosters vs the previous per-user loop.
+#
+#   cd backend
+#   python -m Scripts.bench_round_commit                          # 1k, 10k, 100k users
+#   python -m Scripts.bench_round_commit --users 50000 --changed 0.5
+#   python -m Scripts.bench_round_commit --legacy-max 0           # skip the per-user loop
+#
+# Each size is built twice in temporary SQLite files (same seed); both variants must
+# leave identical user_roster_base / budget_base contents, otherwise it aborts.
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+import app.models  # noqa: F401
+from app.models.roster import UserRosterBase, UserRosterDraft, UserSeasonState
+from app.models.user import User
+from app.services.market_utils import commit_all_rosters
+
+SEASON_ID = "2025-26"
+PLAYERS = [f"P{i:04d}" for i in range(300)]
+_CHUNK = 20_000
+
+
+def _engine(path: str):
+    e = create_engine(f"sqlite:///{path}")
+
+    @event.listens_for(e, "connect")
+    def _pragmas(dbapi_conn, _record):
+        # Same journal mode as app/db/session.py
+        dbapi_conn.execute("PRAGMA journal_mode=WAL")
+
+    Base.metadata.create_all(e)
+    return e
+
+
+def _build(engine, n_users: int, changed: float, seed: int) -> None:
+    rng = random.Random(seed)
+    users, states, base, draft = [], [], [], []
+    for uid in range(1, n_users + 1):
+        users.append({"user_id": uid, "email": f"u{uid}@bench", "password_hash": "x",
+                      "team_name": f"Team {uid}", "username": f"u{uid}"})
+        roster = rng.sample(PLAYERS, 10)
+        new = list(roster)
+        budget = 5_000_000
+        if rng.random() < changed:
+            # 1-3 transfers this week
+            for i in rng.sample(range(10), rng.randint(1, 3)):
+                new[i] = rng.choice([p for p in PLAYERS if p not in new])
+            budget -= rng.randint(1, 50) * 10_000
+        states.append({"user_id": uid, "season_id": SEASON_ID, "budget_base": 5_000_000,
+                       "budget_current": budget, "changes_used_total": 0, "is_preseason": 0})
+        base += [{"user_id": uid, "season_id": SEASON_ID, "player_id": p} for p in roster]
+        draft += [{"user_id": uid, "season_id": SEASON_ID, "player_id": p} for p in new]
+
+    with engine.begin() as conn:
+        for table, rows in ((User.__table__, users), (UserSeasonState.__table__, states),
+                            (UserRosterBase.__table__, base), (UserRosterDraft.__table__, draft)):
+            for i in range(0, len(rows), _CHUNK):
+                conn.execute(insert(table), rows[i:i + _CHUNK])
+
+
+def _commit_legacy(db) -> None:
+    # The per-user loop commit_round_if_needed used before (kept here as the baseline)
+    for u in db.query(User).all():
+        us = db.query(UserSeasonState).filter_by(user_id=u.user_id, season_id=SEASON_ID).first()
+        if not us:
+            continue
+        draft_ids = [r.player_id for r in db.query(UserRosterDraft).filter_by(user_id=u.user_id, season_id=SEASON_ID).all()]
+        db.query(UserRosterBase).filter_by(user_id=u.user_id, season_id=SEASON_ID).delete()
+        db.add_all([UserRosterBase(user_id=u.user_id, season_id=SEASON_ID, player_id=pid) for pid in draft_ids])
+        us.budget_base = us.budget_current
+    db.commit()
+
+
+def _snapshot(engine):
+    with engine.connect() as conn:
+        base = conn.execute(
+            UserRosterBase.__table__.select()
+            .with_only_columns(UserRosterBase.user_id, UserRosterBase.player_id)
+            .order_by(UserRosterBase.user_id, UserRosterBase.player_id)
+        ).all()
+        budgets = conn.execute(
+            UserSeasonState.__table__.select()
+            .with_only_columns(UserSeasonState.user_id, UserSeasonState.budget_base)
+            .order_by(UserSeasonState.user_id)
+        ).all()
+    return base, budgets
+
+
+def _run(n_users: int, changed: float, seed: int, legacy: bool, tmp: str) -> dict:
+    out = {"users": n_users}
+    snapshots = []
+    variants = [("bulk", None)] + ([("legacy", _commit_legacy)] if legacy else [])
+    for name, fn in variants:
+        path = os.path.join(tmp, f"commit_{name}_{n_users}.sqlite")
+        engine = _engine(path)
+        t = time.perf_counter()
+        _build(engine, n_users, changed, seed)
+        out["build_s"] = time.perf_counter() - t
+
+        db = sessionmaker(bind=engine)()
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *a: statements.append(1))
+        t = time.perf_counter()
+        if fn is None:
+            out["rows"] = commit_all_rosters(db, SEASON_ID)
+            db.commit()
+        else:
+            fn(db)
+        out[f"{name}_s"] = time.perf_counter() - t
+        out[f"{name}_statements"] = len(statements)
+        db.close()
+        snapshots.append(_snapshot(engine))
+        engine.dispose()
+
+    if len(snapshots) == 2 and snapshots[0] != snapshots[1]:
+        raise SystemExit(f"MISMATCH at {n_users} users: bulk commit != per-user loop")
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--users", default="1000,10000,100000", help="Comma-separated league sizes")
+    ap.add_argument("--changed", type=float, default=0.3, help="Fraction of users with transfers this round")
+    ap.add_argument("--legacy-max", type=int, default=10000, help="Largest size the per-user loop is timed at")
+    ap.add_argument("--seed", type=int, default=1234)
+    args = ap.parse_args()
+
+    sizes = [int(s) for s in args.users.split(",") if s.strip()]
+    print(f"{'users':>7} | {'build_s':>7} | {'bulk_s':>7} | {'stmts':>5} | {'legacy_s':>8} | {'stmts':>7} | speedup | rows written")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            r = _run(n, args.changed, args.seed, n <= args.legacy_max, tmp)
+            legacy = f"{r['legacy_s']:8.2f} | {r['legacy_statements']:7d} | {r['legacy_s'] / r['bulk_s']:6.1f}x" \
+                if "legacy_s" in r else f"{'-':>8} | {'-':>7} | {'-':>7}"
+            rows = r["rows"]
+            print(f"{n:7d} | {r['build_s']:7.2f} | {r['bulk_s']:7.3f} | {r['bulk_statements']:5d} | {legacy} | "
+                  f"-{rows['base_deleted']} +{rows['base_inserted']} budgets={rows['budgets_updated']}")
+    print("outputs identical" if any(n <= args.legacy_max for n in sizes) else "")
+
+
+if __name__ == "__main__":
+    main()
@@ -33,6 +33,11 @@ def main():
         cur = con.cursor()
         cur.execute(sql, (args.season_id,))
         changed = cur.rowcount
+        # round_state is derived from fixtures: drop it, the app rebuilds it on the next lookup
+        try:
+            cur.execute("DELETE FROM round_state WHERE season_id = ?", (args.season_id,))
+        except sqlite3.OperationalError:
+            pass  # older DB without round_state
         con.commit()
 
     print(f"DONE. Reset flags to False for {changed} fixture(s) in season {args.season_id}.")
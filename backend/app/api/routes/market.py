@@ -6,7 +6,7 @@ from app.db.session import get_db
 from app.models.market import MarketPlayerPrice
 from app.core.security import get_db
 from app.core.game_config import SEASON_ID
-from app.services.market_utils import compute_market_status, commit_round_if_needed
+from app.services.market_utils import compute_market_status
 
 router = APIRouter(prefix="/api/v1", tags=["market"])
 
@@ -35,7 +35,7 @@ def market(db: Session = Depends(get_db)):
 
 @router.get("/market/status")
 def market_status(db: Session = Depends(get_db)):
-    commit_round_if_needed(db)
+    # Solo lectura: el commit de jornada lo hace el worker al cerrar el mercado
     ms = compute_market_status(db)
     return {
         "season_id": ms.season_id,
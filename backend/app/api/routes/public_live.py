@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import List, Optional
+
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.services.live_games import live_hub
+
+router = APIRouter(prefix="/api/v1/public", tags=["public"])
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.get("/live/games")
+def public_live_games():
+    # Last known state of the games currently being polled (empty when nobody is subscribed)
+    return [g.snapshot() for g in live_hub.games.values()]
+
+
+@router.get("/live/stream")
+async def public_live_stream(
+    request: Request,
+    acb_game_id: Optional[List[str]] = Query(default=None),
+):
+    """
+    Server-Sent Events: `snapshot` (current state on connect), `delta` (changed players,
+    with d_minutes_seconds / d_plus_minus) and `ended` per game in progress.
+    Repeat ?acb_game_id= to follow only some games.
+    """
+    wanted = {g.strip() for g in acb_game_id if g.strip()} if acb_game_id else None
+
+    async def events():
+        q = live_hub.subscribe(wanted)
+        try:
+            while not await request.is_disconnected():
+                try:
+                    event, data = await asyncio.wait_for(q.get(), timeout=settings.LIVE_SSE_KEEPALIVE_S)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield _sse(event, data)
+        finally:
+            live_hub.unsubscribe(q)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -2,37 +2,34 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 
+from app.core.config import settings
 from app.core.security import get_current_user
 from app.core.game_config import (
     SEASON_ID, INITIAL_BUDGET, MAX_PLAYERS, MAX_PER_REAL_TEAM, MAX_TOTAL_CHANGES, MIN_BY_POSITION, ALL_POSITIONS
 )
 from app.db.session import get_db
 from app.models.user import User
-from app.models.market import MarketPlayerPrice
 from app.models.roster import UserSeasonState, UserRosterBase, UserRosterDraft, UserCaptain, UserDraftAction
-from app.schemas.team import CaptainRequest, InitTeamRequest, PlayerIdRequest
-from app.services.market_utils import compute_market_status, commit_round_if_needed, get_or_create_season_state
+from app.schemas.team import CaptainRequest, InitTeamRequest, PlayerIdRequest, TeamBatchRequest
+from app.services.market_index import MarketEntry, MarketIndex, get_market_index
+from app.services.market_utils import compute_market_status, get_or_create_season_state
 
 
 
 router = APIRouter(prefix="/api/v1/me", tags=["team"])
 
-def _count_positions_for_ids(db: Session, player_ids: set[str]) -> dict[str, int]:
+# Todas las validaciones de plantilla van contra el índice de mercado en memoria
+# (app/services/market_index.py): 1 lookup de versión por request, 0 queries a precios
+
+def _count_positions_for_ids(market: MarketIndex, player_ids: set[str]) -> dict[str, int]:
     counts = {pos: 0 for pos in ALL_POSITIONS}
     if not player_ids:
         return counts
 
-    rows = (
-        db.query(MarketPlayerPrice.position)
-        .filter(MarketPlayerPrice.season_id == SEASON_ID)
-        .filter(MarketPlayerPrice.player_id.in_(list(player_ids)))
-        .all()
-    )
-    # rows: list[tuple[str]]
-    for (pos,) in rows:
+    for pos, n in market.position_counts(player_ids).items():
         if pos not in counts:
             raise HTTPException(status_code=400, detail=f"Invalid player position in market: {pos}")
-        counts[pos] += 1
+        counts[pos] += n
     return counts
 
 
@@ -45,14 +42,14 @@ def _is_feasible_with_counts(counts: dict[str, int], remaining_slots: int) -> bo
     return missing <= remaining_slots
 
 
-def _allowed_positions_now(db: Session, draft_ids: set[str]) -> set[str]:
+def _allowed_positions_now(market: MarketIndex, draft_ids: set[str]) -> set[str]:
     # Con el draft actual, ¿qué posiciones puedo fichar ahora mismo?
     current_count = len(draft_ids)
     remaining_slots = MAX_PLAYERS - current_count
     if remaining_slots <= 0:
         return set()
 
-    counts = _count_positions_for_ids(db, draft_ids)
+    counts = _count_positions_for_ids(market, draft_ids)
 
     allowed = set()
     for pos in ALL_POSITIONS:
@@ -65,8 +62,8 @@ def _allowed_positions_now(db: Session, draft_ids: set[str]) -> set[str]:
     return allowed
 
 
-def _enforce_position_rules_on_add(db: Session, draft_ids: set[str], player_to_add: MarketPlayerPrice):
-    allowed = _allowed_positions_now(db, draft_ids)
+def _enforce_position_rules_on_add(market: MarketIndex, draft_ids: set[str], player_to_add: MarketEntry):
+    allowed = _allowed_positions_now(market, draft_ids)
     if player_to_add.position not in allowed:
         # Mensaje “útil” como el que quieres tú
         allowed_txt = ", ".join(sorted(allowed)) if allowed else "NONE"
@@ -76,9 +73,9 @@ def _enforce_position_rules_on_add(db: Session, draft_ids: set[str], player_to_a
         )
 
 
-def _enforce_final_roster_positions(db: Session, draft_ids: set[str]):
+def _enforce_final_roster_positions(market: MarketIndex, draft_ids: set[str]):
     # Para validación final (init_team / freeze / commit): con 10 jugadores, que cumpla mínimos.
-    counts = _count_positions_for_ids(db, draft_ids)
+    counts = _count_positions_for_ids(market, draft_ids)
     for pos, min_req in MIN_BY_POSITION.items():
         if counts[pos] < min_req:
             raise HTTPException(
@@ -117,17 +114,14 @@ def _count_changes_this_week(base_ids: set, draft_ids: set) -> int:
     # Como siempre son 10, esto equivale al nº de jugadores que han salido
     return len(base_ids - draft_ids)
 
-def _validate_max_per_real_team(db: Session, draft_ids: set):
-    # cuenta team_name en el draft
-    team_counts = {}
-    for pid in draft_ids:
-        mp = db.query(MarketPlayerPrice).filter_by(season_id=SEASON_ID, player_id=pid).first()
-        if not mp:
-            raise HTTPException(status_code=404, detail=f"Player {pid} not found in market")
-        team_counts[mp.team_id] = team_counts.get(mp.team_id, 0) + 1
-        if team_counts[mp.team_id] > MAX_PER_REAL_TEAM:
-            raise HTTPException(status_code=400, detail="Max 2 players per real team")
-        
+def _validate_max_per_real_team(market: MarketIndex, draft_ids: set):
+    # cuenta team_id en el draft
+    missing = market.missing(draft_ids)
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Player {sorted(missing)[0]} not found in market")
+    if any(n > MAX_PER_REAL_TEAM for n in market.team_counts(draft_ids).values()):
+        raise HTTPException(status_code=400, detail="Max 2 players per real team")
+
 
 def _get_active_round_or_0(ms) -> int:
     return int(ms.active_round or 0)
@@ -159,7 +153,7 @@ def _freeze_user_if_ready(db: Session, user_id: int, active_round: int):
     if len(draft_ids) != MAX_PLAYERS:
         return  # aún no está completo
     
-    _enforce_final_roster_positions(db, set(draft_ids))
+    _enforce_final_roster_positions(get_market_index(db), set(draft_ids))
 
     # capitán: si no hay, autoselecciona uno determinista
     cap = db.query(UserCaptain).filter_by(user_id=user_id, season_id=SEASON_ID).first()
@@ -197,13 +191,15 @@ def _guard_market_for_action(
     Reglas:
     - Si mercado abierto => OK para todo.
     - Si mercado cerrado:
+        - Si el worker aún no ha commiteado la jornada => 503 para todo (la base todavía
+          es la de la jornada anterior)
         - Si usuario ya congelado para esa ronda => prohibido para todo.
         - Si no congelado:
             - REMOVE y RESET siempre prohibidos
             - CAPTAIN prohibido
             - ADD/UNDO solo permitidos si draft_count < 10 (reparación)
     """
-    commit_round_if_needed(db)
+    # El commit de jornada ya lo hizo el worker (app/worker.py) al cerrar el mercado
     ms = compute_market_status(db)
     active_round = _get_active_round_or_0(ms)
 
@@ -212,6 +208,15 @@ def _guard_market_for_action(
     if ms.is_open:
         return ms, active_round, st  # normal
 
+    # mercado cerrado: hasta que el worker haga el commit de jornada no se toca nada
+    season_state = get_or_create_season_state(db)
+    if season_state.last_committed_round is None or season_state.last_committed_round < active_round:
+        raise HTTPException(
+            status_code=503,
+            detail="Round commit pending",
+            headers={"Retry-After": str(int(settings.ROUND_COMMIT_RECHECK_S))},
+        )
+
     # mercado cerrado
     if _is_user_frozen_for_round(st, active_round):
         raise HTTPException(status_code=403, detail="Market is closed (team already frozen)")
@@ -254,9 +259,10 @@ def my_team(user: User = Depends(get_current_user), db: Session = Depends(get_db
     changes_this_week = _count_changes_this_week(base_ids, draft_ids)
 
     # Traer info de mercado para mostrar roster draft
+    market = get_market_index(db)
     draft_players = []
     for pid in sorted(draft_ids):
-        mp = db.query(MarketPlayerPrice).filter_by(season_id=SEASON_ID, player_id=pid).first()
+        mp = market.get(pid)
         if mp:
             draft_players.append({
                 "player_id": mp.player_id,
@@ -318,27 +324,20 @@ def init_team(req: InitTeamRequest, user: User = Depends(get_current_user), db:
         raise HTTPException(status_code=400, detail="Duplicate player_id in initial team")
 
     # validar mercado + sumar precios
-    players = (
-        db.query(MarketPlayerPrice)
-        .filter(MarketPlayerPrice.season_id == SEASON_ID, MarketPlayerPrice.player_id.in_(ids))
-        .all()
-    )
-    if len(players) != MAX_PLAYERS:
+    market = get_market_index(db)
+    if market.missing(ids):
         raise HTTPException(status_code=400, detail="One or more player_id not found in market")
 
-    total_cost = sum(p.price_current for p in players)
+    total_cost = market.total_price(ids)
     if total_cost > st.budget_current:
         raise HTTPException(status_code=400, detail="Not enough budget for initial team")
 
     # max 2 por equipo real
-    team_counts = {}
-    for p in players:
-        team_counts[p.team_id] = team_counts.get(p.team_id, 0) + 1
-        if team_counts[p.team_id] > MAX_PER_REAL_TEAM:
-            raise HTTPException(status_code=400, detail="Max 2 players per real team")
-        
+    if any(n > MAX_PER_REAL_TEAM for n in market.team_counts(ids).values()):
+        raise HTTPException(status_code=400, detail="Max 2 players per real team")
+
     # --- Validación FINAL por puestos (equipo inicial ya completo) ---
-    _enforce_final_roster_positions(db, set(ids))
+    _enforce_final_roster_positions(market, set(ids))
 
 
     # guardar base y draft iguales
@@ -363,7 +362,8 @@ def add_player(req: PlayerIdRequest, user: User = Depends(get_current_user), db:
     if len(draft_ids) >= MAX_PLAYERS:
         raise HTTPException(status_code=400, detail="Team is full (10 players)")
 
-    mp = db.query(MarketPlayerPrice).filter_by(season_id=SEASON_ID, player_id=req.player_id).first()
+    market = get_market_index(db)
+    mp = market.get(req.player_id)
     if not mp:
         raise HTTPException(status_code=404, detail="Player not found in market")
 
@@ -373,10 +373,10 @@ def add_player(req: PlayerIdRequest, user: User = Depends(get_current_user), db:
     # simular draft final y validar max 2 por equipo real
     new_draft_ids = set(draft_ids)
     new_draft_ids.add(req.player_id)
-    _validate_max_per_real_team(db, new_draft_ids)
+    _validate_max_per_real_team(market, new_draft_ids)
 
     # --- Validación dinámica por puestos ---
-    _enforce_position_rules_on_add(db, draft_ids, mp)
+    _enforce_position_rules_on_add(market, draft_ids, mp)
 
     # aplicar
     db.add(UserRosterDraft(user_id=user.user_id, season_id=SEASON_ID, player_id=req.player_id))
@@ -398,7 +398,8 @@ def remove_player(req: PlayerIdRequest, user: User = Depends(get_current_user),
     ms, active_round, st = _guard_market_for_action(db, user.user_id, action="REMOVE")
 
     # 1) comprobar existe en mercado (para precio), y comprobar que no es el capitán
-    mp = db.query(MarketPlayerPrice).filter_by(season_id=SEASON_ID, player_id=req.player_id).first()
+    market = get_market_index(db)
+    mp = market.get(req.player_id)
     if not mp:
         raise HTTPException(status_code=404, detail="Player not found in market")
     
@@ -471,7 +472,8 @@ def undo_remove(req: PlayerIdRequest, user: User = Depends(get_current_user), db
     if len(draft_ids) >= MAX_PLAYERS:
         raise HTTPException(status_code=400, detail="Team is full (10 players)")
 
-    mp = db.query(MarketPlayerPrice).filter_by(season_id=SEASON_ID, player_id=req.player_id).first()
+    market = get_market_index(db)
+    mp = market.get(req.player_id)
     if not mp:
         raise HTTPException(status_code=404, detail="Player not found in market")
 
@@ -481,10 +483,10 @@ def undo_remove(req: PlayerIdRequest, user: User = Depends(get_current_user), db
     # validar max 2 por equipo real con el draft resultante
     new_draft_ids = set(draft_ids)
     new_draft_ids.add(req.player_id)
-    _validate_max_per_real_team(db, new_draft_ids)
+    _validate_max_per_real_team(market, new_draft_ids)
 
     # --- Validación dinámica por puestos ---
-    _enforce_position_rules_on_add(db, draft_ids, mp)
+    _enforce_position_rules_on_add(market, draft_ids, mp)
 
     # aplicar: re-añadir al draft + ajustar presupuesto
     db.add(UserRosterDraft(user_id=user.user_id, season_id=SEASON_ID, player_id=req.player_id))
@@ -499,3 +501,133 @@ def undo_remove(req: PlayerIdRequest, user: User = Depends(get_current_user), db
         _freeze_user_if_ready(db, user.user_id, active_round)
 
     return {"ok": True, "budget": st.budget_current, "count": len(new_draft_ids)}
+
+def _batch_op_error(i: int, op, status_code: int, msg: str) -> HTTPException:
+    # mismo mensaje que la ruta suelta, con la operación que falla
+    return HTTPException(status_code=status_code, detail=f"ops[{i}] {op.op} {op.player_id}: {msg}")
+
+@router.post("/team/batch")
+def team_batch(req: TeamBatchRequest, user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    """
+    Varias operaciones ADD / REMOVE / UNDO / CAPTAIN en una sola request:
+    - 1 comprobación de mercado (mismas reglas que las rutas sueltas)
+    - se simulan en orden en memoria (índice de mercado, 0 queries a precios)
+    - presupuesto, máx. por equipo real, puestos, tamaño y capitán se validan sobre el draft FINAL
+      (p. ej. un cambio dentro del mismo equipo real vale en cualquier orden)
+    - todo o nada: se escribe en una única transacción al final
+    """
+    ops = req.ops
+    # Mercado cerrado: REMOVE/CAPTAIN prohibidos; ADD/UNDO solo para completar huecos
+    restricted = next((o.op for o in ops if o.op in ("REMOVE", "CAPTAIN")), None)
+    ms, active_round, st = _guard_market_for_action(db, user.user_id, action=restricted or ops[0].op)
+
+    market = get_market_index(db)
+    initial_ids = _get_roster_ids(db, user.user_id, UserRosterDraft)
+    cap = db.query(UserCaptain).filter_by(user_id=user.user_id, season_id=SEASON_ID).first()
+    initial_captain = cap.captain_player_id if cap else None
+
+    # última acción de cada jugador a recuperar (UNDO solo tras un REMOVE)
+    last_action = {}
+    undo_ids = {o.player_id for o in ops if o.op == "UNDO"}
+    if undo_ids:
+        rows = (
+            db.query(UserDraftAction.player_id, UserDraftAction.action)
+            .filter(
+                UserDraftAction.user_id == user.user_id,
+                UserDraftAction.season_id == SEASON_ID,
+                UserDraftAction.player_id.in_(undo_ids),
+            )
+            .order_by(UserDraftAction.id.asc())
+            .all()
+        )
+        last_action = {pid: action for pid, action in rows}
+
+    # --- Simulación en orden ---
+    draft_ids = set(initial_ids)
+    budget = st.budget_current
+    captain = initial_captain
+    log = []  # acciones a registrar (para undo)
+    for i, o in enumerate(ops):
+        pid = o.player_id
+
+        if o.op == "CAPTAIN":
+            captain = pid
+            continue
+
+        mp = market.get(pid)
+        if not mp:
+            raise _batch_op_error(i, o, 404, "Player not found in market")
+
+        if o.op == "REMOVE":
+            if pid not in draft_ids:
+                raise _batch_op_error(i, o, 404, "Player not in your current team")
+            draft_ids.discard(pid)
+            budget += mp.price_current
+            log.append(("REMOVE", pid))
+        else:  # ADD / UNDO
+            if pid in draft_ids:
+                raise _batch_op_error(i, o, 400, "Player already in your current team")
+            if o.op == "UNDO" and last_action.get(pid) != "REMOVE":
+                raise _batch_op_error(i, o, 400, "This player was not removed in the current market session")
+            draft_ids.add(pid)
+            budget -= mp.price_current
+            log.append(("ADD", pid))
+        last_action[pid] = log[-1][0]
+
+    # --- Validación sobre el draft final ---
+    if len(draft_ids) > MAX_PLAYERS:
+        raise HTTPException(status_code=400, detail="Team is full (10 players)")
+
+    if budget < 0:
+        raise HTTPException(status_code=400, detail="Not enough budget")
+
+    _validate_max_per_real_team(market, draft_ids)
+
+    counts = _count_positions_for_ids(market, draft_ids)
+    if len(draft_ids) == MAX_PLAYERS:
+        _enforce_final_roster_positions(market, draft_ids)
+    elif not _is_feasible_with_counts(counts, MAX_PLAYERS - len(draft_ids)):
+        missing = [pos for pos, min_req in MIN_BY_POSITION.items() if counts[pos] < min_req]
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid roster: not enough free slots left for {', '.join(missing)}",
+        )
+
+    if captain is not None and captain not in draft_ids:
+        if captain == initial_captain:
+            raise HTTPException(status_code=400, detail="You must change captain before removing the current captain")
+        raise HTTPException(status_code=400, detail="Captain must be in your current team")
+
+    # --- Aplicar (una transacción) ---
+    removed = initial_ids - draft_ids
+    added = draft_ids - initial_ids
+    if removed:
+        db.query(UserRosterDraft).filter(
+            UserRosterDraft.user_id == user.user_id,
+            UserRosterDraft.season_id == SEASON_ID,
+            UserRosterDraft.player_id.in_(removed),
+        ).delete(synchronize_session=False)
+    db.add_all([UserRosterDraft(user_id=user.user_id, season_id=SEASON_ID, player_id=pid) for pid in sorted(added)])
+    st.budget_current = budget
+
+    if captain != initial_captain:
+        if cap:
+            cap.captain_player_id = captain
+        else:
+            db.add(UserCaptain(user_id=user.user_id, season_id=SEASON_ID, captain_player_id=captain))
+
+    db.add_all([UserDraftAction(user_id=user.user_id, season_id=SEASON_ID, action=action, player_id=pid) for action, pid in log])
+
+    db.commit()
+
+    # si mercado estaba cerrado, puede que acabemos de completar 10 -> congelar ahora
+    if not ms.is_open:
+        _freeze_user_if_ready(db, user.user_id, active_round)
+
+    return {
+        "ok": True,
+        "budget": st.budget_current,
+        "count": len(draft_ids),
+        "captain_player_id": captain,
+        "applied": len(ops),
+    }
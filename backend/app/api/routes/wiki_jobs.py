@@ -0,0 +1,71 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app.core.security import get_db, require_wiki
+from app.models.jobs import JOB_DONE, JOB_FAILED, Job
+from app.schemas.jobs import JobOut, JobResultOut, JobSubmitIn
+from app.services.jobs import enqueue_job, job_kind_names, job_to_dict
+
+router = APIRouter(prefix="/api/v1/wiki", tags=["wiki"])
+
+# Long scrapes run on the worker (python -m app.worker) instead of inside the request:
+# submit -> poll /jobs/{id} for progress -> /jobs/{id}/result
+
+
+@router.post("/jobs", response_model=JobOut, status_code=202)
+def submit_job(
+    payload: JobSubmitIn,
+    user=Depends(require_wiki),
+    db: Session = Depends(get_db),
+):
+    try:
+        job = enqueue_job(db, payload.kind, payload.payload, created_by=user.user_id)
+    except KeyError:
+        raise HTTPException(status_code=400, detail=f"Unknown job kind: {payload.kind}. Valid: {job_kind_names()}")
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False))
+    return job_to_dict(job)
+
+
+@router.get("/jobs", response_model=list[JobOut])
+def list_jobs(
+    status: str | None = None,
+    kind: str | None = None,
+    limit: int = Query(default=50, ge=1, le=500),
+    user=Depends(require_wiki),
+    db: Session = Depends(get_db),
+):
+    q = db.query(Job)
+    if status:
+        q = q.filter(Job.status == status)
+    if kind:
+        q = q.filter(Job.kind == kind)
+    return [job_to_dict(j) for j in q.order_by(Job.id.desc()).limit(limit).all()]
+
+
+@router.get("/jobs/{job_id}", response_model=JobOut)
+def get_job(
+    job_id: int,
+    user=Depends(require_wiki),
+    db: Session = Depends(get_db),
+):
+    job = db.get(Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_to_dict(job)
+
+
+@router.get("/jobs/{job_id}/result", response_model=JobResultOut)
+def get_job_result(
+    job_id: int,
+    user=Depends(require_wiki),
+    db: Session = Depends(get_db),
+):
+    job = db.get(Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status not in (JOB_DONE, JOB_FAILED):
+        raise HTTPException(status_code=409, detail=f"Job {job_id} is {job.status}")
+    d = job_to_dict(job, include_result=True)
+    return JobResultOut(id=d["id"], kind=d["kind"], status=d["status"], result=d["result"], error=d["error"])
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -10,6 +12,57 @@ class Settings(BaseSettings):
     JWT_ALG: str = "HS256"
     JWT_EXPIRE_MIN: int = 10080  # 7 días
 
+    # --- Scrapers ---
+    SCRAPER_CONCURRENCY: int = 8  # peticiones simultáneas máximas contra acb.com
+    SCRAPER_CACHE_ENABLED: bool = True
+    SCRAPER_CACHE_PATH: str = "./acb_http_cache.sqlite"  # caché HTML (fichero aparte de la BD del juego)
+    SCRAPER_CACHE_FRESH_S: float = 300.0  # dentro de esta ventana no se revalida (misma "pasada")
+    SCRAPER_KICKOFF_MEMO_TTL_S: float = 6 * 3600.0  # horarios de partidos no finalizados pueden cambiar
+    SCRAPER_RATE_PER_HOST_S: float = 8.0  # peticiones/s por host (token bucket compartido por todo el proceso; 0 => sin límite)
+    SCRAPER_RATE_BURST: int = 16  # ráfaga máxima del token bucket
+    SCRAPER_HTTP_RETRIES: int = 3  # reintentos por petición (errores de red, 429, 5xx) con backoff exponencial + jitter
+    SCRAPER_BACKOFF_S: float = 0.5
+    SCRAPER_BACKOFF_MAX_S: float = 30.0
+    SCRAPER_RETRY_AFTER_MAX_S: float = 120.0  # Retry-After mayor que esto => no se reintenta, se devuelve la respuesta
+    SCRAPER_BREAKER_FAILURES: int = 5  # fallos consecutivos que abren el circuito de un host (0 => desactivado)
+    SCRAPER_BREAKER_COOLDOWN_S: float = 30.0  # tiempo con el circuito abierto antes de la petición de prueba
+    SCRAPER_ARCHIVE_ENABLED: bool = True
+    SCRAPER_ARCHIVE_PATH: str = "./acb_html_archive.sqlite"  # todas las versiones de cada página (reprocesado offline)
+    SCRAPER_PARSE_WORKERS: int = -1  # procesos de parseo HTML en cargas masivas (-1 => nº de CPUs, máx. 4; 0 => en un hilo)
+
+    # live | record | replay (ver app/scrapers/replay.py)
+    SCRAPER_HTTP_MODE: str = "live"
+    SCRAPER_CORPUS_DIR: str = "./acb_corpus"
+    SCRAPER_REPLAY_LATENCY_MS: float = 0.0
+    SCRAPER_REPLAY_JITTER_MS: float = 0.0
+    SCRAPER_REPLAY_ERROR_RATE: float = 0.0
+    SCRAPER_REPLAY_SEED: Optional[int] = None
+
+    # --- Cola de trabajos (app/worker.py) ---
+    JOB_POLL_INTERVAL_S: float = 2.0
+    JOB_HEARTBEAT_S: float = 30.0
+    JOB_STALE_AFTER_S: float = 300.0  # sin heartbeat => el worker murió, se reencola
+    JOB_RETRY_BACKOFF_S: float = 60.0  # 60s, 120s, 240s...
+
+    # --- Ingesta automática de estadísticas (la lanza el worker) ---
+    INGEST_SCHEDULER_ENABLED: bool = True
+    INGEST_SCHEDULER_INTERVAL_S: float = 300.0
+    INGEST_GAME_DURATION_MIN: int = 120  # duración esperada de un partido desde el kickoff
+    INGEST_DELAY_AFTER_END_MIN: int = 30  # margen hasta que acb.com publica la estadística final
+    INGEST_LOOKBACK_DAYS: int = 7  # partidos más antiguos: reseed manual desde la wiki
+    INGEST_MAX_ATTEMPTS: int = 8
+    INGEST_RETRY_BACKOFF_S: float = 600.0  # 10 min, 20 min, 40 min...
+    INGEST_FINAL_STABLE_MIN: int = 5  # sin partidos finalizado: 2 lecturas idénticas separadas al menos esto (prórrogas)
+
+    # --- Commit de jornada (lo hace el worker al cerrar el mercado, nunca una request) ---
+    ROUND_COMMIT_SCHEDULER_ENABLED: bool = True
+    ROUND_COMMIT_RECHECK_S: float = 60.0  # como mucho entre comprobaciones (cambios de calendario)
+
+    # --- Directo (SSE /api/v1/public/live/stream) ---
+    LIVE_POLL_INTERVAL_S: float = 15.0  # solo mientras haya clientes conectados
+    LIVE_WINDOW_SLACK_MIN: int = 60  # prórrogas/retrasos sobre INGEST_GAME_DURATION_MIN
+    LIVE_SSE_KEEPALIVE_S: float = 20.0
+
     # Le dice a Pydantic que lea del archivo .env
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -1,59 +1,129 @@
 # app/crud/crud_fixture.py
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, Optional
+
+from sqlalchemy import func, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
+from app.crud.crud_round_state import refresh_round_state
 from app.models.fixtures import Fixture
 from app.scrapers.acb_partidos import ParsedFixture  # IMPORTANT: use the real one
 
-def upsert_fixtures(db: Session, season_id: str, parsed: list[ParsedFixture]) -> dict:
-    created = 0
-    updated = 0
 
+@dataclass(slots=True)
+class FixtureRow:
+    """One fixture to upsert (mutable so callers can inject flags before writing)."""
+    round_number: int
+    home_team_id: str
+    away_team_id: str
+    kickoff_at: Optional[datetime] = None
+    is_finished: bool = False
+    home_score: Optional[int] = None
+    away_score: Optional[int] = None
+    is_postponed: bool = False
+    is_advanced: bool = False
+    acb_game_id: Optional[str] = None
+    live_url: Optional[str] = None
+
+    @property
+    def key(self) -> tuple[int, str, str]:
+        return (self.round_number, self.home_team_id, self.away_team_id)
+
+    @classmethod
+    def from_parsed(cls, fx, **overrides) -> "FixtureRow":
+        # Any scraper's ParsedFixture (calendario's has no acb_game_id/live_url)
+        data = {
+            "round_number": fx.round_number,
+            "home_team_id": fx.home_team_id,
+            "away_team_id": fx.away_team_id,
+            "kickoff_at": fx.kickoff_at,
+            "is_finished": bool(fx.is_finished),
+            "home_score": fx.home_score,
+            "away_score": fx.away_score,
+            "is_postponed": bool(fx.is_postponed),
+            "is_advanced": bool(fx.is_advanced),
+            "acb_game_id": getattr(fx, "acb_game_id", None),
+            "live_url": getattr(fx, "live_url", None),
+        }
+        data.update(overrides)
+        return cls(**data)
+
+
+# SQLite before 3.32 caps a statement at 999 bound parameters; the upsert binds 12 per row
+_ROWS_PER_STATEMENT = 999 // 12
+
+
+def upsert_fixtures(db: Session, season_id: str, parsed: Iterable["FixtureRow | ParsedFixture"]) -> dict:
+    """
+    Bulk upsert keyed on uq_fixture_unique_match: one SELECT (for created/updated
+    counts) + one INSERT .. ON CONFLICT DO UPDATE per chunk, then commit.
+    acb_game_id / live_url are never overwritten with None/empty.
+    round_state of the touched rounds is refreshed in the same transaction.
+    """
     # Deduplicate within the batch (important with Next.js DOM repeating links/blocks)
-    uniq: dict[tuple[int, str, str], ParsedFixture] = {}
+    uniq: dict[tuple[int, str, str], FixtureRow] = {}
     for fx in parsed:
-        key = (fx.round_number, fx.home_team_id, fx.away_team_id)
-        uniq[key] = fx
-    parsed = list(uniq.values())
+        row = fx if isinstance(fx, FixtureRow) else FixtureRow.from_parsed(fx)
+        uniq[row.key] = row
+    rows = list(uniq.values())
 
-    for fx in parsed:
-        row = (
-            db.query(Fixture)
+    if not rows:
+        db.commit()
+        return {"created": 0, "updated": 0, "total": 0}
+
+    keys = list(uniq.keys())
+    existing: set[tuple[int, str, str]] = set()
+    for i in range(0, len(keys), _ROWS_PER_STATEMENT):
+        q = (
+            db.query(Fixture.round_number, Fixture.home_team_id, Fixture.away_team_id)
             .filter(
                 Fixture.season_id == season_id,
-                Fixture.round_number == fx.round_number,
-                Fixture.home_team_id == fx.home_team_id,
-                Fixture.away_team_id == fx.away_team_id,
+                tuple_(Fixture.round_number, Fixture.home_team_id, Fixture.away_team_id).in_(
+                    keys[i:i + _ROWS_PER_STATEMENT]
+                ),
             )
-            .one_or_none()
         )
+        existing.update((r, h, a) for r, h, a in q)
 
-        if row is None:
-            row = Fixture(
-                season_id=season_id,
-                round_number=fx.round_number,
-                home_team_id=fx.home_team_id,
-                away_team_id=fx.away_team_id,
-            )
-            db.add(row)
-            db.flush()  # make INSERT visible to subsequent queries
-            created += 1
-        else:
-            updated += 1
-
-        row.kickoff_at = fx.kickoff_at
-        row.is_finished = fx.is_finished
-        row.home_score = fx.home_score
-        row.away_score = fx.away_score
-
-        # We recompute these later; still accept incoming values
-        row.is_postponed = fx.is_postponed
-        row.is_advanced = fx.is_advanced
-
-        # IMPORTANT: do not overwrite a good value with None/empty
-        if fx.acb_game_id:
-            row.acb_game_id = fx.acb_game_id
-        if fx.live_url:
-            row.live_url = fx.live_url
+    for i in range(0, len(rows), _ROWS_PER_STATEMENT):
+        stmt = sqlite_insert(Fixture).values([
+            {
+                "season_id": season_id,
+                "round_number": fx.round_number,
+                "home_team_id": fx.home_team_id,
+                "away_team_id": fx.away_team_id,
+                "kickoff_at": fx.kickoff_at,
+                "is_finished": fx.is_finished,
+                "home_score": fx.home_score,
+                "away_score": fx.away_score,
+                # We recompute these later; still accept incoming values
+                "is_postponed": fx.is_postponed,
+                "is_advanced": fx.is_advanced,
+                "acb_game_id": fx.acb_game_id or None,
+                "live_url": fx.live_url or None,
+            }
+            for fx in rows[i:i + _ROWS_PER_STATEMENT]
+        ])
+        ex = stmt.excluded
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["season_id", "round_number", "home_team_id", "away_team_id"],
+            set_={
+                "kickoff_at": ex.kickoff_at,
+                "is_finished": ex.is_finished,
+                "home_score": ex.home_score,
+                "away_score": ex.away_score,
+                "is_postponed": ex.is_postponed,
+                "is_advanced": ex.is_advanced,
+                # IMPORTANT: do not overwrite a good value with None/empty
+                "acb_game_id": func.coalesce(ex.acb_game_id, Fixture.acb_game_id),
+                "live_url": func.coalesce(ex.live_url, Fixture.live_url),
+            },
+        )
+        db.execute(stmt)
 
+    refresh_round_state(db, season_id, {k[0] for k in keys})
     db.commit()
-    return {"created": created, "updated": updated, "total": len(parsed)}
+    created = sum(1 for k in keys if k not in existing)
+    return {"created": created, "updated": len(rows) - created, "total": len(rows)}
@@ -0,0 +1,67 @@
+from typing import Iterable, Mapping
+
+from sqlalchemy import delete, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models.game_box_scores import GameBoxScore
+from app.scrapers.acb_live_stats import BOX_FIELDS
+
+# Stored columns (play_time is only kept as seconds)
+BOX_COLUMNS = tuple(f for f in BOX_FIELDS if f not in ("acb_player_id", "play_time"))
+_I_COLUMNS = [BOX_FIELDS.index(f) for f in BOX_COLUMNS]
+
+# SQLite before 3.32 caps a statement at 999 bound parameters: each upserted row binds
+# its BOX_COLUMNS plus acb_game_id, acb_player_id and season_id
+_ROWS_PER_STATEMENT = 999 // (len(BOX_COLUMNS) + 3)
+
+
+def upsert_box_scores_bulk(
+    db: Session,
+    season_id: str,
+    box_by_game: Mapping[str, Iterable[tuple]],
+    *,
+    commit: bool = True,
+) -> dict:
+    """
+    Replace the box scores of these games with parse_box_score_tuples() rows:
+    one INSERT .. ON CONFLICT DO UPDATE per chunk, then players no longer listed are deleted.
+    """
+    items: dict[tuple[int, int], dict] = {}
+    for gid, box in box_by_game.items():
+        for b in box:
+            row = {f: b[i] for f, i in zip(BOX_COLUMNS, _I_COLUMNS)}
+            row["is_started"] = int(bool(row["is_started"]))
+            items[(int(gid), int(b[0]))] = {"acb_game_id": int(gid), "acb_player_id": int(b[0]),
+                                             "season_id": season_id, **row}
+
+    rows = list(items.values())
+    for i in range(0, len(rows), _ROWS_PER_STATEMENT):
+        stmt = sqlite_insert(GameBoxScore).values(rows[i:i + _ROWS_PER_STATEMENT])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["acb_game_id", "acb_player_id"],
+            set_={f: stmt.excluded[f] for f in ("season_id", *BOX_COLUMNS)},
+        )
+        db.execute(stmt)
+
+    deleted = 0
+    game_ids = [int(g) for g in box_by_game]
+    stale = []
+    for i in range(0, len(game_ids), _ROWS_PER_STATEMENT):
+        stored = db.query(GameBoxScore.acb_game_id, GameBoxScore.acb_player_id).filter(
+            GameBoxScore.acb_game_id.in_(game_ids[i:i + _ROWS_PER_STATEMENT])
+        )
+        stale.extend(k for k in stored if tuple(k) not in items)
+    for i in range(0, len(stale), _ROWS_PER_STATEMENT):
+        res = db.execute(
+            delete(GameBoxScore).where(
+                tuple_(GameBoxScore.acb_game_id, GameBoxScore.acb_player_id).in_(
+                    [tuple(k) for k in stale[i:i + _ROWS_PER_STATEMENT]]
+                )
+            )
+        )
+        deleted += res.rowcount or 0
+
+    if commit:
+        db.commit()
+    return {"written": len(rows), "deleted": deleted}
@@ -1,38 +1,151 @@
+import hashlib
+import json
+from typing import Iterable, Mapping
+
+from sqlalchemy import func, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
-from app.models.game_player_stats import GamePlayerStat
+from app.models.game_player_stats import GamePlayerStat, GameStatsDigest
+
+# Columns written from the parsed stats rows
+STAT_FIELDS = ("play_time", "minutes_seconds", "plus_minus", "is_started")
+
+# SQLite before 3.32 caps a statement at 999 bound parameters; the widest statements
+# here bind 7 per row (stats upsert), the (game, player) IN list 2
+_ROWS_PER_STATEMENT = 999 // 7
+
 
 def upsert_game_player_stats(db: Session, season_id: str, acb_game_id: str, rows: list[dict]) -> dict:
-    created = 0
-    updated = 0
+    return upsert_game_player_stats_bulk(db, season_id, {acb_game_id: rows})
+
 
-    for r in rows:
-        pid = r["acb_player_id"]
-        row = (
-            db.query(GamePlayerStat)
+def upsert_game_player_stats_bulk(
+    db: Session,
+    season_id: str,
+    rows_by_game: Mapping[str, Iterable[dict]],
+    *,
+    commit: bool = True,
+    prune_missing: bool = False,
+) -> dict:
+    """
+    Write many games' stats rows with one SELECT + one INSERT .. ON CONFLICT DO UPDATE
+    per chunk (instead of a query per player).
+    Rows whose stored values are identical are skipped and counted as unchanged.
+    prune_missing: also delete stored players of these games that are no longer in the box score.
+    """
+    # Last row wins if a player appears twice for the same game
+    incoming: dict[tuple[str, str], tuple] = {}
+    for gid, rows in rows_by_game.items():
+        for r in rows:
+            incoming[(str(gid), str(r["acb_player_id"]))] = tuple(r.get(f) for f in STAT_FIELDS)
+
+    if not incoming:
+        if commit:
+            db.commit()
+        return {"created": 0, "updated": 0, "unchanged": 0, "deleted": 0, "total": 0}
+
+    existing: dict[tuple[str, str], tuple] = {}
+    game_ids = sorted({gid for gid, _ in incoming})
+    for i in range(0, len(game_ids), _ROWS_PER_STATEMENT):
+        q = (
+            db.query(
+                GamePlayerStat.acb_game_id,
+                GamePlayerStat.acb_player_id,
+                *[getattr(GamePlayerStat, f) for f in STAT_FIELDS],
+            )
             .filter(
                 GamePlayerStat.season_id == season_id,
-                GamePlayerStat.acb_game_id == acb_game_id,
-                GamePlayerStat.acb_player_id == pid,
+                GamePlayerStat.acb_game_id.in_(game_ids[i:i + _ROWS_PER_STATEMENT]),
             )
-            .one_or_none()
         )
+        for gid, pid, *vals in q:
+            existing[(gid, pid)] = tuple(vals)
 
-        if row is None:
-            row = GamePlayerStat(
-                season_id=season_id,
-                acb_game_id=acb_game_id,
-                acb_player_id=pid,
-            )
-            db.add(row)
-            db.flush()
+    created = updated = unchanged = 0
+    to_write: list[dict] = []
+    for (gid, pid), vals in incoming.items():
+        old = existing.get((gid, pid))
+        if old is None:
             created += 1
+        elif old == vals:
+            unchanged += 1
+            continue
         else:
             updated += 1
+        to_write.append({
+            "season_id": season_id,
+            "acb_game_id": gid,
+            "acb_player_id": pid,
+            **dict(zip(STAT_FIELDS, vals)),
+        })
+
+    for i in range(0, len(to_write), _ROWS_PER_STATEMENT):
+        stmt = sqlite_insert(GamePlayerStat).values(to_write[i:i + _ROWS_PER_STATEMENT])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["season_id", "acb_game_id", "acb_player_id"],
+            set_={
+                **{f: stmt.excluded[f] for f in STAT_FIELDS},
+                # onupdate= isn't applied to ON CONFLICT updates
+                "updated_at": func.now(),
+            },
+        )
+        db.execute(stmt)
+
+    deleted = 0
+    if prune_missing:
+        stale = [k for k in existing if k not in incoming]
+        for i in range(0, len(stale), _ROWS_PER_STATEMENT):
+            deleted += db.query(GamePlayerStat).filter(
+                GamePlayerStat.season_id == season_id,
+                tuple_(GamePlayerStat.acb_game_id, GamePlayerStat.acb_player_id).in_(stale[i:i + _ROWS_PER_STATEMENT]),
+            ).delete(synchronize_session=False)
+
+    if commit:
+        db.commit()
+    return {"created": created, "updated": updated, "unchanged": unchanged, "deleted": deleted, "total": len(incoming)}
+
 
-        row.play_time = r.get("play_time")
-        row.minutes_seconds = r.get("minutes_seconds")
-        row.plus_minus = r.get("plus_minus")
-        row.is_started = r.get("is_started")
+def box_score_hash(rows: Iterable) -> str:
+    """
+    Order-independent sha1 of a game's parsed rows: full box-score tuples
+    (acb_live_stats.BOX_FIELDS) or stats dicts (STAT_FIELDS only).
+    """
+    canon = sorted(
+        list(r) if isinstance(r, (tuple, list)) else [str(r["acb_player_id"]), *(r.get(f) for f in STAT_FIELDS)]
+        for r in rows
+    )
+    return hashlib.sha1(json.dumps(canon, separators=(",", ":")).encode()).hexdigest()
 
-    db.commit()
-    return {"created": created, "updated": updated, "total": len(rows)}
+
+def get_game_digests(db: Session, season_id: str, acb_game_ids: Iterable[str]) -> dict[str, tuple[str, bool]]:
+    """acb_game_id -> (content_hash, is_final) for the games that have one."""
+    ids = sorted({str(g) for g in acb_game_ids})
+    out: dict[str, tuple[str, bool]] = {}
+    for i in range(0, len(ids), _ROWS_PER_STATEMENT):
+        q = (
+            db.query(GameStatsDigest.acb_game_id, GameStatsDigest.content_hash, GameStatsDigest.is_final)
+            .filter(GameStatsDigest.season_id == season_id, GameStatsDigest.acb_game_id.in_(ids[i:i + _ROWS_PER_STATEMENT]))
+        )
+        for gid, h, is_final in q:
+            out[gid] = (h, bool(is_final))
+    return out
+
+
+def save_game_digests(db: Session, season_id: str, digests: Mapping[str, tuple[str, int, bool]]) -> None:
+    """Upsert acb_game_id -> (content_hash, row_count, is_final); caller commits."""
+    items = [
+        {"season_id": season_id, "acb_game_id": str(gid), "content_hash": h, "row_count": n, "is_final": bool(final)}
+        for gid, (h, n, final) in digests.items()
+    ]
+    for i in range(0, len(items), _ROWS_PER_STATEMENT):
+        stmt = sqlite_insert(GameStatsDigest).values(items[i:i + _ROWS_PER_STATEMENT])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["season_id", "acb_game_id"],
+            set_={
+                "content_hash": stmt.excluded.content_hash,
+                "row_count": stmt.excluded.row_count,
+                "is_final": stmt.excluded.is_final,
+                "updated_at": func.now(),
+            },
+        )
+        db.execute(stmt)
@@ -0,0 +1,168 @@
+from datetime import datetime, timedelta
+from itertools import chain
+from typing import Iterable, Optional
+
+from sqlalchemy import and_, case, delete, event, func, inspect, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models.fixtures import Fixture
+from app.models.round_state import RoundState
+
+# Market window around a round (see market_utils.compute_market_status_for_round)
+MARKET_CLOSES_BEFORE = timedelta(hours=1)  # before the first relevant kickoff
+MARKET_OPENS_AFTER = timedelta(hours=24)   # after the last relevant game, once resolved
+
+
+def refresh_round_state(db: Session, season_id: str, round_numbers: Optional[Iterable[int]] = None) -> int:
+    """
+    Recompute round_state for these rounds (None => whole season) from fixtures:
+    one GROUP BY over the fixtures + one upsert; rounds left without fixtures are dropped.
+    Core statements on the session's connection only (safe inside a flush). Caller commits.
+    """
+    f = Fixture.__table__.c
+    rounds = None if round_numbers is None else sorted({int(r) for r in round_numbers})
+    if rounds == []:
+        return 0
+
+    relevant = and_(f.is_advanced == False, f.is_postponed == False)  # noqa: E712
+    q = (
+        select(
+            f.round_number,
+            func.count(),
+            func.sum(case((relevant, 1), else_=0)),
+            func.sum(case((and_(relevant, f.is_finished == False), 1), else_=0)),  # noqa: E712
+            func.min(case((relevant, f.kickoff_at))),
+            func.max(case((and_(relevant, f.is_finished == True), f.kickoff_at))),  # noqa: E712
+        )
+        .where(f.season_id == season_id)
+        .group_by(f.round_number)
+    )
+    if rounds is not None:
+        q = q.where(f.round_number.in_(rounds))
+
+    conn = db.connection()
+    now = datetime.utcnow()
+    rows = []
+    for rn, n, n_relevant, n_unfinished, first_ko, last_ko in conn.execute(q):
+        # Round with nothing relevant (all advanced/postponed): not resolved, so it doesn't get skipped
+        resolved = n_relevant > 0 and n_unfinished == 0
+        rows.append({
+            "season_id": season_id,
+            "round_number": rn,
+            "n_fixtures": n,
+            "n_relevant": n_relevant,
+            "n_unfinished": n_unfinished,
+            "first_kickoff_at": first_ko,
+            "last_kickoff_at": last_ko,
+            "is_resolved": resolved,
+            "market_closes_at": first_ko - MARKET_CLOSES_BEFORE if first_ko else None,
+            "market_opens_at": last_ko + MARKET_OPENS_AFTER if (resolved and last_ko) else None,
+            "updated_at": now,
+        })
+
+    if rows:
+        stmt = sqlite_insert(RoundState.__table__).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["season_id", "round_number"],
+            set_={c: stmt.excluded[c] for c in rows[0] if c not in ("season_id", "round_number")},
+        )
+        conn.execute(stmt)
+
+    gone = delete(RoundState.__table__).where(RoundState.season_id == season_id)
+    if rounds is not None:
+        gone = gone.where(RoundState.round_number.in_(rounds))
+    conn.execute(gone.where(RoundState.round_number.not_in([r["round_number"] for r in rows])))
+
+    # Written behind the ORM's back: reload any RoundState already in this session
+    for obj in list(db.identity_map.values()):
+        if isinstance(obj, RoundState) and inspect(obj).identity[0] == season_id:
+            db.expire(obj)
+    return len(rows)
+
+
+def get_round_state(db: Session, season_id: str, round_number: int) -> Optional[RoundState]:
+    return db.get(RoundState, (season_id, round_number))
+
+
+def get_active_round_state(db: Session, season_id: str) -> Optional[RoundState]:
+    """First unresolved round (ix_round_state_active), else the last round; None without fixtures."""
+    st = (
+        db.query(RoundState)
+        .filter(RoundState.season_id == season_id, RoundState.is_resolved == False)  # noqa: E712
+        .order_by(RoundState.round_number.asc())
+        .first()
+    )
+    if st is not None:
+        return st
+    return (
+        db.query(RoundState)
+        .filter(RoundState.season_id == season_id)
+        .order_by(RoundState.round_number.desc())
+        .first()
+    )
+
+
+def backfill_round_state(db: Session) -> list[str]:
+    """
+    One-off migration (init_db): rebuild round_state for every season with a fixture
+    round missing from it (fixtures written before the table existed, or only partly
+    covered by later flushes). Returns the rebuilt seasons; caller commits.
+    """
+    f = Fixture.__table__.c
+    rs = RoundState.__table__.c
+    missing = (
+        select(f.season_id)
+        .select_from(
+            Fixture.__table__.outerjoin(
+                RoundState.__table__,
+                and_(rs.season_id == f.season_id, rs.round_number == f.round_number),
+            )
+        )
+        .where(rs.round_number.is_(None))
+        .distinct()
+    )
+    seasons = sorted(db.execute(missing).scalars())
+    for season_id in seasons:
+        refresh_round_state(db, season_id)
+    return seasons
+
+
+# ============================
+# ORM writes
+# ============================
+# Fixtures changed through the ORM (wiki edits, flag recompute, stats ingestion)
+# are picked up at flush time; Core bulk writers (crud_fixture.upsert_fixtures,
+# seed _write_flags) call refresh_round_state themselves.
+
+_DIRTY_KEY = "round_state_dirty"
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_fixture_rounds(session, _flush_context, _instances) -> None:
+    keys = None
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if not isinstance(obj, Fixture):
+            continue
+        if keys is None:
+            keys = session.info.setdefault(_DIRTY_KEY, set())
+        keys.add((obj.season_id, obj.round_number))
+        state = inspect(obj)
+        # A fixture moved to another round/season also changes the old one
+        old_season = state.attrs.season_id.history.deleted
+        old_round = state.attrs.round_number.history.deleted
+        if old_season or old_round:
+            keys.add((old_season[0] if old_season else obj.season_id,
+                      old_round[0] if old_round else obj.round_number))
+
+
+@event.listens_for(Session, "after_flush")
+def _refresh_fixture_rounds(session, _flush_context) -> None:
+    keys = session.info.pop(_DIRTY_KEY, None)
+    if not keys:
+        return
+    by_season: dict[str, set[int]] = {}
+    for season_id, rn in keys:
+        by_season.setdefault(season_id, set()).add(rn)
+    for season_id, rounds in by_season.items():
+        refresh_round_state(session, season_id, rounds)
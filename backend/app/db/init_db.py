@@ -1,9 +1,19 @@
-from app.db.session import engine
+from app.db.session import SessionLocal, engine
 from app.db.base import Base
 
 # IMPORTANTE: esto "registra" los modelos antes de crear tablas
 import app.models  # noqa: F401
+from app.crud.crud_round_state import backfill_round_state
 
 
 def init_db():
     Base.metadata.create_all(bind=engine)
+    # Migración: round_state de BDs con fixtures anteriores a la tabla (o cubiertas solo en parte)
+    db = SessionLocal()
+    try:
+        seasons = backfill_round_state(db)
+        db.commit()
+        if seasons:
+            print(f"[init_db] round_state rebuilt for {', '.join(seasons)}", flush=True)
+    finally:
+        db.close()
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
@@ -11,6 +11,16 @@ engine = create_engine(
     connect_args=connect_args,
 )
 
+if settings.DATABASE_URL.startswith("sqlite"):
+    # La API y el worker (app/worker.py) comparten el fichero: WAL deja leer mientras
+    # el worker escribe, y busy_timeout espera al lock en vez de fallar al instante
+    @event.listens_for(engine, "connect")
+    def _sqlite_pragmas(dbapi_conn, _record):
+        cur = dbapi_conn.cursor()
+        cur.execute("PRAGMA journal_mode=WAL")
+        cur.execute("PRAGMA busy_timeout=30000")
+        cur.close()
+
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
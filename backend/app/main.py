@@ -1,6 +1,8 @@
 from fastapi import FastAPI
 from app.core.config import settings
 from app.db.init_db import init_db
+from app.db.session import SessionLocal
+from app.services.jobs import round_commit_worker_alive
 from app.api.routes.auth import router as auth_router
 from app.api.routes.me import router as me_router
 from app.api.routes.market import router as market_router
@@ -14,6 +16,8 @@ from app.api.routes.wiki_players import router as wiki_players_router
 from app.api.routes.public_catalog import router as public_catalog_router
 from app.api.routes.wiki_games import router as wiki_games_router
 from app.api.routes.public_stats import router as public_stats_router
+from app.api.routes.public_live import router as public_live_router
+from app.api.routes.wiki_jobs import router as wiki_jobs_router
 
 
 app = FastAPI(title="ACB PlusMinus")
@@ -27,13 +31,33 @@ app.include_router(fixtures_router)
 app.include_router(wiki_fixtures_router)
 app.include_router(wiki_players_router)
 app.include_router(wiki_games_router)
+app.include_router(wiki_jobs_router)
 app.include_router(public_catalog_router)
 app.include_router(public_stats_router)
+app.include_router(public_live_router)
 
 
 @app.on_event("startup")
 def on_startup():
     init_db()
+    _warn_if_no_round_commit_worker()
+
+
+def _warn_if_no_round_commit_worker():
+    # Rounds are committed only by app/worker.py; uvicorn alone never does it
+    if not settings.ROUND_COMMIT_SCHEDULER_ENABLED:
+        return
+    db = SessionLocal()
+    try:
+        alive = round_commit_worker_alive(db)
+    finally:
+        db.close()
+    if not alive:
+        print(
+            "[startup][WARN] ROUND_COMMIT_SCHEDULER_ENABLED but no worker has checked in: rounds won't be "
+            "committed (and team edits get 503 once the market closes) until `python -m app.worker` runs",
+            flush=True,
+        )
 
 app.include_router(auth_router)
 
@@ -1,9 +1,12 @@
 # Importa aquí los modelos para que SQLAlchemy los "vea" al crear tablas
 from app.models.user import User  # noqa: F401
-from app.models.market import MarketPlayerPrice  # noqa: F401
+from app.models.market import MarketPlayerPrice, MarketVersion  # noqa: F401
 from app.models.roster import UserSeasonState, UserRosterBase, UserRosterDraft, UserCaptain, UserDraftAction  # noqa: F401
 from app.models.teams import Team  # noqa: F401
 from app.models.fixtures import Fixture  # noqa: F401
 from app.models.season import SeasonState  # noqa: F401
 from app.models.players import Player  # noqa: F401
-from app.models.game_player_stats import GamePlayerStat #noqa: F401
\ No newline at end of file
+from app.models.game_player_stats import GamePlayerStat, GameStatsDigest  # noqa: F401
+from app.models.jobs import Job, WorkerHeartbeat  # noqa: F401
+from app.models.game_box_scores import GameBoxScore  # noqa: F401
+from app.models.round_state import RoundState  # noqa: F401
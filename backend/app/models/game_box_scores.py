@@ -0,0 +1,50 @@
+from sqlalchemy import Column, Index, Integer, SmallInteger, String
+from app.db.base import Base
+
+
+class GameBoxScore(Base):
+    """
+    Full per-player box score of a game (every column of the acb.com estadisticas table).
+    Integer columns only and a WITHOUT ROWID table clustered on (acb_game_id, acb_player_id),
+    so a game's rows are stored together and the player index covers season aggregates.
+    """
+    __tablename__ = "game_box_scores"
+
+    acb_game_id = Column(Integer, primary_key=True, autoincrement=False)    # 104459
+    acb_player_id = Column(Integer, primary_key=True, autoincrement=False)  # 30003966
+    season_id = Column(String(16), nullable=False)  # same as fixtures: "2025-26"
+
+    seconds = Column(SmallInteger, nullable=True)
+    is_started = Column(SmallInteger, nullable=False, default=0)
+
+    points = Column(SmallInteger, nullable=True)
+    t2_made = Column(SmallInteger, nullable=True)
+    t2_att = Column(SmallInteger, nullable=True)
+    t3_made = Column(SmallInteger, nullable=True)
+    t3_att = Column(SmallInteger, nullable=True)
+    t1_made = Column(SmallInteger, nullable=True)
+    t1_att = Column(SmallInteger, nullable=True)
+    reb_off = Column(SmallInteger, nullable=True)
+    reb_def = Column(SmallInteger, nullable=True)
+    reb_total = Column(SmallInteger, nullable=True)
+    assists = Column(SmallInteger, nullable=True)
+    steals = Column(SmallInteger, nullable=True)
+    turnovers = Column(SmallInteger, nullable=True)
+    fastbreaks = Column(SmallInteger, nullable=True)
+    blocks = Column(SmallInteger, nullable=True)
+    blocks_against = Column(SmallInteger, nullable=True)
+    dunks = Column(SmallInteger, nullable=True)
+    fouls = Column(SmallInteger, nullable=True)
+    fouls_drawn = Column(SmallInteger, nullable=True)
+    plus_minus = Column(SmallInteger, nullable=True)
+    valoracion = Column(SmallInteger, nullable=True)
+
+    __table_args__ = (
+        # Covering index for per-player season totals (no table lookups)
+        Index(
+            "ix_gbs_player_season_cover",
+            "acb_player_id", "season_id", "seconds", "points", "reb_total", "assists", "plus_minus", "valoracion",
+        ),
+        Index("ix_gbs_season_game", "season_id", "acb_game_id"),
+        {"sqlite_with_rowid": False},
+    )
@@ -29,3 +29,22 @@ class GamePlayerStat(Base):
     __table_args__ = (
         UniqueConstraint("season_id", "acb_game_id", "acb_player_id", name="uq_gps_game_player"),
     )
+
+
+class GameStatsDigest(Base):
+    """One row per ingested game: hash of its parsed box score (see crud_game_player_stat.box_score_hash)."""
+    __tablename__ = "game_stats_digests"
+
+    id = Column(Integer, primary_key=True)
+    season_id = Column(String(16), nullable=False)
+    acb_game_id = Column(String(32), nullable=False)
+
+    content_hash = Column(String(40), nullable=False)  # sha1 hex
+    row_count = Column(Integer, nullable=False)
+    is_final = Column(Boolean, nullable=False, default=False)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("season_id", "acb_game_id", name="uq_gsd_game"),
+    )
@@ -0,0 +1,54 @@
+from datetime import datetime
+
+from sqlalchemy import Boolean, Column, DateTime, Index, Integer, String, Text
+
+from app.db.base import Base
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+
+class Job(Base):
+    """Background job (wiki scrapes, scheduled ingestion) run by app/worker.py."""
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False, index=True)
+    status = Column(String, nullable=False, default=JOB_QUEUED)
+
+    # JSON text (SQLite simple)
+    payload_json = Column(Text, nullable=False, default="{}")
+    progress_json = Column(Text, nullable=True)
+    result_json = Column(Text, nullable=True)
+    error = Column(Text, nullable=True)
+
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=1)
+    run_after = Column(DateTime, nullable=False, default=datetime.utcnow)  # not claimed before this (UTC)
+
+    # At most one queued/running job per key (e.g. "stats:104459")
+    dedupe_key = Column(String, nullable=True, index=True)
+
+    created_by = Column(Integer, nullable=True)  # users.user_id
+    worker_id = Column(String, nullable=True)
+
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_jobs_status_run_after", "status", "run_after"),
+    )
+
+
+class WorkerHeartbeat(Base):
+    """One row per app/worker.py process; the round-commit thread refreshes it on every tick."""
+    __tablename__ = "worker_heartbeats"
+
+    worker_id = Column(String, primary_key=True)  # host:pid
+    round_commit = Column(Boolean, nullable=False, default=False)
+    started_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_seen_at = Column(DateTime, nullable=False, default=datetime.utcnow)  # UTC
@@ -1,6 +1,10 @@
 from datetime import datetime
+from itertools import chain
+from typing import Optional
 
-from sqlalchemy import Column, Integer, String, UniqueConstraint, ForeignKey
+from sqlalchemy import Column, DateTime, Integer, String, UniqueConstraint, ForeignKey, event, literal, select, true, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
 
 from app.db.base import Base
 
@@ -26,3 +30,63 @@ class MarketPlayerPrice(Base):
     __table_args__ = (
         UniqueConstraint("season_id", "player_id", name="uq_market_player_season_player"),
     )
+
+
+class MarketVersion(Base):
+    # Se incrementa con cada escritura en market_player_prices (eventos de sesión abajo):
+    # app/services/market_index.py solo reconstruye su índice en memoria cuando cambia
+    __tablename__ = "market_version"
+
+    season_id = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+def bump_market_version(conn, season_id: Optional[str] = None) -> None:
+    """+1 a la versión de esa temporada (None => de todas). Va en la transacción de `conn`."""
+    now = datetime.utcnow()
+    if season_id is None:
+        conn.execute(update(MarketVersion.__table__).values(version=MarketVersion.version + 1, updated_at=now))
+        # temporadas con precios pero aún sin fila de versión (0 => 1)
+        # (el WHERE evita la ambigüedad de SQLite entre INSERT..SELECT y ON CONFLICT)
+        seasons = select(MarketPlayerPrice.__table__.c.season_id, literal(1), literal(now)).distinct().where(true())
+        conn.execute(
+            sqlite_insert(MarketVersion.__table__)
+            .from_select(["season_id", "version", "updated_at"], seasons)
+            .on_conflict_do_nothing(index_elements=["season_id"])
+        )
+        return
+    stmt = sqlite_insert(MarketVersion.__table__).values(season_id=season_id, version=1, updated_at=now)
+    conn.execute(stmt.on_conflict_do_update(
+        index_elements=["season_id"],
+        set_={"version": MarketVersion.__table__.c.version + 1, "updated_at": now},
+    ))
+
+
+_DIRTY_KEY = "market_version_dirty"
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_market_writes(session, _flush_context, _instances) -> None:
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, MarketPlayerPrice):
+            session.info.setdefault(_DIRTY_KEY, set()).add(obj.season_id)
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_after_flush(session, _flush_context) -> None:
+    for season_id in session.info.pop(_DIRTY_KEY, ()):
+        bump_market_version(session.connection(), season_id)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _bump_after_bulk(orm_execute_state) -> None:
+    # query(MarketPlayerPrice).update()/.delete(), ORM bulk insert/update: season unknown => todas
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None or mapper.class_ is not MarketPlayerPrice:
+        return
+    result = orm_execute_state.invoke_statement()
+    bump_market_version(orm_execute_state.session.connection())
+    return result
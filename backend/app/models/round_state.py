@@ -0,0 +1,30 @@
+from sqlalchemy import Boolean, Column, DateTime, Index, Integer, String
+from datetime import datetime
+from app.db.base import Base
+
+
+class RoundState(Base):
+    # Estado materializado de cada jornada (lo mantiene app/crud/crud_round_state.py
+    # cada vez que se escriben fixtures); jornada activa y mercado = 1 lookup indexado
+    __tablename__ = "round_state"
+
+    season_id = Column(String, primary_key=True)
+    round_number = Column(Integer, primary_key=True)
+
+    n_fixtures = Column(Integer, nullable=False, default=0)
+    n_relevant = Column(Integer, nullable=False, default=0)    # ni adelantados ni aplazados
+    n_unfinished = Column(Integer, nullable=False, default=0)  # relevantes sin terminar
+
+    first_kickoff_at = Column(DateTime, nullable=True)  # primer kickoff relevante
+    last_kickoff_at = Column(DateTime, nullable=True)   # último kickoff relevante ya jugado
+    is_resolved = Column(Boolean, nullable=False, default=False)
+
+    market_closes_at = Column(DateTime, nullable=True)  # first_kickoff_at - 1h
+    market_opens_at = Column(DateTime, nullable=True)   # last_kickoff_at + 24h (solo si resuelta)
+
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        # jornada activa: primera no resuelta de la temporada
+        Index("ix_round_state_active", "season_id", "is_resolved", "round_number"),
+    )
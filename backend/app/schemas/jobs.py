@@ -0,0 +1,34 @@
+from datetime import datetime
+from typing import Any, Optional
+
+from pydantic import BaseModel
+
+
+class JobSubmitIn(BaseModel):
+    kind: str  # reseed_fixtures | reseed_playerstats | scrape_players | resync_players | ingest_game_stats
+    payload: dict = {}  # same body as the matching synchronous endpoint
+
+
+class JobOut(BaseModel):
+    id: int
+    kind: str
+    status: str  # queued | running | done | failed
+    payload: dict
+    progress: Optional[dict] = None  # {"done", "total", "last", "steps": [...]}
+    error: Optional[str] = None
+    attempts: int
+    max_attempts: int
+    dedupe_key: Optional[str] = None
+    created_by: Optional[int] = None
+    created_at: datetime
+    run_after: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class JobResultOut(BaseModel):
+    id: int
+    kind: str
+    status: str
+    result: Optional[Any] = None
+    error: Optional[str] = None
@@ -1,4 +1,6 @@
-from pydantic import BaseModel
+from typing import Literal
+
+from pydantic import BaseModel, Field
 
 class CaptainRequest(BaseModel):
     player_id: str
@@ -11,3 +13,11 @@ class PlayerIdRequest(BaseModel):
 
 class InitTeamRequest(BaseModel):
     player_ids: list[str]
+
+class TeamOp(BaseModel):
+    op: Literal["ADD", "REMOVE", "UNDO", "CAPTAIN"]
+    player_id: str
+
+class TeamBatchRequest(BaseModel):
+    # Se aplican en orden, todas o ninguna (POST /api/v1/me/team/batch)
+    ops: list[TeamOp] = Field(min_length=1, max_length=50)
@@ -0,0 +1,28 @@
+from pydantic import BaseModel, Field
+
+from app.core.game_config import SEASON_ID
+
+
+class ReseedFixturesIn(BaseModel):
+    season_id: str = Field(default=SEASON_ID)
+    start_round_number: int = Field(default=1, ge=1, le=60)
+    rounds: int = Field(ge=1, le=60)
+
+    # optional:
+    replace_rounds: bool = Field(default=False)
+    tol_minutes: int = Field(default=0, ge=0, le=180)
+    include_flagged: bool = Field(default=True)
+
+
+class ReseedFixturesOut(BaseModel):
+    season_id: str
+    rounds_requested: int
+    upsert_created: int
+    upsert_updated: int
+    parsed_total: int
+    flags_updated_rows: int
+    advanced: int
+    postponed: int
+    flagged: list[dict] = []
+    warnings: list[str] = []
+    rounds_incomplete: list[dict] = []
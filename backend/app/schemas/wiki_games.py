@@ -0,0 +1,38 @@
+from pydantic import BaseModel, Field
+
+
+class ReseedPlayerStatsIn(BaseModel):
+    season_id: str
+    start_round_number: int = Field(default=1, ge=1, le=60)
+    rounds: int = Field(ge=1, le=60)
+    replace: bool = False  # delete existing rows for those games first
+    force: bool = False  # re-fetch finished games that already have a content hash
+    concurrency: int | None = Field(default=None, ge=1, le=32)  # None => settings.SCRAPER_CONCURRENCY
+
+
+class ReseedPlayerStatsOut(BaseModel):
+    season_id: str
+    rounds_requested: int
+    games_found: int
+    games_processed: int
+    rows_created: int
+    rows_updated: int
+    games_skipped: int = 0  # finished + already hashed, not fetched
+    games_unchanged: int = 0  # fetched, same content hash => nothing written
+    games_empty: int = 0  # fetched, but no player rows parsed => nothing written
+    warnings: list[str] = []
+
+
+class IngestGameStatsIn(BaseModel):
+    season_id: str
+    acb_game_id: str
+
+
+class IngestGameStatsOut(BaseModel):
+    season_id: str
+    acb_game_id: str
+    fixture_id: int | None = None
+    rows_created: int
+    rows_updated: int
+    rows_unchanged: int
+    marked_finished: bool = False
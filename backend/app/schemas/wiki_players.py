@@ -9,3 +9,17 @@ class WikiPlayersScrapeRequest(BaseModel):
     # If None/empty => scrape all active teams in DB (we’ll implement in Step 4+)
     team_ids: Optional[List[str]] = None
     dry_run: bool = True
+
+
+class ResyncPlayersIn(BaseModel):
+    season_id: str = Field(default=str(ACB_TEMPORADA_ID))
+    only_active_teams: bool = True
+
+
+class ResyncPlayersOut(BaseModel):
+    season_id: str
+    teams_ok: int
+    teams_failed: int
+    created: int
+    updated: int
+    deactivated: int
@@ -4,10 +4,13 @@ from __future__ import annotations
 import re
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, List, Tuple
+from typing import Dict, Optional, List, Tuple
 
-import httpx
-from bs4 import BeautifulSoup
+from lxml import etree
+from lxml import html as lxml_html
+
+from app.scrapers.http import get
+from app.scrapers.lxml_utils import text_strings
 
 CALENDARIO_URL = "https://www.acb.com/es/calendario?temporada={temporada}"
 
@@ -68,154 +71,141 @@ def _extract_team_id(a_tag) -> Optional[str]:
     return m.group(1) if m else None
 
 
-def _nearest_previous_jornada_number(block) -> Optional[int]:
-    s = block.find_previous(string=JORNADA_RE)
-    if not s:
-        return None
-    m = JORNADA_RE.search(str(s))
-    return int(m.group(1)) if m else None
-
-
-def _nearest_previous_date(block) -> Optional[Tuple[int, int, int]]:
-    # Walk backwards through text nodes until we find a Spanish long date line
-    node = block
-    for _ in range(300):  # bounded so we never go crazy
-        node = node.find_previous(string=True)
-        if not node:
-            return None
-        dp = _parse_es_date(str(node))
-        if dp:
-            return dp
-    return None
-
-
 def scrape_calendario(temporada: int, timeout_s: float = 30.0) -> List[ParsedFixture]:
     url = CALENDARIO_URL.format(temporada=temporada)
 
-    with httpx.Client(
-        headers={
-            "User-Agent": "Mozilla/5.0",
-            "Accept-Language": "es-ES,es;q=0.9,en;q=0.8",
-        },
-        timeout=timeout_s,
-        follow_redirects=True,
-    ) as client:
-        r = client.get(url)
-        r.raise_for_status()
-        print("DEBUG status:", r.status_code)
-        print("DEBUG len(html):", len(r.text))
-        print("DEBUG has /club/plantilla/id:", "/club/plantilla/id/" in r.text)
-        print("DEBUG has 'Jornada 1':", "Jornada 1" in r.text)
-        print("DEBUG title snippet:", r.text[:200].replace("\n", " ")[:200])
-
-    soup = BeautifulSoup(r.text, "lxml")
-
-    # 1) Find match blocks: nodes that contain exactly 2 team links.
-    #    We start from each team link and climb to a “small” parent that has the pair.
-    fixtures: List[ParsedFixture] = []
-    seen_blocks = set()
+    r = get(url, timeout=timeout_s)
+    r.raise_for_status()
 
-    team_links_all = soup.find_all("a", href=TEAM_ID_RE)
-    if not team_links_all:
-        return []
+    return parse_calendario_html(r.text, source_url=url)
 
-    for a in team_links_all:
-        block = a
-        for _ in range(8):
-            if not block or not hasattr(block, "find_all"):
-                break
-            links_in = block.find_all("a", href=TEAM_ID_RE)
-            if len(links_in) == 2:
-                break
-            block = block.parent
-
-        if not block or not hasattr(block, "find_all"):
-            continue
 
-        # Dedup by object identity
-        bid = id(block)
-        if bid in seen_blocks:
-            continue
+def _fixture_sort_key(fx: ParsedFixture):
+    # Stable ordering (round, kickoff, teams)
+    return (
+        fx.round_number,
+        fx.kickoff_at or datetime(1970, 1, 1),
+        fx.home_team_id,
+        fx.away_team_id,
+    )
 
-        links_in = block.find_all("a", href=TEAM_ID_RE)
-        if len(links_in) != 2:
-            continue
 
-        home_a, away_a = links_in[0], links_in[1]
-        home_id = _extract_team_id(home_a)
-        away_id = _extract_team_id(away_a)
-        if not home_id or not away_id or home_id == away_id:
+# A match block is the lowest ancestor (at most MAX_BLOCK_CLIMB levels above a team
+# link) that contains exactly 2 team links.
+MAX_BLOCK_CLIMB = 8
+
+
+def _index_match_blocks(root) -> Dict[etree._Element, List[etree._Element]]:
+    """
+    block element -> its 2 team links (document order).
+    Pass 1 bumps a team-link counter on every ancestor of every team link;
+    pass 2 climbs <= MAX_BLOCK_CLIMB levels from each link to its block.
+    """
+    links = [a for a in root.iter("a") if TEAM_ID_RE.search(a.get("href") or "")]
+    counts: Dict[etree._Element, int] = {}
+    for a in links:
+        node = a.getparent()
+        while node is not None:
+            counts[node] = counts.get(node, 0) + 1
+            node = node.getparent()
+
+    blocks: Dict[etree._Element, List[etree._Element]] = {}
+    for a in links:
+        node = a
+        for _ in range(MAX_BLOCK_CLIMB):
+            if node is None or counts.get(node, 0) >= 2:
+                break
+            node = node.getparent()
+        if node is None or counts.get(node, 0) != 2:
             continue
+        blocks.setdefault(node, []).append(a)
+    return blocks
 
-        seen_blocks.add(bid)
 
-        # 2) Round number: nearest previous “Jornada N”
-        round_number = _nearest_previous_jornada_number(block)
-        if round_number is None:
-            # Without jornada, we can’t safely store this record.
-            continue
+def _fixture_from_block(block, links, round_number: int, date_parts, source_url: str) -> Optional[ParsedFixture]:
+    home_id = _extract_team_id(links[0])
+    away_id = _extract_team_id(links[1])
+    if not home_id or not away_id or home_id == away_id:
+        return None
 
-        # 3) Date/time
-        date_parts = _nearest_previous_date(block)
+    strings = text_strings(block)
 
-        # time usually appears inside the block (or as XX:XX)
-        time_parts: Optional[Tuple[int, int]] = None
-        block_lines = [t.strip() for t in block.get_text("\n", strip=True).split("\n") if t.strip()]
-        has_xx = any(line.strip().upper() == "XX:XX" for line in block_lines)
-        for line in block_lines:
+    # time usually appears inside the block (or as XX:XX)
+    time_parts: Optional[Tuple[int, int]] = None
+    for s in strings:
+        for line in s.split("\n"):
             tp = _parse_time(line)
             if tp:
                 time_parts = tp
                 break
+        if time_parts:
+            break
+
+    kickoff_at: Optional[datetime] = None
+    if date_parts and time_parts:
+        kickoff_at = datetime(*date_parts, *time_parts)
+
+    block_text = " ".join(strings)
+    sm = SCORE_RE.search(block_text)
+    if sm:
+        home_score, away_score, is_finished = int(sm.group(1)), int(sm.group(2)), True
+    else:
+        home_score, away_score, is_finished = None, None, False
+
+    low = block_text.lower()
+    return ParsedFixture(
+        round_number=round_number,
+        home_team_id=str(home_id),
+        away_team_id=str(away_id),
+        kickoff_at=kickoff_at,
+        is_finished=is_finished,
+        home_score=home_score,
+        away_score=away_score,
+        is_postponed=("aplaz" in low) or ("suspend" in low),
+        is_advanced=("adelant" in low),
+        source_url=source_url,
+    )
+
 
-        kickoff_at: Optional[datetime] = None
-        if date_parts:
-            y, mon, d = date_parts
-            if time_parts:
-                hh, mm = time_parts
-                kickoff_at = datetime(y, mon, d, hh, mm)
-            elif has_xx:
-                kickoff_at = None
-
-        # 4) Scores / finished
-        block_text = block.get_text(" ", strip=True)
-        sm = SCORE_RE.search(block_text)
-        if sm:
-            home_score = int(sm.group(1))
-            away_score = int(sm.group(2))
-            is_finished = True
+def parse_calendario_html(html: str, *, source_url: str) -> List[ParsedFixture]:
+    """
+    Single document-order pass: the current "Jornada N" and long-date headers are
+    tracked as text streams by, and each match block is emitted when it starts
+    (its round/date are the last headers seen before it, like find_previous).
+    """
+    if "/club/plantilla/id/" not in html:
+        return []
+    root = lxml_html.document_fromstring(html)
+    blocks = _index_match_blocks(root)
+    if not blocks:
+        return []
+
+    fixtures: List[ParsedFixture] = []
+    round_number: Optional[int] = None
+    date_parts: Optional[Tuple[int, int, int]] = None
+
+    def see(text: Optional[str]) -> None:
+        nonlocal round_number, date_parts
+        if not text:
+            return
+        m = JORNADA_RE.search(text)
+        if m:
+            round_number = int(m.group(1))
+        dp = _parse_es_date(text)
+        if dp:
+            date_parts = dp
+
+    for ev, el in etree.iterwalk(root, events=("start", "end")):
+        if ev == "start":
+            links = blocks.get(el)
+            # Without jornada, we can't safely store this record.
+            if links is not None and round_number is not None:
+                fx = _fixture_from_block(el, links, round_number, date_parts, source_url)
+                if fx is not None:
+                    fixtures.append(fx)
+            see(el.text)
         else:
-            home_score = None
-            away_score = None
-            is_finished = False
-
-        # 5) Postponed / advanced (best-effort from text)
-        low = block_text.lower()
-        is_postponed = ("aplaz" in low) or ("suspend" in low)
-        is_advanced = ("adelant" in low)
-
-        fixtures.append(
-            ParsedFixture(
-                round_number=round_number,
-                home_team_id=str(home_id),
-                away_team_id=str(away_id),
-                kickoff_at=kickoff_at,
-                is_finished=is_finished,
-                home_score=home_score,
-                away_score=away_score,
-                is_postponed=is_postponed,
-                is_advanced=is_advanced,
-                source_url=url,
-            )
-        )
-
-    # Optional: stable ordering (round, kickoff, teams)
-    fixtures.sort(
-        key=lambda fx: (
-            fx.round_number,
-            fx.kickoff_at or datetime(1970, 1, 1),
-            fx.home_team_id,
-            fx.away_team_id,
-        )
-    )
+            see(el.tail)
+
+    fixtures.sort(key=_fixture_sort_key)
     return fixtures
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import re
-from typing import Any
 
 import httpx
-from bs4 import BeautifulSoup
+from lxml import etree
+
+from app.scrapers.http import afetch_text, fetch_text
+from app.scrapers.lxml_utils import get_text, has_class, parse_html
 
 # KEEP THE CONSTANT NAME for drop-in compatibility with existing imports.
 # It now points to OFFICIAL FINAL stats (acb.com), not live.acb.com.
@@ -33,27 +35,22 @@ def _mmss_to_seconds(mmss: str | None) -> int | None:
     return minutes * 60 + seconds
 
 
-def fetch_live_stats_html(game_id: str, timeout: float = 20.0) -> str:
+def fetch_live_stats_html(game_id: str, timeout: float = 20.0, immutable: bool = False) -> str:
     """
     Drop-in compatible name.
     Fetches OFFICIAL FINAL stats HTML from acb.com (not live.acb.com).
+    Pass immutable=True for finished games: the page is then cached for good.
     """
     url = LIVE_STATS_URL.format(game_id=game_id)
-    headers = {
-        "User-Agent": "Mozilla/5.0",
-        "Accept-Language": "es-ES,es;q=0.9,en;q=0.8",
-    }
-    with httpx.Client(timeout=timeout, follow_redirects=True, headers=headers) as client:
-        r = client.get(url)
-        r.raise_for_status()
-        return r.text
+    return fetch_text(url, timeout=timeout, immutable=immutable)
 
 
-def _clean_text(node) -> str:
-    if node is None:
-        return ""
-    txt = node.get_text(strip=True)
-    return "" if txt == "\xa0" else txt
+async def fetch_live_stats_html_async(client: httpx.AsyncClient, game_id: str, immutable: bool = False) -> str:
+    """
+    Async variant of fetch_live_stats_html on a caller-owned (shared) client.
+    """
+    url = LIVE_STATS_URL.format(game_id=game_id)
+    return await afetch_text(client, url, immutable=immutable)
 
 
 def _extract_acb_player_id(href: str) -> str | None:
@@ -66,6 +63,233 @@ def _extract_acb_player_id(href: str) -> str | None:
     return m.group(1) if m else None
 
 
+# Compact row tuple handed back by parser workers (see app/scrapers/parse_pool.py)
+ROW_FIELDS = ("acb_player_id", "play_time", "minutes_seconds", "plus_minus", "is_started")
+StatRow = tuple  # (acb_player_id, play_time, minutes_seconds, plus_minus, is_started)
+
+
+def _cell_text(td) -> str:
+    # BeautifulSoup get_text(strip=True) ("\xa0" strips to "")
+    if len(td) == 0:
+        return (td.text or "").strip()
+    return get_text(td)
+
+
+# Box-score columns after "Min", in page order, with the header labels each may carry.
+# Several labels repeat ("D" dorsal/defensive rebounds, "C" for three groups), so
+# columns are matched in order rather than by name.
+_BOX_COLUMNS = (
+    ("points", {"P", "PTS"}),
+    ("t2", {"T2"}),
+    ("t2_pct", {"T2%"}),
+    ("t3", {"T3"}),
+    ("t3_pct", {"T3%"}),
+    ("t1", {"T1"}),
+    ("t1_pct", {"T1%"}),
+    ("reb_total", {"T", "REB", "RT"}),
+    ("reb_def", {"D", "RD"}),
+    ("reb_off", {"O", "RO"}),
+    ("assists", {"A", "AS"}),
+    ("steals", {"BR"}),
+    ("turnovers", {"BP"}),
+    ("fastbreaks", {"C", "CONT"}),
+    ("blocks", {"F", "TAP", "TAPF"}),
+    ("blocks_against", {"C", "TAPC"}),
+    ("dunks", {"M"}),
+    ("fouls", {"C", "FP"}),
+    ("fouls_drawn", {"R", "FR"}),
+    ("plus_minus", {"+/-"}),
+    ("valoracion", {"V", "VAL"}),
+)
+
+
+def _header_columns(header: list[str]) -> dict[str, int]:
+    """Field name -> column index, for "Min" and every box-score column found after it."""
+    cols = {"play_time": header.index("Min"), "plus_minus": header.index("+/-")}
+    j = 0
+    for i in range(cols["play_time"] + 1, len(header)):
+        label = header[i].replace(" ", "").upper()
+        k = j
+        while k < len(_BOX_COLUMNS) and label not in _BOX_COLUMNS[k][1]:
+            k += 1
+        if k < len(_BOX_COLUMNS):
+            cols.setdefault(_BOX_COLUMNS[k][0], i)
+            j = k + 1
+    return cols
+
+
+def _iter_player_rows(doc):
+    """Yields (acb_player_id, tr, tds, cols) for every player row of both teams (cols: _header_columns)."""
+    sections = [s for s in doc.iter("section") if has_class(s, "partido")]
+    home = next((s for s in sections if not has_class(s, "visitante")), None)
+    away = next((s for s in sections if has_class(s, "visitante")), None)
+
+    for sec in (home, away):
+        if sec is None:
+            continue
+        table = next((t for t in sec.iter("table") if t.get("data-toggle") == "table-estadisticas"), None)
+        if table is None:
+            continue
+
+        # Header row with the actual column names (Min, +/-)
+        header = None
+        for thead in table.iter("thead"):
+            for tr in thead.iter("tr"):
+                ths = [_cell_text(th) for th in tr if th.tag == "th"]
+                if "Min" in ths and "+/-" in ths:
+                    header = ths
+                    break
+            if header:
+                break
+        if not header:
+            continue
+        cols = _header_columns(header)
+        last_col = max(cols["play_time"], cols["plus_minus"])
+
+        for tbody in table.iter("tbody"):
+            for tr in tbody.iter("tr"):
+                if has_class(tr, "equipo") or has_class(tr, "totales"):
+                    continue
+                tds = list(tr.iter("td"))
+                if any((has_class(td, "nombre") and has_class(td, "entrenador")) or has_class(td, "nombre_eliminados5f")
+                       for td in tds):
+                    continue
+                a = next(
+                    (a for td in tds if has_class(td, "nombre") and has_class(td, "jugador")
+                     for a in td.iter("a") if (a.get("href") or "").startswith("/jugador/ver/")),
+                    None,
+                )
+                if a is None:
+                    continue
+                acb_player_id = _extract_acb_player_id(a.get("href", ""))
+                if not acb_player_id or len(tds) <= last_col:
+                    continue
+                yield acb_player_id, tr, tds, cols
+
+
+def _is_started(tds) -> bool:
+    # Starters are marked with '*' in dorsal cell (e.g. "*0", "*2")
+    dorsal = next((td for td in tds if has_class(td, "dorsal")), None)
+    return dorsal is not None and _cell_text(dorsal).startswith("*")
+
+
+def _cell_int(tds, cols: dict[str, int], field: str) -> int | None:
+    i = cols.get(field)
+    if i is None or i >= len(tds):
+        return None
+    try:
+        return int(_cell_text(tds[i]))
+    except ValueError:
+        return None
+
+
+def _cell_made_att(tds, cols: dict[str, int], field: str) -> tuple[int | None, int | None]:
+    # "3/5" => (3, 5)
+    i = cols.get(field)
+    if i is None or i >= len(tds):
+        return None, None
+    made, _, att = _cell_text(tds[i]).partition("/")
+    try:
+        return int(made), int(att)
+    except ValueError:
+        return None, None
+
+
+def _row_tuple(acb_player_id: str, tds, cols: dict[str, int]) -> StatRow:
+    play_time = _cell_text(tds[cols["play_time"]]) or None
+    plus_minus = _cell_int(tds, cols, "plus_minus")
+    is_started = _is_started(tds)
+
+    return (
+        str(acb_player_id),
+        play_time,
+        _mmss_to_seconds(play_time) if play_time else None,
+        plus_minus,
+        is_started,
+    )
+
+
+def parse_minutes_plusminus_tuples(html: str) -> list[StatRow]:
+    """parse_minutes_plusminus() as compact ROW_FIELDS tuples (cheap to pickle across processes)."""
+    doc = parse_html(html)
+    if doc is None:
+        return []
+    # Deduplicate by player id (keep last)
+    uniq: dict[str, StatRow] = {}
+    for pid, _tr, tds, cols in _iter_player_rows(doc):
+        uniq[str(pid)] = _row_tuple(pid, tds, cols)
+    return list(uniq.values())
+
+
+def rows_from_tuples(rows: list[StatRow]) -> list[dict]:
+    return [dict(zip(ROW_FIELDS, r)) for r in rows]
+
+
+# Full box-score row (every column of the estadisticas table, integers only)
+BOX_FIELDS = (
+    "acb_player_id", "play_time", "seconds", "is_started",
+    "points", "t2_made", "t2_att", "t3_made", "t3_att", "t1_made", "t1_att",
+    "reb_off", "reb_def", "reb_total", "assists", "steals", "turnovers", "fastbreaks",
+    "blocks", "blocks_against", "dunks", "fouls", "fouls_drawn", "plus_minus", "valoracion",
+)
+BoxRow = tuple  # in BOX_FIELDS order
+
+_BOX_INT_FIELDS = (
+    "points", "reb_off", "reb_def", "reb_total", "assists", "steals", "turnovers", "fastbreaks",
+    "blocks", "blocks_against", "dunks", "fouls", "fouls_drawn", "plus_minus", "valoracion",
+)
+
+
+def _box_tuple(acb_player_id: str, tds, cols: dict[str, int]) -> BoxRow:
+    play_time = _cell_text(tds[cols["play_time"]]) or None
+    ints = {f: _cell_int(tds, cols, f) for f in _BOX_INT_FIELDS}
+    t2 = _cell_made_att(tds, cols, "t2")
+    t3 = _cell_made_att(tds, cols, "t3")
+    t1 = _cell_made_att(tds, cols, "t1")
+    return (
+        str(acb_player_id), play_time, _mmss_to_seconds(play_time) if play_time else None, _is_started(tds),
+        ints["points"], *t2, *t3, *t1,
+        ints["reb_off"], ints["reb_def"], ints["reb_total"], ints["assists"], ints["steals"],
+        ints["turnovers"], ints["fastbreaks"], ints["blocks"], ints["blocks_against"], ints["dunks"],
+        ints["fouls"], ints["fouls_drawn"], ints["plus_minus"], ints["valoracion"],
+    )
+
+
+def parse_box_score_tuples(html: str) -> list[BoxRow]:
+    """
+    Every column of both estadisticas tables in one pass, as BOX_FIELDS tuples
+    (deduplicated by player, keep last). rows_from_box() derives the
+    parse_minutes_plusminus() rows from the same result.
+    """
+    doc = parse_html(html)
+    if doc is None:
+        return []
+    uniq: dict[str, BoxRow] = {}
+    for pid, _tr, tds, cols in _iter_player_rows(doc):
+        uniq[str(pid)] = _box_tuple(pid, tds, cols)
+    return list(uniq.values())
+
+
+_I_PLAY_TIME = BOX_FIELDS.index("play_time")
+_I_SECONDS = BOX_FIELDS.index("seconds")
+_I_STARTED = BOX_FIELDS.index("is_started")
+_I_PLUS_MINUS = BOX_FIELDS.index("plus_minus")
+
+
+def rows_from_box(box: list[BoxRow]) -> list[dict]:
+    """parse_minutes_plusminus() schema from parse_box_score_tuples() rows."""
+    return [
+        {
+            "acb_player_id": b[0],
+            "play_time": b[_I_PLAY_TIME],
+            "minutes_seconds": b[_I_SECONDS],
+            "plus_minus": b[_I_PLUS_MINUS],
+            "is_started": b[_I_STARTED],
+        }
+        for b in box
+    ]
+
+
 def parse_minutes_plusminus(html: str) -> list[dict]:
     """
     Drop-in compatible return schema (same keys as your current live scraper):
@@ -75,89 +299,46 @@ def parse_minutes_plusminus(html: str) -> list[dict]:
       - plus_minus: int | None
       - is_started: bool | None
 
-    Parses OFFICIAL FINAL stats from acb.com HTML tables.
+    Parses OFFICIAL FINAL stats from acb.com HTML tables (lxml, no soup).
     """
-    soup = BeautifulSoup(html, "html.parser")
-    out: list[dict[str, Any]] = []
+    return rows_from_tuples(parse_minutes_plusminus_tuples(html))
 
-    # Two team sections:
-    # - Home: section.partido (not .visitante)
-    # - Away: section.partido.visitante
-    sections = [
-        soup.select_one("section.partido:not(.visitante)"),
-        soup.select_one("section.partido.visitante"),
-    ]
 
-    for sec in sections:
-        if not sec:
-            continue
+# Both teams together play 2 x 5 x 40:00 in regulation (more with overtime)
+_REGULATION_TEAM_SECONDS = 2 * 5 * 40 * 60
+_MINUTES_TOLERANCE_S = 60  # per-player rounding on the page
 
-        table = sec.select_one("table[data-toggle='table-estadisticas']")
-        if not table:
-            continue
 
-        # Find the header row that contains the actual column names (Min, +/-)
-        header: list[str] | None = None
-        for tr in table.select("thead tr"):
-            ths = [th.get_text(strip=True) for th in tr.find_all("th")]
-            if "Min" in ths and "+/-" in ths:
-                header = ths
-                break
-        if not header:
+def box_score_reached_regulation(rows: list[dict]) -> bool:
+    """
+    Minutes check for parse_minutes_plusminus() rows: True once the players' minutes
+    add up to a full regulation game. Necessary but NOT sufficient for a final box
+    score: an overtime game passes this check while still being played (the page
+    has no explicit "final" flag; see stats_ingest.ingest_game_stats).
+    """
+    total = sum(r.get("minutes_seconds") or 0 for r in rows)
+    return total >= _REGULATION_TEAM_SECONDS - _MINUTES_TOLERANCE_S
+
+
+def diff_player_rows(html: str, previous: dict[str, int] | None = None) -> tuple[list[dict], dict[str, int]]:
+    """
+    Incremental variant of parse_minutes_plusminus() for live polling.
+    `previous` maps acb_player_id -> fingerprint of that player's <tr> from the last
+    poll; only rows whose markup changed are parsed.
+    Returns (changed rows, in parse_minutes_plusminus schema; fingerprints for the next call).
+    """
+    previous = previous or {}
+    doc = parse_html(html)
+    if doc is None:
+        return [], {}
+    changed: dict[str, StatRow] = {}
+    fingerprints: dict[str, int] = {}
+
+    for pid, tr, tds, cols in _iter_player_rows(doc):
+        fp = hash(etree.tostring(tr))
+        fingerprints[pid] = fp
+        if previous.get(pid) == fp:
             continue
+        changed[pid] = _row_tuple(pid, tds, cols)
 
-        col_min = header.index("Min")
-        col_pm = header.index("+/-")
-
-        for tr in table.select("tbody tr"):
-            classes = tr.get("class", [])
-
-            # Skip non-player rows
-            if "equipo" in classes or "totales" in classes:
-                continue
-            if tr.select_one("td.nombre.entrenador") or tr.select_one("td.nombre_eliminados5f"):
-                continue
-
-            a = tr.select_one("td.nombre.jugador a[href^='/jugador/ver/']")
-            if not a:
-                continue
-
-            acb_player_id = _extract_acb_player_id(a.get("href", ""))
-            if not acb_player_id:
-                continue
-
-            tds = tr.find_all("td")
-            if len(tds) <= max(col_min, col_pm):
-                continue
-
-            # Starters are marked with '*' in dorsal cell (e.g. "*0", "*2")
-            dorsal_txt = _clean_text(tr.select_one("td.dorsal"))
-            is_started = True if dorsal_txt.startswith("*") else False
-
-            play_time = _clean_text(tds[col_min]) or None
-            pm_txt = _clean_text(tds[col_pm])
-
-            minutes_seconds = _mmss_to_seconds(play_time) if play_time else None
-
-            plus_minus = None
-            if pm_txt:
-                try:
-                    plus_minus = int(pm_txt)
-                except ValueError:
-                    plus_minus = None
-
-            out.append(
-                {
-                    "acb_player_id": str(acb_player_id),
-                    "play_time": play_time,
-                    "minutes_seconds": minutes_seconds,
-                    "plus_minus": plus_minus,
-                    "is_started": is_started,
-                }
-            )
-
-    # Deduplicate by player id (keep last) — same behavior as your existing file.
-    uniq: dict[str, dict] = {}
-    for row in out:
-        uniq[row["acb_player_id"]] = row
-    return list(uniq.values())
\ No newline at end of file
+    return rows_from_tuples(list(changed.values())), fingerprints
@@ -1,16 +1,18 @@
 # app/scrapers/acb_partidos.py
 from __future__ import annotations
 
+import json
 import re
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, List, Tuple
+from typing import Any, Optional, List, Tuple
 from zoneinfo import ZoneInfo
 
-import httpx
-from bs4 import BeautifulSoup
 from dateutil import parser as dtparser
 
+from app.scrapers.http import fetch_text
+from app.scrapers.lxml_utils import get_text, has_class_prefix, parse_html
+
 PARTIDOS_URL = "https://acb.com/es/partidos?competicion={competicion}&jornada={jornada_id}"
 
 TEAM_ID_RE = re.compile(r"/club/plantilla/id/(\d+)(?:/|$)")
@@ -82,11 +84,8 @@ def _extract_team_id_from_href(href: str) -> Optional[str]:
     return m.group(1) if m else None
 
 
-def _is_matchcard_div(tag) -> bool:
-    if tag.name != "div":
-        return False
-    classes = tag.get("class") or []
-    return any(isinstance(c, str) and c.startswith("MatchCard_matchCard__") for c in classes)
+def _is_matchcard_div(el) -> bool:
+    return el.tag == "div" and has_class_prefix(el, "MatchCard_matchCard__")
 
 
 def _infer_year_for_ddmm(season_id: str, month: int) -> int:
@@ -143,11 +142,11 @@ def _extract_live_action_link_and_game_id(card) -> tuple[Optional[str], Optional
     Return (live_url, acb_game_id) for THIS matchcard by selecting ONLY the action link:
     Previa / Resumen / Estadísticas (ignores precedentes).
     """
-    anchors = card.find_all("a", href=True)
+    anchors = [a for a in card.iter("a") if a.get("href") is not None]
 
     # 1) Prefer anchors whose visible text is the action label
     for a in anchors:
-        txt = (a.get_text(" ", strip=True) or "").strip().lower()
+        txt = get_text(a, " ").lower()
         if txt in ACTION_TEXTS:
             href = (a.get("href") or "").strip()
             m = RX_LIVE_GAME_ID.search(href)
@@ -175,42 +174,282 @@ def _looks_like_skeleton_datetime(card_text: str) -> bool:
     return ("---" in card_text) or ("--:--" in card_text)
 
 def _extract_match_datetime_text(card) -> str:
-    dt = card.find("div", class_=re.compile(r"^MatchDateTime_matchDateTime__"))
-    return dt.get_text(" ", strip=True) if dt else ""
+    dt = next((d for d in card.iterdescendants("div") if has_class_prefix(d, "MatchDateTime_matchDateTime__")), None)
+    return get_text(dt, " ") if dt is not None else ""
+
+# ----------------------------
+# JSON-first path (Next.js payload)
+# ----------------------------
+# The partidos page is a Next.js app: the match list is already serialized as
+# JSON, either in <script id="__NEXT_DATA__"> (pages router) or in the
+# self.__next_f.push([1,"..."]) flight chunks (app router). Reading that is far
+# cheaper than building a soup, and it usually carries the real kickoff too.
+# Key names below are best-effort; anything that doesn't look right makes us
+# fall back to the MatchCard DOM walker.
+
+NEXT_DATA_RE = re.compile(
+    r'<script[^>]+id="__NEXT_DATA__"[^>]*>(.*?)</script>',
+    re.S | re.I,
+)
+NEXT_F_PUSH_RE = re.compile(r'self\.__next_f\.push\(\[1,\s*("(?:[^"\\]|\\.)*")\]\)', re.S)
+ACB_GAME_ID_RE = re.compile(r"^\d{5,}$")
+HTML_TEAM_ID_RE = re.compile(r"/club/plantilla/id/(\d+)")
+
+# Only match-specific key names: generic "home"/"local"/"id" also show up in
+# calendar / "precedentes" widgets serialized in the same payload
+_HOME_KEYS = ("homeTeam", "localTeam", "teamHome", "homeClub")
+_AWAY_KEYS = ("awayTeam", "visitorTeam", "teamAway", "awayClub")
+_GAME_ID_KEYS = ("matchId", "gameId", "idMatch", "idPartido")
+_TEAM_ID_KEYS = ("clubId", "idClub", "teamId", "idTeam", "id")
+_KICKOFF_KEYS = ("startDateTime", "matchDateTime", "dateTime", "datetime", "startDate", "matchDate", "date")
+_STATUS_KEYS = ("status", "matchStatus", "state", "statusCode")
+_HOME_SCORE_KEYS = ("homeScore", "scoreHome", "localScore", "homePoints")
+_AWAY_SCORE_KEYS = ("awayScore", "scoreAway", "visitorScore", "awayPoints")
+_TEAM_SCORE_KEYS = ("score", "points", "result")
+_FINISHED_STATUSES = {"FINAL", "FINISHED", "ENDED", "PLAYED", "FINALIZADO", "FINALIZED", "CLOSED"}
+_ROUND_KEYS = ("roundNumber", "round", "jornada", "matchday", "matchDay", "numJornada", "week")
+_ROUND_VALUE_KEYS = ("number", "roundNumber", "order", "id", "jornadaId", "name", "description")
+_MAX_MATCHES_PER_ROUND = 9  # 18 clubs
+SOURCE_JORNADA_RE = re.compile(r"[?&]jornada=(\d+)")
+
+
+def _iter_next_payloads(html: str):
+    m = NEXT_DATA_RE.search(html)
+    if m:
+        try:
+            yield json.loads(m.group(1))
+        except ValueError:
+            pass
+
+    chunks = NEXT_F_PUSH_RE.findall(html)
+    if not chunks:
+        return
+    try:
+        flight = "".join(json.loads(c) for c in chunks)
+    except ValueError:
+        return
+    # Flight format: one "<id>:<json>" record per line
+    for line in flight.splitlines():
+        _, sep, body = line.partition(":")
+        if not sep or not body or body[0] not in "[{":
+            continue
+        try:
+            yield json.loads(body)
+        except ValueError:
+            continue
 
-def scrape_partidos(
-    *,
-    season_id: str,
-    competicion: int,
-    jornada_id: int,
-    round_number: int,
-    timeout_s: float = 30.0,
-) -> List[ParsedFixture]:
-    url = PARTIDOS_URL.format(competicion=competicion, jornada_id=jornada_id)
 
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120 Safari/537.36",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        "Accept-Language": "es-ES,es;q=0.9,en;q=0.8",
-        "Referer": "https://acb.com/",
-        "Connection": "keep-alive",
-    }
+def _first_key(d: dict, keys) -> Any:
+    for k in keys:
+        if k in d and d[k] not in (None, ""):
+            return d[k]
+    return None
 
-    with httpx.Client(headers=headers, timeout=timeout_s, follow_redirects=True) as client:
-        r = client.get(url)
-        r.raise_for_status()
 
-    soup = BeautifulSoup(r.text, "lxml")
+def _as_int(v) -> Optional[int]:
+    if isinstance(v, bool):
+        return None
+    if isinstance(v, int):
+        return v
+    if isinstance(v, str) and SCORE_RE.match(v):
+        return int(v)
+    return None
 
-    cards_all = soup.find_all(_is_matchcard_div)
+
+def _iter_strings(obj, depth: int = 0):
+    if depth > 4:
+        return
+    if isinstance(obj, str):
+        yield obj
+    elif isinstance(obj, dict):
+        for v in obj.values():
+            yield from _iter_strings(v, depth + 1)
+    elif isinstance(obj, list):
+        for v in obj:
+            yield from _iter_strings(v, depth + 1)
+
+
+def _json_team_id(team: Any) -> Optional[str]:
+    if not isinstance(team, dict):
+        return None
+    # Prefer the same club id the DOM path reads from /club/plantilla/id/<n>
+    for s in _iter_strings(team):
+        tid = _extract_team_id_from_href(s)
+        if tid:
+            return tid
+    v = _first_key(team, _TEAM_ID_KEYS)
+    return str(v) if isinstance(v, (int, str)) and str(v).isdigit() else None
+
+
+def _json_kickoff(match: dict) -> Optional[datetime]:
+    """Naive Europe/Madrid wall time, like _parse_kickoff_from_text (the DOM path)."""
+    v = _first_key(match, _KICKOFF_KEYS)
+    if isinstance(v, (int, float)) and not isinstance(v, bool):
+        # epoch seconds / milliseconds
+        ts = v / 1000.0 if v > 10**11 else float(v)
+        return datetime.fromtimestamp(ts, tz=TZ).replace(tzinfo=None)
+    if not isinstance(v, str) or _looks_like_skeleton_datetime(v):
+        return None
+    try:
+        dt = dtparser.parse(v)
+    except (ValueError, OverflowError):
+        return None
+    # date-only strings carry no kickoff time
+    if "T" not in v and not TIME_RE.search(v):
+        return None
+    if dt.tzinfo is not None and TZ is not None:
+        dt = dt.astimezone(TZ)
+    return dt.replace(tzinfo=None)
+
+
+def _json_round_numbers(match: dict) -> set[int]:
+    """Numbers in the match's round/jornada field (round number, jornada id, "Jornada 5"...); empty if absent."""
+    v = _first_key(match, _ROUND_KEYS)
+    values = [v.get(k) for k in _ROUND_VALUE_KEYS] if isinstance(v, dict) else [v]
+    out: set[int] = set()
+    for x in values:
+        if isinstance(x, bool):
+            continue
+        if isinstance(x, int):
+            out.add(x)
+        elif isinstance(x, str):
+            out.update(int(n) for n in re.findall(r"\d+", x))
+    return out
+
+
+def _json_is_finished(match: dict) -> bool:
+    for k in ("isFinished", "finished", "isFinal"):
+        if isinstance(match.get(k), bool):
+            return match[k]
+    st = _first_key(match, _STATUS_KEYS)
+    if isinstance(st, dict):
+        st = _first_key(st, ("name", "code", "value", "description"))
+    return isinstance(st, str) and st.strip().upper() in _FINISHED_STATUSES
+
+
+def _json_match_to_fixture(match: dict, *, round_number: int, source_url: str) -> Optional[ParsedFixture]:
+    home = _first_key(match, _HOME_KEYS)
+    away = _first_key(match, _AWAY_KEYS)
+    home_id = _json_team_id(home)
+    away_id = _json_team_id(away)
+    if not home_id or not away_id or home_id == away_id:
+        return None
+
+    live_url = None
+    acb_game_id = None
+    for s in _iter_strings(match):
+        m = RX_LIVE_GAME_ID.search(s)
+        if m:
+            live_url, acb_game_id = s, m.group(1)
+            break
+    if acb_game_id is None:
+        gid = _first_key(match, _GAME_ID_KEYS)
+        if gid is not None and ACB_GAME_ID_RE.match(str(gid)):
+            acb_game_id = str(gid)
+
+    home_score = _as_int(_first_key(match, _HOME_SCORE_KEYS))
+    away_score = _as_int(_first_key(match, _AWAY_SCORE_KEYS))
+    if home_score is None and isinstance(home, dict):
+        home_score = _as_int(_first_key(home, _TEAM_SCORE_KEYS))
+    if away_score is None and isinstance(away, dict):
+        away_score = _as_int(_first_key(away, _TEAM_SCORE_KEYS))
+
+    is_finished = _json_is_finished(match)
+    if not is_finished:
+        home_score = away_score = None
+
+    return ParsedFixture(
+        round_number=round_number,
+        home_team_id=home_id,
+        away_team_id=away_id,
+        kickoff_at=_json_kickoff(match),
+        is_finished=is_finished,
+        home_score=home_score,
+        away_score=away_score,
+        is_postponed=False,
+        is_advanced=False,
+        source_url=source_url,
+        acb_game_id=acb_game_id,
+        live_url=live_url,
+    )
+
+
+def _parse_partidos_next_data(html: str, *, round_number: int, source_url: str) -> Optional[List[ParsedFixture]]:
+    """
+    Returns fixtures from the embedded Next.js payload, or None if the payload
+    is missing / doesn't look like this round (caller falls back to the DOM).
+    Matches whose round/jornada field names another round are skipped.
+    """
+    # Club ids linked from the page: without them the JSON team ids can't be checked
+    linked = set(HTML_TEAM_ID_RE.findall(html))
+    if not linked:
+        return None
+
+    this_round = {round_number}
+    m = SOURCE_JORNADA_RE.search(source_url or "")
+    if m:
+        this_round.add(int(m.group(1)))
+
+    found: dict[tuple[str, str], ParsedFixture] = {}
+
+    for payload in _iter_next_payloads(html):
+        stack = [payload]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, list):
+                stack.extend(reversed(node))
+                continue
+            if not isinstance(node, dict):
+                continue
+            fx = None
+            if _first_key(node, _HOME_KEYS) is not None and _first_key(node, _AWAY_KEYS) is not None:
+                rounds = _json_round_numbers(node)
+                if rounds and not (rounds & this_round):
+                    continue  # another round's match (calendar, precedentes...)
+                fx = _json_match_to_fixture(node, round_number=round_number, source_url=source_url)
+            if fx is not None:
+                key = (fx.home_team_id, fx.away_team_id)
+                prev = found.get(key)
+                # the same match may be serialized twice; keep the richest copy
+                if prev is None or (prev.kickoff_at is None and fx.kickoff_at is not None) or (
+                    prev.acb_game_id is None and fx.acb_game_id is not None
+                ):
+                    found[key] = fx
+                continue
+            stack.extend(reversed(list(node.values())))
+
+    if not found:
+        return None
+
+    # Sanity checks: JSON team ids must be the club ids linked from the page, and
+    # it must look like one round (at most 9 games, no club playing twice)
+    if any(k[0] not in linked or k[1] not in linked for k in found):
+        return None
+    teams = [t for k in found for t in k]
+    if len(found) > _MAX_MATCHES_PER_ROUND or len(set(teams)) != len(teams):
+        return None
+
+    return list(found.values())
+
+
+# ----------------------------
+# DOM fallback (MatchCard walker)
+# ----------------------------
+
+def _parse_partidos_dom(html: str, *, season_id: str, round_number: int, source_url: str) -> List[ParsedFixture]:
+    doc = parse_html(html)
+    if doc is None:
+        return []
+
+    cards_all = [d for d in doc.iter("div") if _is_matchcard_div(d)]
     # keep only the outermost match cards (no parent matchcard)
-    cards = [c for c in cards_all if not c.find_parent(_is_matchcard_div)]
-    
+    cards = [c for c in cards_all if not any(_is_matchcard_div(p) for p in c.iterancestors("div"))]
+
     fixtures: List[ParsedFixture] = []
 
     for card in cards:
         # Team links (usually 2)
-        team_links = card.find_all("a", href=TEAM_ID_RE)
+        team_links = [a for a in card.iter("a") if TEAM_ID_RE.search(a.get("href") or "")]
         team_ids: List[str] = []
         for a in team_links:
             tid = _extract_team_id_from_href(a.get("href", ""))
@@ -224,14 +463,14 @@ def scrape_partidos(
         home_id, away_id = team_ids[0], team_ids[1]
 
         # Finished?
-        card_text = card.get_text(" ", strip=True)
+        card_text = get_text(card, " ")
         is_finished = "Final" in card_text  # robust enough for now
 
         # Scores: MatchScore_matchScore__... contains numbers (we pick first 2 ints)
-        score_nodes = card.find_all("p", class_=re.compile(r"^MatchScore_matchScore__"))
+        score_nodes = [n for n in card.iter("p") if has_class_prefix(n, "MatchScore_matchScore__")]
         scores: List[int] = []
         for n in score_nodes:
-            t = n.get_text(strip=True)
+            t = get_text(n)
             ms = SCORE_RE.match(t)
             if ms:
                 scores.append(int(ms.group(1)))
@@ -255,13 +494,6 @@ def scrape_partidos(
 
         live_url, acb_game_id = _extract_live_action_link_and_game_id(card)
 
-        # If ACB card doesn't have a real datetime (skeleton / none), try live.acb.com
-        if kickoff_at is None and acb_game_id:
-            kickoff_at = fetch_kickoff_from_acb_stats(acb_game_id)
-        if kickoff_at is None and live_url:
-            kickoff_at = fetch_kickoff_from_live(live_url)
-
-
         fixtures.append(
             ParsedFixture(
                 round_number=round_number,
@@ -273,7 +505,7 @@ def scrape_partidos(
                 away_score=away_score,
                 is_postponed=is_postponed,
                 is_advanced=is_advanced,
-                source_url=url,
+                source_url=source_url,
                 acb_game_id=acb_game_id,
                 live_url=live_url,
             )
@@ -281,6 +513,43 @@ def scrape_partidos(
 
     return fixtures
 
+
+def parse_partidos_html(html: str, *, season_id: str, round_number: int, source_url: str) -> List[ParsedFixture]:
+    """Fixtures of one partidos page (Next.js payload first, rendered DOM as fallback); no network."""
+    fixtures = _parse_partidos_next_data(html, round_number=round_number, source_url=source_url)
+    if fixtures is None:
+        # Not silent: if every round says this, the payload keys no longer match the site
+        print(f"[partidos][WARN] round {round_number}: no usable Next.js match payload, DOM fallback", flush=True)
+        fixtures = _parse_partidos_dom(html, season_id=season_id, round_number=round_number, source_url=source_url)
+    return fixtures
+
+
+def scrape_partidos(
+    *,
+    season_id: str,
+    competicion: int,
+    jornada_id: int,
+    round_number: int,
+    timeout_s: float = 30.0,
+    resolve_kickoffs: bool = True,
+) -> List[ParsedFixture]:
+    """
+    resolve_kickoffs=False leaves skeleton kickoffs as None, so a multi-round
+    caller can batch them through app.scrapers.kickoff_resolver itself.
+    """
+    url = PARTIDOS_URL.format(competicion=competicion, jornada_id=jornada_id)
+
+    html = fetch_text(url, timeout=timeout_s)
+
+    fixtures = parse_partidos_html(html, season_id=season_id, round_number=round_number, source_url=url)
+
+    if not resolve_kickoffs:
+        return fixtures
+
+    # Skeleton datetimes: resolved concurrently + memoized (stats page, then live.acb.com)
+    from app.scrapers.kickoff_resolver import resolve_missing_kickoffs
+    return resolve_missing_kickoffs(fixtures)
+
 DDMMYYYY_HHMM_RE = re.compile(r"\b(\d{1,2}/\d{1,2}/\d{4})\s+(\d{1,2}:\d{2})\b")
 
 ISO_DT_RE = re.compile(r"\b(\d{4}-\d{2}-\d{2}T\d{2}:\d{2})\b")
@@ -292,23 +561,24 @@ LIVE_DT_RE_2 = re.compile(
     re.I,
 )
 
+# English page: LIVE_DT_RE / LIVE_DT_RE_2 expect English month names
+LIVE_HEADERS = {"Accept-Language": "en,en-GB;q=0.9,es;q=0.8"}
+
+
 def fetch_kickoff_from_live(url: str, timeout_s: float = 30.0) -> Optional[datetime]:
-    headers = {
-        "User-Agent": "Mozilla/5.0",
-        "Accept-Language": "en,en-GB;q=0.9,es;q=0.8",
-    }
+    html = fetch_text(url, headers=LIVE_HEADERS, timeout=timeout_s)
+    return parse_kickoff_from_live_html(html)
 
-    with httpx.Client(headers=headers, timeout=timeout_s, follow_redirects=True) as client:
-        r = client.get(url)
-        r.raise_for_status()
-        html = r.text
 
-    soup = BeautifulSoup(html, "lxml")
+def parse_kickoff_from_live_html(html: str) -> Optional[datetime]:
+    doc = parse_html(html)
+    if doc is None:
+        return None
 
     # 1) Try <time datetime="...">
-    t = soup.find("time")
-    if t and t.get("datetime"):
-        dt = dtparser.parse(t["datetime"])
+    t = next(doc.iter("time"), None)
+    if t is not None and t.get("datetime"):
+        dt = dtparser.parse(t.get("datetime"))
         return dt.astimezone(TZ) if dt.tzinfo else dt.replace(tzinfo=TZ)
 
     # 2) Try ISO-like datetime inside the page
@@ -318,7 +588,7 @@ def fetch_kickoff_from_live(url: str, timeout_s: float = 30.0) -> Optional[datet
         return dt.astimezone(TZ) if dt.tzinfo else dt.replace(tzinfo=TZ)
 
     # 3) Fallback: English “18 February 2026 … 20:00” style (weekday optional)
-    text = soup.get_text("\n", strip=True)
+    text = get_text(doc, "\n")
 
     m = LIVE_DT_RE.search(text)
     if m:
@@ -340,20 +610,11 @@ def fetch_kickoff_from_acb_stats(game_id: str, timeout_s: float = 30.0) -> Optio
     Returns timezone-aware datetime in Europe/Madrid when possible.
     """
     url = ACB_STATS_URL.format(game_id=game_id)
+    html = fetch_text(url, timeout=timeout_s)
+    return parse_kickoff_from_acb_stats_html(html)
 
-    headers = {
-        "User-Agent": "Mozilla/5.0",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        "Accept-Language": "es-ES,es;q=0.9,en;q=0.8",
-        "Referer": "https://acb.com/",
-        "Connection": "keep-alive",
-    }
-
-    with httpx.Client(headers=headers, timeout=timeout_s, follow_redirects=True) as client:
-        r = client.get(url)
-        r.raise_for_status()
-        html = r.text
 
+def parse_kickoff_from_acb_stats_html(html: str) -> Optional[datetime]:
     # 1) Fast path: regex directly in HTML (most reliable and cheap)
     m = ACB_STATS_DT_RE.search(html)
     if m:
@@ -361,10 +622,12 @@ def fetch_kickoff_from_acb_stats(game_id: str, timeout_s: float = 30.0) -> Optio
         dt = dtparser.parse(f"{m.group(1)} {m.group(2)}", dayfirst=True)
         return dt.astimezone(TZ) if (dt.tzinfo and TZ) else dt.replace(tzinfo=TZ)
 
-    soup = BeautifulSoup(html, "lxml")
+    doc = parse_html(html)
+    if doc is None:
+        return None
 
     # 2) Fallback: search in visible text
-    text = soup.get_text("\n", strip=True)
+    text = get_text(doc, "\n")
     m2 = ACB_STATS_DT_RE.search(text)
     if m2:
         dt = dtparser.parse(f"{m2.group(1)} {m2.group(2)}", dayfirst=True)
@@ -1,10 +1,41 @@
+import asyncio
 import httpx
 import re
 
 from html import unescape
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, Iterable, List, Optional, Union
 
-from app.scrapers.http import make_client, get_with_retry
+from app.core.config import settings
+from app.scrapers.http import aget, get, make_async_client
+
+ROSTER_URL = "https://www.acb.com/club/plantilla-lista/id/{acb_club_id}/temporada_id/{sid}"
+
+
+def _roster_url(acb_club_id: str, season_id: Optional[Union[str, int]]) -> str:
+    sid = str(season_id) if season_id is not None else ""
+    return ROSTER_URL.format(acb_club_id=acb_club_id, sid=sid)
+
+
+def _roster_fetch_info(url: str, resp: Optional[httpx.Response], exc: Optional[Exception],
+                       include_html: bool) -> Dict[str, Any]:
+    if resp is None:
+        # Return a structured failure instead of throwing
+        return {
+            "requested_url": url,
+            "final_url": None,
+            "status_code": None,
+            "html_len": 0,
+            "error": f"{exc.__class__.__name__}: {str(exc)}",
+        }
+    data: Dict[str, Any] = {
+        "requested_url": url,
+        "final_url": str(resp.url),
+        "status_code": resp.status_code,
+        "html_len": len(resp.text or ""),
+    }
+    if include_html:
+        data["html"] = resp.text or ""
+    return data
 
 
 def fetch_team_roster_html(
@@ -15,35 +46,51 @@ def fetch_team_roster_html(
         include_html: bool = False
 ) -> Dict[str, Any]:
     # Accept either season_id or temporada_id, and normalize to string
-    sid = season_id if season_id is not None else temporada_id
-    sid = str(sid) if sid is not None else ""
+    url = _roster_url(acb_club_id, season_id if season_id is not None else temporada_id)
+    try:
+        resp = get(url)
+    except httpx.HTTPError as exc:
+        return _roster_fetch_info(url, None, exc, include_html)
+    return _roster_fetch_info(url, resp, None, include_html)
+
 
-    url = f"https://www.acb.com/club/plantilla-lista/id/{acb_club_id}/temporada_id/{sid}"
-    with make_client() as client:
+async def _fetch_rosters(urls: Dict[str, str], concurrency: int, include_html: bool) -> Dict[str, Dict[str, Any]]:
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(client, url: str) -> Dict[str, Any]:
+        # Retries/backoff: transport level (app/scrapers/throttle.py)
         try:
-            resp = get_with_retry(client, url, retries=1, backoff_s=1.0)
+            async with sem:
+                resp = await aget(client, url)
         except httpx.HTTPError as exc:
-            # Return a structured failure instead of throwing
-            return {
-                "requested_url": url,
-                "final_url": None,
-                "status_code": None,
-                "html_len": 0,
-                "error": f"{exc.__class__.__name__}: {str(exc)}",
-            }
+            return _roster_fetch_info(url, None, exc, include_html)
+        return _roster_fetch_info(url, resp, None, include_html)
+
+    async with make_async_client(max_connections=concurrency) as client:
+        infos = await asyncio.gather(*[one(client, u) for u in urls.values()])
+    return dict(zip(urls.keys(), infos))
+
+
+def fetch_team_rosters_html(
+        acb_club_ids: Iterable[str],
+        season_id: Optional[Union[str, int]] = None,
+        *,
+        concurrency: Optional[int] = None,
+        include_html: bool = False,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    fetch_team_roster_html for many clubs at once (bounded parallelism).
+    Returns {acb_club_id: fetch_info}; failures are structured, never raised.
+    Must be called without a running event loop (sync routes / scripts).
+    """
+    urls = {str(cid): _roster_url(str(cid), season_id) for cid in acb_club_ids if cid}
+    if not urls:
+        return {}
+    n = max(1, int(concurrency or settings.SCRAPER_CONCURRENCY))
+    return asyncio.run(_fetch_rosters(urls, n, include_html))
 
-        data: Dict[str, Any] = {
-            "requested_url": url,
-            "final_url": str(resp.url),
-            "status_code": resp.status_code,
-            "html_len": len(resp.text or ""),
-        }
-        if include_html:
-            data["html"] = resp.text or ""
-        return data
 
 
-    
 def parse_roster_players(html: str) -> List[Dict[str, str]]:
     """
     Parse ACB roster HTML and return list of players with:
@@ -0,0 +1,134 @@
+# app/scrapers/archive.py
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from app.core.config import settings
+
+# Append-only archive of every page downloaded from acb.com (separate SQLite file).
+# Unlike the HTML cache (latest body per URL, may be evicted/overwritten), every
+# distinct version of a page is kept: (url, sha1) is unique, a re-download of
+# identical content only bumps last_seen_at.
+# app/seed/reprocess_archive.py re-runs the current parsers over it offline.
+
+
+@dataclass(frozen=True)
+class ArchivedPage:
+    id: int
+    url: str
+    final_url: str
+    sha1: str
+    fetched_at: float  # first time this version was seen
+    last_seen_at: float
+    encoding: str
+    body: bytes
+
+    @property
+    def text(self) -> str:
+        return self.body.decode(self.encoding or "utf-8", errors="replace")
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS html_archive (
+    id           INTEGER PRIMARY KEY,
+    url          TEXT NOT NULL,
+    final_url    TEXT NOT NULL,
+    sha1         TEXT NOT NULL,
+    fetched_at   REAL NOT NULL,
+    last_seen_at REAL NOT NULL,
+    encoding     TEXT NOT NULL DEFAULT 'utf-8',
+    body         BLOB NOT NULL,
+    UNIQUE (url, sha1)
+);
+CREATE INDEX IF NOT EXISTS ix_html_archive_url_seen ON html_archive (url, last_seen_at);
+"""
+
+_COLUMNS = "id, url, final_url, sha1, fetched_at, last_seen_at, encoding, body"
+
+
+def _page(row) -> ArchivedPage:
+    return ArchivedPage(
+        id=row[0], url=row[1], final_url=row[2], sha1=row[3], fetched_at=row[4],
+        last_seen_at=row[5], encoding=row[6], body=zlib.decompress(row[7]),
+    )
+
+
+class HtmlArchive:
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._con = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._con.execute("PRAGMA journal_mode=WAL")
+        self._con.execute("PRAGMA synchronous=NORMAL")
+        self._con.executescript(_SCHEMA)
+
+    def put(self, url: str, *, final_url: str, body: bytes, encoding: Optional[str]) -> str:
+        """Store this version of the page (no-op apart from last_seen_at if already archived)."""
+        sha1 = hashlib.sha1(body).hexdigest()
+        now = time.time()
+        with self._lock:
+            cur = self._con.execute(
+                "UPDATE html_archive SET last_seen_at = ? WHERE url = ? AND sha1 = ?",
+                (now, url, sha1),
+            )
+            if cur.rowcount == 0:
+                self._con.execute(
+                    "INSERT INTO html_archive (url, final_url, sha1, fetched_at, last_seen_at, encoding, body) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (url, final_url, sha1, now, now, encoding or "utf-8", zlib.compress(body, 6)),
+                )
+        return sha1
+
+    def latest(self, url: str) -> Optional[ArchivedPage]:
+        with self._lock:
+            row = self._con.execute(
+                f"SELECT {_COLUMNS} FROM html_archive WHERE url = ? ORDER BY last_seen_at DESC, id DESC LIMIT 1",
+                (url,),
+            ).fetchone()
+        return _page(row) if row else None
+
+    def urls(self, prefix: str = "") -> List[str]:
+        """Distinct archived URLs starting with prefix."""
+        with self._lock:
+            rows = self._con.execute(
+                "SELECT DISTINCT url FROM html_archive WHERE substr(url, 1, ?) = ? ORDER BY url",
+                (len(prefix), prefix),
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def iter_latest(self, prefix: str = "") -> Iterator[ArchivedPage]:
+        """Latest version of every URL starting with prefix (one page in memory at a time)."""
+        for url in self.urls(prefix):
+            page = self.latest(url)
+            if page is not None:
+                yield page
+
+    def stats(self) -> dict:
+        with self._lock:
+            n, urls, size = self._con.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT url), COALESCE(SUM(LENGTH(body)), 0) FROM html_archive"
+            ).fetchone()
+        return {"versions": n, "urls": urls, "compressed_bytes": size}
+
+
+_archive: Optional[HtmlArchive] = None
+_archive_lock = threading.Lock()
+
+
+def get_archive() -> Optional[HtmlArchive]:
+    """Process-wide archive, or None when SCRAPER_ARCHIVE_ENABLED is off."""
+    global _archive
+    if not settings.SCRAPER_ARCHIVE_ENABLED:
+        return None
+    if _archive is None:
+        with _archive_lock:
+            if _archive is None:
+                _archive = HtmlArchive(settings.SCRAPER_ARCHIVE_PATH)
+    return _archive
@@ -0,0 +1,172 @@
+# app/scrapers/cache.py
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from app.core.config import settings
+
+# On-disk HTML cache keyed by URL (separate SQLite file, not the game DB).
+# - bodies stored zlib-compressed
+# - ETag / Last-Modified kept for conditional revalidation (304 => reuse body)
+# - immutable entries (finished-game stats pages) are served without any request
+# - entries younger than SCRAPER_CACHE_FRESH_S are reused without revalidation, so
+#   one run never downloads the same URL twice (e.g. kickoff lookup + stats ingestion)
+# - small side table memoizing game_id -> kickoff (see kickoff_resolver.py)
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    url: str
+    final_url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+    immutable: bool
+    body: bytes
+    encoding: str
+
+    @property
+    def text(self) -> str:
+        return self.body.decode(self.encoding or "utf-8", errors="replace")
+
+    def is_fresh(self, max_age_s: float) -> bool:
+        return self.immutable or (time.time() - self.fetched_at) < max_age_s
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS http_cache (
+    url           TEXT PRIMARY KEY,
+    final_url     TEXT NOT NULL,
+    etag          TEXT,
+    last_modified TEXT,
+    fetched_at    REAL NOT NULL,
+    immutable     INTEGER NOT NULL DEFAULT 0,
+    encoding      TEXT NOT NULL DEFAULT 'utf-8',
+    body          BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS kickoff_memo (
+    acb_game_id TEXT PRIMARY KEY,
+    kickoff_at  TEXT NOT NULL,
+    is_final    INTEGER NOT NULL DEFAULT 0,
+    resolved_at REAL NOT NULL
+);
+"""
+
+
+class HtmlCache:
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._con = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._con.execute("PRAGMA journal_mode=WAL")
+        self._con.execute("PRAGMA synchronous=NORMAL")
+        self._con.executescript(_SCHEMA)
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._con.execute(
+                "SELECT url, final_url, etag, last_modified, fetched_at, immutable, encoding, body "
+                "FROM http_cache WHERE url = ?",
+                (url,),
+            ).fetchone()
+        if not row:
+            return None
+        return CacheEntry(
+            url=row[0],
+            final_url=row[1],
+            etag=row[2],
+            last_modified=row[3],
+            fetched_at=row[4],
+            immutable=bool(row[5]),
+            encoding=row[6],
+            body=zlib.decompress(row[7]),
+        )
+
+    def put(
+        self,
+        url: str,
+        *,
+        final_url: str,
+        body: bytes,
+        encoding: Optional[str],
+        etag: Optional[str],
+        last_modified: Optional[str],
+        immutable: bool = False,
+    ) -> None:
+        blob = zlib.compress(body, 6)
+        with self._lock:
+            self._con.execute(
+                "INSERT INTO http_cache (url, final_url, etag, last_modified, fetched_at, immutable, encoding, body) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(url) DO UPDATE SET final_url=excluded.final_url, etag=excluded.etag, "
+                "last_modified=excluded.last_modified, fetched_at=excluded.fetched_at, "
+                "immutable=MAX(http_cache.immutable, excluded.immutable), "
+                "encoding=excluded.encoding, body=excluded.body",
+                (url, final_url, etag, last_modified, time.time(), 1 if immutable else 0, encoding or "utf-8", blob),
+            )
+
+    def touch(self, url: str, *, immutable: bool = False) -> None:
+        # 304 Not Modified: body still valid; refresh timestamp (and maybe pin it)
+        with self._lock:
+            self._con.execute(
+                "UPDATE http_cache SET fetched_at = ?, immutable = MAX(immutable, ?) WHERE url = ?",
+                (time.time(), 1 if immutable else 0, url),
+            )
+
+    def delete(self, url: str) -> None:
+        with self._lock:
+            self._con.execute("DELETE FROM http_cache WHERE url = ?", (url,))
+
+    # --- kickoff memo ---
+
+    def get_kickoffs(self, game_ids: Iterable[str], max_age_s: float) -> Dict[str, datetime]:
+        """Memoized kickoffs; non-final entries older than max_age_s are ignored."""
+        ids = list(game_ids)
+        if not ids:
+            return {}
+        now = time.time()
+        out: Dict[str, datetime] = {}
+        with self._lock:
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i + 500]
+                rows = self._con.execute(
+                    f"SELECT acb_game_id, kickoff_at, is_final, resolved_at FROM kickoff_memo "
+                    f"WHERE acb_game_id IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                for gid, ko, is_final, resolved_at in rows:
+                    if is_final or (now - resolved_at) < max_age_s:
+                        out[gid] = datetime.fromisoformat(ko)
+        return out
+
+    def put_kickoff(self, game_id: str, kickoff_at: datetime, *, is_final: bool = False) -> None:
+        with self._lock:
+            self._con.execute(
+                "INSERT INTO kickoff_memo (acb_game_id, kickoff_at, is_final, resolved_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(acb_game_id) DO UPDATE SET kickoff_at=excluded.kickoff_at, "
+                "is_final=excluded.is_final, resolved_at=excluded.resolved_at",
+                (game_id, kickoff_at.isoformat(), 1 if is_final else 0, time.time()),
+            )
+
+
+_cache: Optional[HtmlCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> Optional[HtmlCache]:
+    """Process-wide cache, or None when SCRAPER_CACHE_ENABLED is off."""
+    global _cache
+    if not settings.SCRAPER_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = HtmlCache(settings.SCRAPER_CACHE_PATH)
+    return _cache
@@ -1,24 +1,253 @@
+import atexit
+import threading
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
 import httpx
-import time
+
+from app.core.config import settings
+from app.scrapers.archive import get_archive
+from app.scrapers.cache import CacheEntry, HtmlCache, get_cache
+from app.scrapers.replay import RecordingTransport, ReplayTransport
+from app.scrapers.throttle import ResilientTransport
+
+# Single place for every scraper's HTTP settings.
+# - One pooled client per host (keep-alive + TLS session reuse across calls)
+# - HTTP/2 when the optional `h2` package is installed (pip install "httpx[http2]");
+#   ALPN falls back to HTTP/1.1 on hosts that don't support it
+# - Compression: httpx negotiates gzip/deflate by default (plus br/zstd when
+#   brotli/zstandard are installed) and decodes transparently
+# - Every transport is wrapped in throttle.ResilientTransport: per-host rate limit,
+#   retries with backoff (Retry-After aware) and a circuit breaker
+try:
+    import h2  # noqa: F401
+    HTTP2_ENABLED = True
+except ImportError:
+    HTTP2_ENABLED = False
 
 DEFAULT_HEADERS = {
-    "User-Agent": "ACB_PLUSMINUS/0.1 (manual scraper; contact: internal)"
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "es-ES,es;q=0.9,en;q=0.8",
+    "Referer": "https://acb.com/",
 }
 
+# Give ACB more time; sometimes it stalls.
+DEFAULT_TIMEOUT = httpx.Timeout(connect=10.0, read=40.0, write=10.0, pool=10.0)
+
+# Per-host pool size (acb.com, www.acb.com and live.acb.com each get their own)
+MAX_CONNECTIONS_PER_HOST = 16
+KEEPALIVE_EXPIRY_S = 30.0
+
+_clients: Dict[str, httpx.Client] = {}
+_clients_lock = threading.Lock()
+
+
+def _make_inner_transport(limits: httpx.Limits, is_async: bool):
+    mode = (settings.SCRAPER_HTTP_MODE or "live").strip().lower()
+    if mode == "replay":
+        return ReplayTransport(
+            settings.SCRAPER_CORPUS_DIR,
+            latency_ms=settings.SCRAPER_REPLAY_LATENCY_MS,
+            jitter_ms=settings.SCRAPER_REPLAY_JITTER_MS,
+            error_rate=settings.SCRAPER_REPLAY_ERROR_RATE,
+            seed=settings.SCRAPER_REPLAY_SEED,
+        )
+    if is_async:
+        inner = httpx.AsyncHTTPTransport(http2=HTTP2_ENABLED, limits=limits)
+        if mode == "record":
+            return RecordingTransport(settings.SCRAPER_CORPUS_DIR, async_inner=inner)
+        return inner
+    inner = httpx.HTTPTransport(http2=HTTP2_ENABLED, limits=limits)
+    if mode == "record":
+        return RecordingTransport(settings.SCRAPER_CORPUS_DIR, sync_inner=inner)
+    return inner
+
+
+def _make_transport(limits: httpx.Limits, is_async: bool) -> ResilientTransport:
+    inner = _make_inner_transport(limits, is_async)
+    # Replay has no real host to protect: keep retries/breaker (injected errors), skip the rate limit
+    replay = (settings.SCRAPER_HTTP_MODE or "live").strip().lower() == "replay"
+    return ResilientTransport(
+        sync_inner=None if is_async else inner,
+        async_inner=inner if is_async else None,
+        retries=settings.SCRAPER_HTTP_RETRIES,
+        backoff_s=settings.SCRAPER_BACKOFF_S,
+        backoff_max_s=settings.SCRAPER_BACKOFF_MAX_S,
+        retry_after_max_s=settings.SCRAPER_RETRY_AFTER_MAX_S,
+        rate_limit=not replay,
+    )
+
+
+def _client_kwargs(max_connections: int = MAX_CONNECTIONS_PER_HOST, is_async: bool = False) -> dict:
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        keepalive_expiry=KEEPALIVE_EXPIRY_S,
+    )
+    kwargs = {
+        "headers": DEFAULT_HEADERS,
+        "timeout": DEFAULT_TIMEOUT,
+        "limits": limits,
+        "http2": HTTP2_ENABLED,
+        "follow_redirects": True,
+    }
+    kwargs["transport"] = _make_transport(limits, is_async)
+    return kwargs
+
+
+def _host_of(url: str) -> str:
+    return (urlsplit(url).hostname or "").lower()
+
+
+def get_client(url: str) -> httpx.Client:
+    """
+    Process-wide pooled client for the host of `url` (thread-safe, created lazily).
+    Do NOT close it; it lives until process exit.
+    """
+    host = _host_of(url)
+    client = _clients.get(host)
+    if client is not None:
+        return client
+    with _clients_lock:
+        client = _clients.get(host)
+        if client is None:
+            client = httpx.Client(**_client_kwargs())
+            _clients[host] = client
+        return client
+
+
+def close_clients() -> None:
+    # Also call this after changing SCRAPER_HTTP_MODE at runtime (next get_client rebuilds)
+    with _clients_lock:
+        for c in _clients.values():
+            c.close()
+        _clients.clear()
+
+
+atexit.register(close_clients)
+
+
 def make_client() -> httpx.Client:
-    # Give ACB more time; sometimes it stalls.
-    timeout = httpx.Timeout(connect=10.0, read=40.0, write=10.0, pool=10.0)
-    return httpx.Client(headers=DEFAULT_HEADERS, timeout=timeout, follow_redirects=True)
-
-def get_with_retry(client: httpx.Client, url: str, retries: int = 1, backoff_s: float = 1.0) -> httpx.Response:
-    last_exc = None
-    for attempt in range(retries + 1):
-        try:
-            return client.get(url)
-        except (httpx.ReadTimeout, httpx.ConnectTimeout, httpx.NetworkError) as exc:
-            last_exc = exc
-            if attempt < retries:
-                time.sleep(backoff_s * (attempt + 1))
-                continue
-            raise
-    raise last_exc  # type: ignore
\ No newline at end of file
+    # Standalone client with the shared settings (caller closes it)
+    return httpx.Client(**_client_kwargs())
+
+
+def make_async_client(max_connections: int = 8) -> httpx.AsyncClient:
+    # Async clients are bound to one event loop, so they are per-batch, not global.
+    return httpx.AsyncClient(**_client_kwargs(max_connections, is_async=True))
+
+
+def get_with_retry(client: httpx.Client, url: str, retries: Optional[int] = None, **kwargs) -> httpx.Response:
+    # Retries/backoff happen in the transport (throttle.ResilientTransport);
+    # `retries` overrides SCRAPER_HTTP_RETRIES for this request
+    if retries is not None:
+        kwargs["extensions"] = {**kwargs.get("extensions", {}), "retries": retries}
+    return client.get(url, **kwargs)
+
+
+def _conditional_headers(entry: CacheEntry, headers: Optional[dict]) -> dict:
+    h = dict(headers or {})
+    if entry.etag:
+        h["If-None-Match"] = entry.etag
+    if entry.last_modified:
+        h["If-Modified-Since"] = entry.last_modified
+    return h
+
+
+def _response_from_cache(entry: CacheEntry) -> httpx.Response:
+    # Looks like a plain 200 to callers (status_code / url / text all work)
+    return httpx.Response(
+        200,
+        content=entry.body,
+        headers={"Content-Type": f"text/html; charset={entry.encoding}"},
+        request=httpx.Request("GET", entry.final_url),
+    )
+
+
+def _archive_response(url: str, resp: httpx.Response) -> None:
+    # Every page actually downloaded (replayed corpus pages are already on disk)
+    if resp.status_code != 200 or (settings.SCRAPER_HTTP_MODE or "").strip().lower() == "replay":
+        return
+    archive = get_archive()
+    if archive is not None:
+        archive.put(url, final_url=str(resp.url), body=resp.content, encoding=resp.encoding)
+
+
+def _after_response(cache: Optional[HtmlCache], entry: Optional[CacheEntry], url: str,
+                    resp: httpx.Response, immutable: bool) -> httpx.Response:
+    _archive_response(url, resp)
+    if cache is None:
+        return resp
+    if resp.status_code == 304 and entry is not None:
+        cache.touch(url, immutable=immutable)
+        return _response_from_cache(entry)
+    if resp.status_code == 200:
+        cache.put(
+            url,
+            final_url=str(resp.url),
+            body=resp.content,
+            encoding=resp.encoding,
+            etag=resp.headers.get("ETag"),
+            last_modified=resp.headers.get("Last-Modified"),
+            immutable=immutable,
+        )
+    return resp
+
+
+def get(url: str, *, headers: Optional[dict] = None, timeout: Optional[float] = None, retries: Optional[int] = None,
+        immutable: bool = False, use_cache: bool = True) -> httpx.Response:
+    """
+    GET through the shared pool + HTML cache. Does not raise on HTTP error status.
+    `headers` are merged over DEFAULT_HEADERS for this request only.
+    `immutable=True` pins the page once fetched (e.g. finished-game stats):
+    later calls are served from disk without touching the network.
+    `use_cache=False` always hits the network (and doesn't store).
+    `retries=None` => SCRAPER_HTTP_RETRIES (network errors, 429 and 5xx, with backoff).
+    """
+    cache = get_cache() if use_cache else None
+    entry = cache.get(url) if cache else None
+    if entry is not None:
+        if entry.is_fresh(settings.SCRAPER_CACHE_FRESH_S):
+            if immutable and not entry.immutable:
+                cache.touch(url, immutable=True)
+            return _response_from_cache(entry)
+        headers = _conditional_headers(entry, headers)
+
+    kwargs = {}
+    if headers:
+        kwargs["headers"] = headers
+    if timeout is not None:
+        kwargs["timeout"] = timeout
+    resp = get_with_retry(get_client(url), url, retries=retries, **kwargs)
+    return _after_response(cache, entry, url, resp, immutable)
+
+
+def fetch_text(url: str, *, headers: Optional[dict] = None, timeout: Optional[float] = None, retries: Optional[int] = None,
+               immutable: bool = False) -> str:
+    r = get(url, headers=headers, timeout=timeout, retries=retries, immutable=immutable)
+    r.raise_for_status()
+    return r.text
+
+
+async def aget(client: httpx.AsyncClient, url: str, *, headers: Optional[dict] = None,
+               immutable: bool = False, use_cache: bool = True) -> httpx.Response:
+    # Async twin of get(); cache lookups are local SQLite reads, cheap enough inline
+    cache = get_cache() if use_cache else None
+    entry = cache.get(url) if cache else None
+    if entry is not None:
+        if entry.is_fresh(settings.SCRAPER_CACHE_FRESH_S):
+            if immutable and not entry.immutable:
+                cache.touch(url, immutable=True)
+            return _response_from_cache(entry)
+        headers = _conditional_headers(entry, headers)
+
+    resp = await client.get(url, headers=headers)
+    return _after_response(cache, entry, url, resp, immutable)
+
+
+async def afetch_text(client: httpx.AsyncClient, url: str, *, headers: Optional[dict] = None,
+                      immutable: bool = False) -> str:
+    r = await aget(client, url, headers=headers, immutable=immutable)
+    r.raise_for_status()
+    return r.text
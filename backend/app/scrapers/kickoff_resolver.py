@@ -0,0 +1,126 @@
+# app/scrapers/kickoff_resolver.py
+from __future__ import annotations
+
+import asyncio
+from dataclasses import replace
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+from app.scrapers.acb_partidos import (
+    ACB_STATS_URL,
+    LIVE_HEADERS,
+    TZ,
+    ParsedFixture,
+    parse_kickoff_from_acb_stats_html,
+    parse_kickoff_from_live_html,
+)
+from app.scrapers.cache import get_cache
+from app.scrapers.http import aget, make_async_client
+
+# Batched kickoff resolution for fixtures whose MatchCard shows a skeleton datetime.
+#
+# 1) memo (game_id -> kickoff, persisted next to the HTML cache)
+# 2) acb.com stats pages for the rest, fetched concurrently
+# 3) live.acb.com pages for whatever is still unknown, fetched concurrently
+#
+# Stats pages go through the shared HTML cache, so the later stats ingestion
+# (fetch_live_stats_html on the same URL) reuses the body instead of downloading it again.
+
+
+async def _fetch_and_parse(client, sem: asyncio.Semaphore, url: str, parse, *,
+                           headers: Optional[dict] = None, immutable: bool = False) -> Optional[datetime]:
+    try:
+        async with sem:
+            r = await aget(client, url, headers=headers, immutable=immutable)
+        if r.status_code != 200:
+            return None
+        return await asyncio.to_thread(parse, r.text)
+    except Exception:
+        return None
+
+
+async def _resolve_remote(pending: List[ParsedFixture], concurrency: int) -> Dict[int, datetime]:
+    # Keyed by position in `pending` (fixtures without acb_game_id may still have a live_url)
+    out: Dict[int, datetime] = {}
+    sem = asyncio.Semaphore(concurrency)
+
+    async with make_async_client(max_connections=concurrency) as client:
+        stats_idx = [i for i, fx in enumerate(pending) if fx.acb_game_id]
+        results = await asyncio.gather(*[
+            _fetch_and_parse(
+                client, sem, ACB_STATS_URL.format(game_id=pending[i].acb_game_id),
+                parse_kickoff_from_acb_stats_html, immutable=pending[i].is_finished,
+            )
+            for i in stats_idx
+        ])
+        for i, ko in zip(stats_idx, results):
+            if ko is not None:
+                out[i] = ko
+
+        live_idx = [i for i, fx in enumerate(pending) if i not in out and fx.live_url]
+        results = await asyncio.gather(*[
+            _fetch_and_parse(client, sem, pending[i].live_url, parse_kickoff_from_live_html, headers=LIVE_HEADERS)
+            for i in live_idx
+        ])
+        for i, ko in zip(live_idx, results):
+            if ko is not None:
+                out[i] = ko
+
+    return out
+
+
+def resolve_missing_kickoffs(fixtures: List[ParsedFixture], *, concurrency: Optional[int] = None) -> List[ParsedFixture]:
+    """
+    Fill kickoff_at for fixtures that don't have one (same order, same length).
+    Can be called per round or once for a whole batch of rounds.
+    """
+    pending_idx = [i for i, fx in enumerate(fixtures) if fx.kickoff_at is None and (fx.acb_game_id or fx.live_url)]
+    if not pending_idx:
+        return list(fixtures)
+
+    out = list(fixtures)
+    cache = get_cache()
+
+    # 1) memo
+    if cache is not None:
+        memo = cache.get_kickoffs(
+            {fixtures[i].acb_game_id for i in pending_idx if fixtures[i].acb_game_id},
+            max_age_s=settings.SCRAPER_KICKOFF_MEMO_TTL_S,
+        )
+        still = []
+        for i in pending_idx:
+            ko = memo.get(fixtures[i].acb_game_id) if fixtures[i].acb_game_id else None
+            if ko is not None:
+                # memo stores a fixed UTC offset; hand back Europe/Madrid like the parsers do
+                out[i] = replace(fixtures[i], kickoff_at=ko.astimezone(TZ) if TZ else ko)
+            else:
+                still.append(i)
+        pending_idx = still
+
+    if not pending_idx:
+        return out
+
+    # 2) + 3) network, deduplicated by game id
+    pending: List[ParsedFixture] = []
+    seen: Dict[str, int] = {}
+    slot_of: Dict[int, int] = {}
+    for i in pending_idx:
+        key = fixtures[i].acb_game_id or fixtures[i].live_url
+        if key not in seen:
+            seen[key] = len(pending)
+            pending.append(fixtures[i])
+        slot_of[i] = seen[key]
+
+    n = max(1, int(concurrency or settings.SCRAPER_CONCURRENCY))
+    resolved = asyncio.run(_resolve_remote(pending, n))
+
+    for i in pending_idx:
+        ko = resolved.get(slot_of[i])
+        if ko is None:
+            continue
+        out[i] = replace(fixtures[i], kickoff_at=ko)
+        if cache is not None and fixtures[i].acb_game_id:
+            cache.put_kickoff(fixtures[i].acb_game_id, ko, is_final=fixtures[i].is_finished)
+
+    return out
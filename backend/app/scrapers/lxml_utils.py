@@ -0,0 +1,59 @@
+# app/scrapers/lxml_utils.py
+from __future__ import annotations
+
+from typing import List, Optional
+
+from lxml import html as lxml_html
+
+# Small BeautifulSoup equivalents on plain lxml trees (no soup is ever built).
+
+# Text inside these is never visible (BeautifulSoup's get_text skips them too)
+NON_TEXT_TAGS = {"script", "style", "template"}
+
+
+def parse_html(html: str):
+    """lxml document root, or None for an empty page."""
+    if not html or not html.strip():
+        return None
+    return lxml_html.document_fromstring(html)
+
+
+def classes(el) -> List[str]:
+    return (el.get("class") or "").split()
+
+
+def has_class(el, cls: str) -> bool:
+    return cls in classes(el)
+
+
+def has_class_prefix(el, prefix: str) -> bool:
+    # CSS-module classes: "MatchCard_matchCard__x1y2z"
+    return any(c.startswith(prefix) for c in classes(el))
+
+
+def text_strings(el) -> List[str]:
+    """Stripped, non-empty text nodes under el (comments and script/style/template skipped)."""
+    out: List[str] = []
+
+    def add(t: Optional[str]) -> None:
+        if t:
+            t = t.strip()
+            if t:
+                out.append(t)
+
+    def walk(node) -> None:
+        add(node.text)
+        # Iterating an element also yields comments, whose tails are text
+        for child in node:
+            if isinstance(child.tag, str) and child.tag not in NON_TEXT_TAGS:
+                walk(child)
+            add(child.tail)
+
+    if not (isinstance(el.tag, str) and el.tag in NON_TEXT_TAGS):
+        walk(el)
+    return out
+
+
+def get_text(el, sep: str = "") -> str:
+    """Same as BeautifulSoup's el.get_text(sep, strip=True)."""
+    return sep.join(text_strings(el))
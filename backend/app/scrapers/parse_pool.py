@@ -0,0 +1,56 @@
+# app/scrapers/parse_pool.py
+from __future__ import annotations
+
+import asyncio
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from app.core.config import settings
+
+# Process pool for CPU-bound HTML parsing during bulk ingestion.
+# - downloads stay on the event loop; raw HTML goes to a parser process and
+#   compact row tuples come back (see acb_live_stats.parse_minutes_plusminus_tuples)
+# - one pool per process and size, created on first use; SCRAPER_PARSE_WORKERS=-1 sizes it
+#   to the CPUs (max 4), 0 parses in a thread instead (no extra processes)
+# - "spawn" context: never fork a process that already runs threads / an event loop
+
+_pools: Dict[int, ProcessPoolExecutor] = {}  # worker count -> pool
+_pool_lock = threading.Lock()
+
+
+def get_parse_pool(workers: Optional[int] = None) -> Optional[ProcessPoolExecutor]:
+    # One pool per size: asking for another size never shuts down a pool that
+    # another caller still has futures on
+    n = settings.SCRAPER_PARSE_WORKERS if workers is None else workers
+    if n < 0:
+        n = min(4, os.cpu_count() or 1)
+    if n == 0:
+        return None
+    with _pool_lock:
+        pool = _pools.get(n)
+        if pool is None:
+            pool = _pools[n] = ProcessPoolExecutor(max_workers=n, mp_context=multiprocessing.get_context("spawn"))
+        return pool
+
+
+def shutdown_parse_pool() -> None:
+    with _pool_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+atexit.register(shutdown_parse_pool)
+
+
+async def aparse(fn: Callable[..., Any], *args, workers: Optional[int] = None) -> Any:
+    """Run a (picklable, module-level) parser off the event loop: process pool, or a thread."""
+    pool = get_parse_pool(workers)
+    if pool is None:
+        return await asyncio.to_thread(fn, *args)
+    return await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
@@ -0,0 +1,154 @@
+# app/scrapers/replay.py
+from __future__ import annotations
+
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+import random
+import time
+from pathlib import Path
+from typing import Optional
+
+import httpx
+
+# Record/replay stand-in for acb.com (offline benchmarking / regression runs).
+#
+#   SCRAPER_HTTP_MODE=record  -> real network, every response also saved to the corpus
+#   SCRAPER_HTTP_MODE=replay  -> no network at all, corpus served with fake latency/errors
+#
+# Corpus layout: one gzip'd JSON file per URL, named sha1(url).json.gz:
+#   {"url", "status", "headers": {...}, "body_b64"}
+
+# Only these response headers matter to the scrapers / HTML cache
+_KEPT_HEADERS = ("content-type", "etag", "last-modified")
+
+
+def corpus_key(url: str) -> str:
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+
+def _corpus_path(corpus_dir: Path, url: str) -> Path:
+    return corpus_dir / f"{corpus_key(url)}.json.gz"
+
+
+def save_response(corpus_dir: Path, url: str, status: int, headers: httpx.Headers, body: bytes) -> None:
+    corpus_dir.mkdir(parents=True, exist_ok=True)
+    doc = {
+        "url": url,
+        "status": status,
+        "headers": {k: headers[k] for k in _KEPT_HEADERS if k in headers},
+        "body_b64": base64.b64encode(body).decode("ascii"),
+    }
+    tmp = _corpus_path(corpus_dir, url).with_suffix(".tmp")
+    with gzip.open(tmp, "wt", encoding="utf-8") as f:
+        json.dump(doc, f)
+    tmp.replace(_corpus_path(corpus_dir, url))
+
+
+def load_response(corpus_dir: Path, url: str) -> Optional[dict]:
+    p = _corpus_path(corpus_dir, url)
+    if not p.exists():
+        return None
+    with gzip.open(p, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def iter_corpus_urls(corpus_dir: Path):
+    for p in sorted(Path(corpus_dir).glob("*.json.gz")):
+        with gzip.open(p, "rt", encoding="utf-8") as f:
+            yield json.load(f)["url"]
+
+
+class RecordingTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """Wraps the real transport and writes every response into the corpus."""
+
+    def __init__(self, corpus_dir: str, *, sync_inner: Optional[httpx.BaseTransport] = None,
+                 async_inner: Optional[httpx.AsyncBaseTransport] = None):
+        self.corpus_dir = Path(corpus_dir)
+        self._sync = sync_inner
+        self._async = async_inner
+
+    def _record(self, request: httpx.Request, response: httpx.Response) -> None:
+        # 304s carry no body; keep the previously recorded 200 instead
+        if request.method == "GET" and response.status_code != 304:
+            save_response(self.corpus_dir, str(request.url), response.status_code, response.headers, response.content)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        response = self._sync.handle_request(request)
+        response.read()
+        self._record(request, response)
+        return response
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self._async.handle_async_request(request)
+        await response.aread()
+        self._record(request, response)
+        return response
+
+    def close(self) -> None:
+        if self._sync is not None:
+            self._sync.close()
+
+    async def aclose(self) -> None:
+        if self._async is not None:
+            await self._async.aclose()
+
+
+class ReplayTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """
+    Serves the corpus, never touches the network.
+    - latency_ms (+ uniform jitter_ms) per request
+    - error_rate: fraction of requests that fail (half 503, half connection errors)
+    - URLs not in the corpus -> 404
+    - honours If-None-Match / If-Modified-Since (304) so the HTML cache behaves as live
+    """
+
+    def __init__(self, corpus_dir: str, *, latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 error_rate: float = 0.0, seed: Optional[int] = None):
+        self.corpus_dir = Path(corpus_dir)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+
+    def _delay_s(self) -> float:
+        return (self.latency_ms + self._rng.uniform(0.0, self.jitter_ms)) / 1000.0
+
+    def _respond(self, request: httpx.Request) -> httpx.Response:
+        if self.error_rate and self._rng.random() < self.error_rate:
+            if self._rng.random() < 0.5:
+                raise httpx.ConnectError("replay: injected connection error", request=request)
+            return httpx.Response(503, text="replay: injected error", request=request)
+
+        doc = load_response(self.corpus_dir, str(request.url))
+        if doc is None:
+            return httpx.Response(404, text="replay: not in corpus", request=request)
+
+        headers = doc.get("headers") or {}
+        etag = headers.get("etag")
+        last_modified = headers.get("last-modified")
+        if (etag and request.headers.get("If-None-Match") == etag) or (
+            last_modified and request.headers.get("If-Modified-Since") == last_modified
+        ):
+            return httpx.Response(304, headers=headers, request=request)
+
+        return httpx.Response(
+            doc["status"],
+            headers=headers,
+            content=base64.b64decode(doc["body_b64"]),
+            request=request,
+        )
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        d = self._delay_s()
+        if d > 0:
+            time.sleep(d)
+        return self._respond(request)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        d = self._delay_s()
+        if d > 0:
+            await asyncio.sleep(d)
+        return self._respond(request)
@@ -0,0 +1,273 @@
+# app/scrapers/throttle.py
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+import httpx
+
+from app.core.config import settings
+
+# Politeness + resilience layer for every request to acb.com (wraps the transport,
+# so pooled, standalone and async clients all share it):
+# - per-host token bucket: SCRAPER_RATE_PER_HOST_S requests/s, bursts of SCRAPER_RATE_BURST;
+#   shared by every client/thread/event loop of the process
+# - retries on connection errors / timeouts / 429 / 5xx with exponential backoff and
+#   full jitter; Retry-After (seconds or HTTP date) is honoured and pauses the whole host
+# - per-host circuit breaker: after SCRAPER_BREAKER_FAILURES consecutive failures the
+#   host is "open" for SCRAPER_BREAKER_COOLDOWN_S and requests fail fast with
+#   CircuitOpenError; then one probe request decides whether it closes again
+# Only GET/HEAD are retried. Per-request override: extensions={"retries": n}.
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+# Transient transport failures (not e.g. UnsupportedProtocol / bad URLs)
+RETRY_EXCEPTIONS = (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+_IDEMPOTENT = {"GET", "HEAD"}
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Host marked as down by the circuit breaker; the request was not sent."""
+
+
+class TokenBucket:
+    """Thread-safe token bucket; reserve() returns how long the caller must wait."""
+
+    def __init__(self, rate_per_s: float, burst: int):
+        self.rate = rate_per_s
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self._paused_until - now)
+            if self.rate <= 0:
+                return wait
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Tokens may go negative: concurrent callers queue up behind each other
+            self._tokens -= 1.0
+            if self._tokens < 0:
+                wait = max(wait, -self._tokens / self.rate)
+            return wait
+
+    def pause(self, seconds: float) -> None:
+        # Retry-After: nobody talks to this host until then
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int, cooldown_s: float):
+        self.failure_threshold = failure_threshold
+        self.cooldown_s = cooldown_s
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half_open" if time.monotonic() - self.opened_at >= self.cooldown_s else "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.failure_threshold <= 0 or self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < self.cooldown_s or self._probing:
+                return False
+            self._probing = True  # half-open: a single probe goes through
+            return True
+
+    def release_probe(self) -> None:
+        # The probe ended without a verdict on the host (cancelled, non-transport error):
+        # stay half-open so the next request probes again
+        with self._lock:
+            self._probing = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._probing or (self.failure_threshold > 0 and self.failures >= self.failure_threshold):
+                self.opened_at = time.monotonic()
+            self._probing = False
+
+
+class HostPolicy:
+    def __init__(self, *, rate_per_s: float, burst: int, failure_threshold: int, cooldown_s: float):
+        self.bucket = TokenBucket(rate_per_s, burst)
+        self.breaker = CircuitBreaker(failure_threshold, cooldown_s)
+
+
+_policies: Dict[str, HostPolicy] = {}
+_policies_lock = threading.Lock()
+
+
+def get_host_policy(host: str) -> HostPolicy:
+    policy = _policies.get(host)
+    if policy is None:
+        with _policies_lock:
+            policy = _policies.get(host)
+            if policy is None:
+                policy = HostPolicy(
+                    rate_per_s=settings.SCRAPER_RATE_PER_HOST_S,
+                    burst=settings.SCRAPER_RATE_BURST,
+                    failure_threshold=settings.SCRAPER_BREAKER_FAILURES,
+                    cooldown_s=settings.SCRAPER_BREAKER_COOLDOWN_S,
+                )
+                _policies[host] = policy
+    return policy
+
+
+def reset_host_policies() -> None:
+    with _policies_lock:
+        _policies.clear()
+
+
+def host_status() -> Dict[str, dict]:
+    return {h: {"breaker": p.breaker.state, "failures": p.breaker.failures} for h, p in _policies.items()}
+
+
+def retry_after_s(response: httpx.Response) -> Optional[float]:
+    value = (response.headers.get("Retry-After") or "").strip()
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class ResilientTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """Rate limit + retry/backoff + circuit breaker around the real (or replay) transport."""
+
+    def __init__(self, *, sync_inner: Optional[httpx.BaseTransport] = None,
+                 async_inner: Optional[httpx.AsyncBaseTransport] = None,
+                 retries: int = 3, backoff_s: float = 0.5, backoff_max_s: float = 30.0,
+                 retry_after_max_s: float = 120.0, rate_limit: bool = True):
+        self._sync = sync_inner
+        self._async = async_inner
+        self.retries = retries
+        self.backoff_s = backoff_s
+        self.backoff_max_s = backoff_max_s
+        self.retry_after_max_s = retry_after_max_s
+        self.rate_limit = rate_limit
+
+    def _retries_for(self, request: httpx.Request) -> int:
+        if request.method not in _IDEMPOTENT:
+            return 0
+        return int(request.extensions.get("retries", self.retries))
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter: uniform in [0, min(cap, base * 2^attempt)]
+        return random.uniform(0.0, min(self.backoff_max_s, self.backoff_s * (2 ** attempt)))
+
+    def _before(self, request: httpx.Request, policy: HostPolicy) -> float:
+        if not policy.breaker.allow():
+            raise CircuitOpenError(f"circuit open for {request.url.host}", request=request)
+        return policy.bucket.reserve() if self.rate_limit else 0.0
+
+    def _after(self, response: httpx.Response, policy: HostPolicy, attempt: int, retries: int) -> Optional[float]:
+        """Seconds to sleep before retrying, or None to hand the response to the caller."""
+        status = response.status_code
+        if status not in RETRY_STATUS:
+            policy.breaker.record_success()
+            return None
+        # 429 = we are too fast, not that the host is down
+        if status == 429:
+            policy.breaker.record_success()
+        else:
+            policy.breaker.record_failure()
+        wait = retry_after_s(response) if status in (429, 503) else None
+        if wait is not None:
+            if wait > self.retry_after_max_s:
+                return None
+            policy.bucket.pause(wait)
+        if attempt >= retries:
+            return None
+        return max(wait or 0.0, self._backoff(attempt))
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        policy = get_host_policy(request.url.host)
+        retries = self._retries_for(request)
+        attempt = 0
+        while True:
+            wait = self._before(request, policy)
+            try:
+                if wait > 0:
+                    time.sleep(wait)
+                response = self._sync.handle_request(request)
+            except RETRY_EXCEPTIONS:
+                policy.breaker.record_failure()
+                if attempt >= retries:
+                    raise
+                time.sleep(self._backoff(attempt))
+                attempt += 1
+                continue
+            except BaseException:
+                # CancelledError, DecodingError, ProxyError...: never leave a half-open probe taken
+                policy.breaker.release_probe()
+                raise
+            delay = self._after(response, policy, attempt, retries)
+            if delay is None:
+                return response
+            response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        policy = get_host_policy(request.url.host)
+        retries = self._retries_for(request)
+        attempt = 0
+        while True:
+            wait = self._before(request, policy)
+            try:
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                response = await self._async.handle_async_request(request)
+            except RETRY_EXCEPTIONS:
+                policy.breaker.record_failure()
+                if attempt >= retries:
+                    raise
+                await asyncio.sleep(self._backoff(attempt))
+                attempt += 1
+                continue
+            except BaseException:
+                # CancelledError, DecodingError, ProxyError...: never leave a half-open probe taken
+                policy.breaker.release_probe()
+                raise
+            delay = self._after(response, policy, attempt, retries)
+            if delay is None:
+                return response
+            await response.aclose()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def close(self) -> None:
+        if self._sync is not None:
+            self._sync.close()
+
+    async def aclose(self) -> None:
+        if self._async is not None:
+            await self._async.aclose()
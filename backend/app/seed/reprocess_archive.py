@@ -0,0 +1,138 @@
+# app/seed/reprocess_archive.py
+#
+# Re-run the CURRENT parsers over the raw HTML archive (app/scrapers/archive.py)
+# and rewrite the derived tables, without a single request to acb.com:
+#   - partidos: latest archived partidos page of every round -> fixtures; flags recomputed
+#               over the whole stored season
+#   - stats:    latest archived stats page of every game -> player stats + box scores
+#               (content hashes: games whose parsed output didn't change aren't written)
+# Pages are parsed in the parser process pool (SCRAPER_PARSE_WORKERS / --workers).
+#
+#   python -m app.seed.reprocess_archive --kind all
+#   python -m app.seed.reprocess_archive --kind stats --start-round 1 --rounds 10 --workers 4
+import argparse
+import time
+from urllib.parse import parse_qs, urlsplit
+
+from app.core.game_config import ACB_COMPETICION_ID, ACB_JORNADA_ID_ROUND1, ROUNDS_REGULAR_SEASON, SEASON_ID
+from app.crud.crud_fixture import FixtureRow, upsert_fixtures
+from app.db.session import SessionLocal
+from app.models.fixtures import Fixture
+from app.scrapers.acb_partidos import PARTIDOS_URL, parse_partidos_html
+from app.scrapers.archive import get_archive
+from app.scrapers.parse_pool import get_parse_pool, shutdown_parse_pool
+from app.schemas.wiki_games import ReseedPlayerStatsIn
+from app.seed.seed_fixtures_from_partidos import _write_flags
+from app.services.fixture_flags import compute_flags_for_season
+from app.services.playerstats_reseed import reseed_playerstats_from_final
+from app.services.stats_fetch import archived_games_stats
+
+
+def _parse_partidos_job(job):
+    # Module-level so the process pool can pickle it
+    html, season_id, round_number, source_url = job
+    return round_number, parse_partidos_html(html, season_id=season_id, round_number=round_number,
+                                             source_url=source_url)
+
+
+def _jornada_id(url: str):
+    try:
+        return int(parse_qs(urlsplit(url).query)["jornada"][0])
+    except (KeyError, ValueError, IndexError):
+        return None
+
+
+def reprocess_partidos(db, archive, *, season_id: str, start_round: int, end_round: int, workers) -> dict:
+    prefix = PARTIDOS_URL.format(competicion=ACB_COMPETICION_ID, jornada_id="")
+    jobs = []
+    for page in archive.iter_latest(prefix):
+        jornada_id = _jornada_id(page.url)
+        if jornada_id is None:
+            continue
+        round_number = jornada_id - ACB_JORNADA_ID_ROUND1 + 1
+        if start_round <= round_number <= end_round:
+            jobs.append((page.text, season_id, round_number, page.url))
+    jobs.sort(key=lambda j: j[2])
+
+    pool = get_parse_pool(workers)
+    results = pool.map(_parse_partidos_job, jobs) if pool is not None else map(_parse_partidos_job, jobs)
+
+    # No network here: skeleton kickoffs can't be resolved, keep what is stored; flags too,
+    # until they are recomputed below (a partial run must not clear them)
+    stored = {
+        (r, h, a): (k, postponed, advanced)
+        for r, h, a, k, postponed, advanced in db.query(
+            Fixture.round_number, Fixture.home_team_id, Fixture.away_team_id,
+            Fixture.kickoff_at, Fixture.is_postponed, Fixture.is_advanced,
+        ).filter(Fixture.season_id == season_id)
+    }
+
+    created = updated = 0
+    for round_number, parsed in results:
+        if not parsed:
+            print(f"WARNING: no parsed fixtures for archived round {round_number}")
+            continue
+        mapped = [FixtureRow.from_parsed(fx, round_number=round_number) for fx in parsed]
+        for m in mapped:
+            kickoff, m.is_postponed, m.is_advanced = stored.get(m.key, (None, False, False))
+            if m.kickoff_at is None:
+                m.kickoff_at = kickoff
+        r = upsert_fixtures(db, season_id=season_id, parsed=mapped)
+        created += r["created"]
+        updated += r["updated"]
+
+    # Flags need the whole season: recompute from every stored fixture (reprocessed or not)
+    season_rows = db.query(Fixture.round_number, Fixture.home_team_id, Fixture.away_team_id,
+                           Fixture.kickoff_at).filter(Fixture.season_id == season_id).all()
+    flagged = _write_flags(db, season_id, compute_flags_for_season(season_rows))
+    return {"rounds": len(jobs), "created": created, "updated": updated, "flags_written": flagged}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--season-id", default=SEASON_ID)
+    ap.add_argument("--kind", choices=("partidos", "stats", "all"), default="all")
+    ap.add_argument("--start-round", type=int, default=1)
+    ap.add_argument("--rounds", type=int, default=ROUNDS_REGULAR_SEASON)
+    ap.add_argument("--workers", type=int, default=None, help="Parser processes (default: SCRAPER_PARSE_WORKERS)")
+    args = ap.parse_args()
+
+    archive = get_archive()
+    if archive is None:
+        raise SystemExit("HTML archive disabled (SCRAPER_ARCHIVE_ENABLED=false)")
+    print(f"archive: {archive.stats()}")
+
+    end_round = args.start_round + args.rounds - 1
+    t0 = time.perf_counter()
+    db = SessionLocal()
+    try:
+        if args.kind in ("partidos", "all"):
+            t = time.perf_counter()
+            out = reprocess_partidos(db, archive, season_id=args.season_id, start_round=args.start_round,
+                                     end_round=end_round, workers=args.workers)
+            print(f"partidos: {out} in {time.perf_counter() - t:.2f}s")
+
+        if args.kind in ("stats", "all"):
+            t = time.perf_counter()
+            # force: archived pages are re-parsed even for games already hashed as final;
+            # unchanged hashes still skip the writes
+            payload = ReseedPlayerStatsIn(season_id=args.season_id, start_round_number=args.start_round,
+                                          rounds=args.rounds, force=True)
+            out = reseed_playerstats_from_final(
+                db, payload,
+                fetch=lambda ids, **kw: archived_games_stats(ids, archive=archive, workers=args.workers, **kw),
+            )
+            print(f"stats: games={out.games_found} written={out.games_processed} unchanged={out.games_unchanged} "
+                  f"empty={out.games_empty} "
+                  f"rows_created={out.rows_created} rows_updated={out.rows_updated} "
+                  f"warnings={len(out.warnings)} in {time.perf_counter() - t:.2f}s")
+            for w in out.warnings[:20]:
+                print(f"  {w}")
+    finally:
+        db.close()
+        shutdown_parse_pool()
+    print(f"total={time.perf_counter() - t0:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
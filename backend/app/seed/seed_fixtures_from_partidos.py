@@ -1,73 +1,128 @@
 # app/seed/seed_fixtures_from_partidos.py
+#
+# Streaming pipeline:
+#   1) scrape rounds (optionally --concurrency N rounds at a time), in round order
+#   2) upsert each round exactly once as soon as it arrives
+#   3) one final pass: compute postponed/advanced flags for the whole season and
+#      write them in a single executemany UPDATE
 import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import bindparam, update
 
 from app.db.session import SessionLocal
-from app.crud.crud_fixture import upsert_fixtures
-from app.scrapers.acb_partidos import scrape_partidos, ParsedFixture
+from app.crud.crud_fixture import FixtureRow, upsert_fixtures
+from app.crud.crud_round_state import refresh_round_state
+from app.models.fixtures import Fixture
+from app.scrapers.acb_partidos import scrape_partidos
 from app.services.fixture_flags import compute_flags_for_season
 
+
+def _write_flags(db, season_id: str, flags: dict) -> int:
+    if not flags:
+        return 0
+    # Core table UPDATE (executemany): ORM bulk UPDATE would require primary keys
+    stmt = (
+        update(Fixture.__table__)
+        .where(
+            Fixture.season_id == bindparam("b_season_id"),
+            Fixture.round_number == bindparam("b_round_number"),
+            Fixture.home_team_id == bindparam("b_home_team_id"),
+            Fixture.away_team_id == bindparam("b_away_team_id"),
+        )
+        .values(is_postponed=bindparam("b_is_postponed"), is_advanced=bindparam("b_is_advanced"))
+    )
+    params = [
+        {
+            "b_season_id": season_id,
+            "b_round_number": rnd,
+            "b_home_team_id": h,
+            "b_away_team_id": a,
+            "b_is_postponed": postponed,
+            "b_is_advanced": advanced,
+        }
+        for (rnd, h, a), (postponed, advanced) in flags.items()
+    ]
+    db.connection().execute(stmt, params)
+    refresh_round_state(db, season_id)
+    db.commit()
+    return len(params)
+
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--season-id", required=True)
     ap.add_argument("--competicion", required=True, type=int)
     ap.add_argument("--start-jornada-id", required=True, type=int)
     ap.add_argument("--rounds", required=True, type=int)
+    ap.add_argument("--concurrency", type=int, default=1, help="Rounds scraped in parallel")
     args = ap.parse_args()
 
+    rounds = [(i + 1, args.start_jornada_id + i) for i in range(args.rounds)]
+
+    def _scrape(rj):
+        round_number, jornada_id = rj
+        t = time.perf_counter()
+        parsed = scrape_partidos(
+            season_id=args.season_id,
+            competicion=args.competicion,
+            jornada_id=jornada_id,
+            round_number=round_number,
+        )
+        return round_number, jornada_id, parsed, time.perf_counter() - t
+
+    timings = {"scrape_wall": 0.0, "upsert": 0.0, "flags": 0.0}
+    t0 = time.perf_counter()
+
     db = SessionLocal()
     try:
         total_created = total_updated = total_parsed = 0
-
-        all_rows = []   # will store (round, home, away, kickoff_at)
-        all_mapped = [] # objects for upsert
-
-        for i in range(args.rounds):
-            round_number = i + 1
-            jornada_id = args.start_jornada_id + i
-
-            parsed = scrape_partidos(
-                season_id=args.season_id,
-                competicion=args.competicion,
-                jornada_id=jornada_id,
-            )
-
-            if not parsed:
-                print(f"WARNING: no parsed fixtures for round {round_number} (jornada_id={jornada_id})")
-                continue
-
-            for fx in parsed:
-                all_rows.append((round_number, fx.home_team_id, fx.away_team_id, fx.kickoff_at))
-
-                all_mapped.append(
-                    type("Tmp", (), {
-                        "round_number": round_number,
-                        "home_team_id": fx.home_team_id,
-                        "away_team_id": fx.away_team_id,
-                        "kickoff_at": fx.kickoff_at,
-                        "is_finished": fx.is_finished,
-                        "home_score": fx.home_score,
-                        "away_score": fx.away_score,
-                        "is_postponed": False,  # set later
-                        "is_advanced": False,   # set later
-                    })()
-                )
-
-            # compute flags
-            flags = compute_flags_for_season(all_rows)
-
-            # inject flags
-            for obj in all_mapped:
-                key = (obj.round_number, obj.home_team_id, obj.away_team_id)
-                obj.is_postponed, obj.is_advanced = flags.get(key, (False, False))
-
-            result = upsert_fixtures(db, season_id=args.season_id, parsed=all_mapped)
-            total_created += result["created"]
-            total_updated += result["updated"]
-            total_parsed += result["total"]
-
-            print(f"Round {round_number} jornada_id={jornada_id}: {result}")
-
-        print({"created": total_created, "updated": total_updated, "total": total_parsed})
+        season_rows = []  # (round, home, away, kickoff_at) for the final flags pass
+
+        with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as pool:
+            # map() yields in round order while later rounds keep downloading
+            for round_number, jornada_id, parsed, dt_scrape in pool.map(_scrape, rounds):
+                if not parsed:
+                    print(f"WARNING: no parsed fixtures for round {round_number} (jornada_id={jornada_id})")
+                    continue
+
+                mapped = [
+                    FixtureRow.from_parsed(
+                        fx,
+                        round_number=round_number,
+                        is_postponed=False,  # set in the final pass
+                        is_advanced=False,   # set in the final pass
+                    )
+                    for fx in parsed
+                ]
+                season_rows.extend((m.round_number, m.home_team_id, m.away_team_id, m.kickoff_at) for m in mapped)
+
+                t = time.perf_counter()
+                result = upsert_fixtures(db, season_id=args.season_id, parsed=mapped)
+                dt_upsert = time.perf_counter() - t
+                timings["upsert"] += dt_upsert
+
+                total_created += result["created"]
+                total_updated += result["updated"]
+                total_parsed += result["total"]
+
+                print(f"Round {round_number} jornada_id={jornada_id}: {result} "
+                      f"scrape={dt_scrape:.2f}s upsert={dt_upsert:.3f}s")
+
+        timings["scrape_wall"] = time.perf_counter() - t0 - timings["upsert"]
+
+        t = time.perf_counter()
+        flags = compute_flags_for_season(season_rows)
+        flagged = _write_flags(db, args.season_id, flags)
+        timings["flags"] = time.perf_counter() - t
+
+        print({"created": total_created, "updated": total_updated, "total": total_parsed, "flags_written": flagged})
+        print(
+            f"timings: scrape={timings['scrape_wall']:.2f}s upsert={timings['upsert']:.3f}s "
+            f"flags={timings['flags']:.3f}s total={time.perf_counter() - t0:.2f}s "
+            f"(concurrency={args.concurrency})"
+        )
 
     finally:
         db.close()
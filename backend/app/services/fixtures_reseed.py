@@ -0,0 +1,171 @@
+# app/services/fixtures_reseed.py
+from __future__ import annotations
+
+import time
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.game_config import ACB_COMPETICION_ID, ROUNDS_REGULAR_SEASON, ACB_JORNADA_ID_ROUND1
+from app.crud.crud_fixture import FixtureRow, upsert_fixtures
+from app.crud.crud_round_state import refresh_round_state
+from app.models.fixtures import Fixture
+from app.schemas.wiki_fixtures import ReseedFixturesIn, ReseedFixturesOut
+from app.scrapers.acb_partidos import scrape_partidos
+from app.services.fixture_timing_flags import recompute_flags_roundcentric
+from app.services.market_utils import compute_market_status
+
+
+def reseed_fixtures_from_acb(
+    db: Session,
+    payload: ReseedFixturesIn,
+    *,
+    progress: Optional[Callable[..., None]] = None,
+) -> ReseedFixturesOut:
+    """
+    Scrape + upsert the requested rounds, then recompute flags.
+    Raises ValueError for an invalid round range.
+    `progress(done, total, **detail)` is called after every round.
+    """
+    # 1) scrape + upsert
+    total_created = 0
+    total_updated = 0
+    total_parsed = 0
+
+    end_round = payload.start_round_number + payload.rounds - 1
+    if end_round > ROUNDS_REGULAR_SEASON:
+        raise ValueError(
+            f"Invalid range: start_round_number={payload.start_round_number}, rounds={payload.rounds} exceeds ROUNDS_REGULAR_SEASON={ROUNDS_REGULAR_SEASON}"
+        )
+
+    # hard replace the rounds we are about to reseed
+    if payload.replace_rounds:
+        rounds = range(payload.start_round_number, end_round + 1)
+        db.query(Fixture).filter(
+            Fixture.season_id == payload.season_id,
+            Fixture.round_number.in_(rounds),
+        ).delete(synchronize_session=False)
+        # Bulk delete skips the session flush hooks: drop those rounds from round_state
+        # too (a round the rescrape leaves empty must not stay "active")
+        refresh_round_state(db, payload.season_id, rounds)
+        db.commit()
+
+    warnings: list[str] = []
+    rounds_incomplete: list[dict] = []
+
+    t0 = time.time()
+    print(
+        f"[reseed] season={payload.season_id} rounds={payload.rounds} "
+        f"range={payload.start_round_number}-{end_round} tol={payload.tol_minutes}min",
+        flush=True,
+    )
+
+    for i in range(payload.rounds):
+        round_number = payload.start_round_number + i
+        jornada_id = ACB_JORNADA_ID_ROUND1 + (round_number -1)
+
+        t_round = time.time()
+        print(f"[reseed] round {round_number:02d}/{end_round:02d} jornada_id={jornada_id} ...", flush=True)
+
+        parsed = scrape_partidos(
+            season_id=payload.season_id,
+            competicion=ACB_COMPETICION_ID,
+            jornada_id=jornada_id,
+            round_number=round_number
+        )
+
+        if not parsed:
+            msg = f"Round {round_number} jornada_id={jornada_id}: parsed=0 (ACB empty/partial)"
+            warnings.append(msg)
+            rounds_incomplete.append({"round_number": round_number, "jornada_id": jornada_id, "parsed": 0})
+            print(f"[reseed][WARN] {msg}", flush=True)
+            if progress is not None:
+                progress(i + 1, payload.rounds, round_number=round_number, parsed=0)
+            continue
+
+        if len(parsed) != 9:
+            msg = f"Round {round_number} jornada_id={jornada_id}: parsed={len(parsed)} (expected 9)"
+            warnings.append(msg)
+            rounds_incomplete.append({"round_number": round_number, "jornada_id": jornada_id, "parsed": len(parsed)})
+            print(f"[reseed][WARN] {msg}", flush=True)
+
+        mapped = [FixtureRow.from_parsed(fx, round_number=round_number) for fx in parsed]
+
+        res = upsert_fixtures(db, season_id=payload.season_id, parsed=mapped)
+        total_created += int(res.get("created", 0))
+        total_updated += int(res.get("updated", 0))
+        total_parsed += int(res.get("total", 0))
+
+        dt_round = time.time() - t_round
+        print(
+            f"[reseed] round {round_number:02d} done: parsed={len(parsed)} "
+            f"created={res.get('created', 0)} updated={res.get('updated', 0)} "
+            f"elapsed={dt_round:.1f}s",
+            flush=True,
+        )
+        if progress is not None:
+            progress(i + 1, payload.rounds, round_number=round_number, parsed=len(parsed),
+                     created=res.get("created", 0), updated=res.get("updated", 0))
+
+    # 2) recompute flags (round-centric)
+    print("[reseed] recompute flags ...", flush=True)
+    t_flags = time.time()
+    flags_res = recompute_flags_roundcentric(
+        db,
+        season_id=payload.season_id,
+        tol_minutes=payload.tol_minutes,
+    )
+    print(
+        f"[reseed] flags done: updated={flags_res.get('updated', 0)} "
+        f"advanced={flags_res.get('advanced', 0)} postponed={flags_res.get('postponed', 0)} "
+        f"elapsed={time.time() - t_flags:.1f}s",
+        flush=True,
+    )
+
+    # 3) optionally return flagged list
+    flagged_list = []
+    if payload.include_flagged:
+        flagged_rows = (
+            db.query(Fixture)
+            .filter(
+                Fixture.season_id == payload.season_id,
+                ((Fixture.is_postponed == True) | (Fixture.is_advanced == True)),
+            )
+            .order_by(Fixture.round_number.asc(), Fixture.kickoff_at.asc().nulls_last(), Fixture.id.asc())
+            .all()
+        )
+        for f in flagged_rows:
+            flagged_list.append({
+                "id": f.id,
+                "round_number": f.round_number,
+                "home_team_id": f.home_team_id,
+                "away_team_id": f.away_team_id,
+                "kickoff_at": f.kickoff_at,
+                "is_advanced": f.is_advanced,
+                "is_postponed": f.is_postponed,
+                "is_finished": f.is_finished,
+                "home_score": f.home_score,
+                "away_score": f.away_score,
+            })
+
+    compute_market_status(db)
+
+    print(
+        f"[reseed] DONE season={payload.season_id} total_parsed={total_parsed} "
+        f"created={total_created} updated={total_updated} total_elapsed={time.time()-t0:.1f}s",
+        flush=True,
+    )
+
+    return ReseedFixturesOut(
+        season_id=payload.season_id,
+        rounds_requested=payload.rounds,
+        upsert_created=total_created,
+        upsert_updated=total_updated,
+        parsed_total=total_parsed,
+        flags_updated_rows=int(flags_res.get("updated", 0)),
+        advanced=int(flags_res.get("advanced", 0)),
+        postponed=int(flags_res.get("postponed", 0)),
+        flagged=flagged_list,
+        warnings=warnings,
+        rounds_incomplete=rounds_incomplete,
+    )
@@ -0,0 +1,50 @@
+# app/services/job_tasks.py
+# Built-in job kinds (registered on import; see app/services/jobs.py)
+from __future__ import annotations
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.schemas.wiki_fixtures import ReseedFixturesIn
+from app.schemas.wiki_games import IngestGameStatsIn, ReseedPlayerStatsIn
+from app.schemas.wiki_players import ResyncPlayersIn, ResyncPlayersOut, WikiPlayersScrapeRequest
+from app.services import fixtures_reseed, playerstats_reseed, stats_ingest
+from app.services.jobs import job_kind
+from app.services.wiki_resync_players import resync_players_from_acb
+from app.services.wiki_scrape_players import scrape_players
+
+
+@job_kind("reseed_fixtures", ReseedFixturesIn)
+def _reseed_fixtures(db: Session, payload: ReseedFixturesIn, *, progress):
+    return fixtures_reseed.reseed_fixtures_from_acb(db, payload, progress=progress)
+
+
+@job_kind("reseed_playerstats", ReseedPlayerStatsIn)
+def _reseed_playerstats(db: Session, payload: ReseedPlayerStatsIn, *, progress):
+    return playerstats_reseed.reseed_playerstats_from_final(db, payload, progress=progress)
+
+
+@job_kind("scrape_players", WikiPlayersScrapeRequest)
+def _scrape_players(db: Session, payload: WikiPlayersScrapeRequest, *, progress):
+    return scrape_players(db, payload, progress=progress)
+
+
+@job_kind("resync_players", ResyncPlayersIn)
+def _resync_players(db: Session, payload: ResyncPlayersIn, *, progress):
+    res = resync_players_from_acb(
+        db,
+        season_id=payload.season_id,
+        only_active_teams=payload.only_active_teams,
+        progress=progress,
+    )
+    return ResyncPlayersOut(season_id=payload.season_id, **res)
+
+
+@job_kind(
+    stats_ingest.INGEST_JOB_KIND,
+    IngestGameStatsIn,
+    max_attempts=settings.INGEST_MAX_ATTEMPTS,
+    retry_backoff_s=settings.INGEST_RETRY_BACKOFF_S,
+)
+def _ingest_game_stats(db: Session, payload: IngestGameStatsIn, *, progress):
+    return stats_ingest.ingest_game_stats(db, payload, progress=progress)
@@ -0,0 +1,301 @@
+# app/services/jobs.py
+from __future__ import annotations
+
+import json
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Type
+
+from pydantic import BaseModel
+from sqlalchemy import update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.jobs import JOB_DONE, JOB_FAILED, JOB_QUEUED, JOB_RUNNING, Job, WorkerHeartbeat
+
+# SQLite-backed job queue.
+# - API side: enqueue_job() + read the row back (status / progress / result)
+# - worker side (app/worker.py): claim_next_job() + run_job()
+# Claiming is a conditional UPDATE (status 'queued' -> 'running'), so several
+# workers can poll the same table without running a job twice.
+
+ACTIVE_STATUSES = (JOB_QUEUED, JOB_RUNNING)
+
+
+@dataclass(frozen=True)
+class JobKind:
+    name: str
+    payload_model: Type[BaseModel]
+    handler: Callable[..., Any]  # handler(db, payload, progress=...) -> BaseModel | dict
+    max_attempts: int = 1
+    retry_backoff_s: Optional[float] = None  # None => settings.JOB_RETRY_BACKOFF_S
+
+
+class RetryLater(Exception):
+    """Raised by a handler when its input isn't ready yet: re-queued with backoff, no traceback stored."""
+
+
+_KINDS: Dict[str, JobKind] = {}
+
+
+def job_kind(name: str, payload_model: Type[BaseModel], *, max_attempts: int = 1,
+             retry_backoff_s: Optional[float] = None):
+    """Decorator registering a job handler under `name`."""
+    def deco(fn):
+        _KINDS[name] = JobKind(name=name, payload_model=payload_model, handler=fn,
+                               max_attempts=max_attempts, retry_backoff_s=retry_backoff_s)
+        return fn
+    return deco
+
+
+def _ensure_registered() -> None:
+    import app.services.job_tasks  # noqa: F401  (registers the built-in kinds)
+
+
+def get_job_kind(name: str) -> Optional[JobKind]:
+    _ensure_registered()
+    return _KINDS.get(name)
+
+
+def job_kind_names() -> List[str]:
+    _ensure_registered()
+    return sorted(_KINDS)
+
+
+def _utcnow() -> datetime:
+    return datetime.utcnow()
+
+
+def _dumps(obj: Any) -> str:
+    if isinstance(obj, BaseModel):
+        obj = obj.model_dump(mode="json")
+    return json.dumps(obj, default=str)
+
+
+def enqueue_job(
+    db: Session,
+    kind: str,
+    payload: Any = None,
+    *,
+    created_by: Optional[int] = None,
+    dedupe_key: Optional[str] = None,
+    run_after: Optional[datetime] = None,
+    max_attempts: Optional[int] = None,
+) -> Job:
+    """
+    Validate `payload` against the kind's model and queue it (commits).
+    Raises KeyError for an unknown kind and pydantic.ValidationError for a bad payload.
+    With `dedupe_key`, an already queued/running job with the same key is returned instead.
+    """
+    k = get_job_kind(kind)
+    if k is None:
+        raise KeyError(kind)
+    validated = k.payload_model.model_validate(payload or {})
+
+    if dedupe_key:
+        existing = (
+            db.query(Job)
+            .filter(Job.dedupe_key == dedupe_key, Job.status.in_(ACTIVE_STATUSES))
+            .order_by(Job.id.asc())
+            .first()
+        )
+        if existing is not None:
+            return existing
+
+    job = Job(
+        kind=kind,
+        status=JOB_QUEUED,
+        payload_json=_dumps(validated),
+        max_attempts=max_attempts or k.max_attempts,
+        run_after=run_after or _utcnow(),
+        dedupe_key=dedupe_key,
+        created_by=created_by,
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def claim_next_job(db: Session, worker_id: str) -> Optional[Job]:
+    now = _utcnow()
+    candidates = (
+        db.query(Job.id)
+        .filter(Job.status == JOB_QUEUED, Job.run_after <= now)
+        .order_by(Job.run_after.asc(), Job.id.asc())
+        .limit(5)
+        .all()
+    )
+    for (job_id,) in candidates:
+        res = db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == JOB_QUEUED)
+            .values(
+                status=JOB_RUNNING,
+                worker_id=worker_id,
+                attempts=Job.attempts + 1,
+                started_at=now,
+                heartbeat_at=now,
+                error=None,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        if res.rowcount == 1:
+            return db.get(Job, job_id)
+    return None
+
+
+def requeue_stale_jobs(db: Session, stale_after_s: float) -> int:
+    """Running jobs whose worker stopped heart-beating go back to the queue (or fail)."""
+    cutoff = _utcnow() - timedelta(seconds=stale_after_s)
+    stale = (
+        db.query(Job)
+        .filter(Job.status == JOB_RUNNING, Job.heartbeat_at < cutoff)
+        .all()
+    )
+    for job in stale:
+        if job.attempts < job.max_attempts:
+            job.status = JOB_QUEUED
+            job.run_after = _utcnow()
+        else:
+            job.status = JOB_FAILED
+            job.finished_at = _utcnow()
+        job.error = f"worker {job.worker_id} lost (no heartbeat since {job.heartbeat_at})"
+    db.commit()
+    return len(stale)
+
+
+def _write_job(job_id: int, *, best_effort: bool = False, **values) -> None:
+    # Own short session/transaction: never commits the handler's unit of work.
+    # best_effort (progress/heartbeat): skip the update if the DB stays locked.
+    tries = 1 if best_effort else 5
+    for attempt in range(tries):
+        db = SessionLocal()
+        try:
+            db.execute(update(Job).where(Job.id == job_id).values(**values).execution_options(synchronize_session=False))
+            db.commit()
+            return
+        except OperationalError:
+            db.rollback()
+            if attempt + 1 >= tries:
+                if best_effort:
+                    return
+                raise
+        finally:
+            db.close()
+        time.sleep(1.0 * (attempt + 1))
+
+
+class JobProgress:
+    """progress(done, total, **detail) callback handed to job handlers (throttled)."""
+
+    MIN_INTERVAL_S = 0.5
+    MAX_LOG = 100
+
+    def __init__(self, job_id: int):
+        self.job_id = job_id
+        self._log: List[dict] = []
+        self._last_write = 0.0
+        self._lock = threading.Lock()
+
+    def __call__(self, done: int, total: int, **detail) -> None:
+        with self._lock:
+            if detail:
+                self._log.append({"done": done, **detail})
+                del self._log[:-self.MAX_LOG]
+            now = time.monotonic()
+            if done < total and now - self._last_write < self.MIN_INTERVAL_S:
+                return
+            self._last_write = now
+            state = {"done": done, "total": total, "last": detail or None, "steps": list(self._log)}
+        _write_job(self.job_id, best_effort=True, progress_json=_dumps(state), heartbeat_at=_utcnow())
+
+
+def heartbeat(job_id: int) -> None:
+    _write_job(job_id, best_effort=True, heartbeat_at=_utcnow())
+
+
+def worker_heartbeat(db: Session, worker_id: str, *, round_commit: bool) -> None:
+    """Upsert this worker's worker_heartbeats row (last_seen_at = now); best effort."""
+    now = _utcnow()
+    stmt = sqlite_insert(WorkerHeartbeat).values(
+        worker_id=worker_id, round_commit=round_commit, started_at=now, last_seen_at=now,
+    )
+    try:
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=["worker_id"],
+            set_={"round_commit": round_commit, "last_seen_at": now},
+        ))
+        db.commit()
+    except OperationalError:
+        db.rollback()
+
+
+def round_commit_worker_alive(db: Session) -> bool:
+    """Has a worker running the round-commit scheduler checked in recently?"""
+    max_age_s = max(settings.JOB_STALE_AFTER_S, 2 * settings.ROUND_COMMIT_RECHECK_S)
+    cutoff = _utcnow() - timedelta(seconds=max_age_s)
+    return db.query(WorkerHeartbeat.worker_id).filter(
+        WorkerHeartbeat.round_commit == True,  # noqa: E712
+        WorkerHeartbeat.last_seen_at >= cutoff,
+    ).first() is not None
+
+
+def run_job(job: Job) -> None:
+    """Run a claimed job to completion (done / failed / re-queued with backoff)."""
+    k = get_job_kind(job.kind)
+    job_id, attempts, max_attempts = job.id, job.attempts, job.max_attempts
+
+    db = SessionLocal()
+    try:
+        if k is None:
+            raise KeyError(f"unknown job kind: {job.kind}")
+        payload = k.payload_model.model_validate(json.loads(job.payload_json or "{}"))
+        result = k.handler(db, payload, progress=JobProgress(job_id))
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        if isinstance(e, RetryLater):
+            err = f"{type(e).__name__}: {e}"
+        else:
+            err = f"{type(e).__name__}: {e}\n" + "".join(traceback.format_exc(limit=8))
+        if attempts < max_attempts:
+            base = (k.retry_backoff_s if k is not None else None) or settings.JOB_RETRY_BACKOFF_S
+            delay = base * (2 ** (attempts - 1))
+            _write_job(job_id, status=JOB_QUEUED, error=err, run_after=_utcnow() + timedelta(seconds=delay))
+        else:
+            _write_job(job_id, status=JOB_FAILED, error=err, finished_at=_utcnow())
+        return
+    finally:
+        db.close()
+
+    _write_job(job_id, status=JOB_DONE, result_json=_dumps(result), finished_at=_utcnow())
+
+
+def job_to_dict(job: Job, *, include_result: bool = False) -> dict:
+    out = {
+        "id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "payload": json.loads(job.payload_json or "{}"),
+        "progress": json.loads(job.progress_json) if job.progress_json else None,
+        "error": job.error,
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "dedupe_key": job.dedupe_key,
+        "created_by": job.created_by,
+        "created_at": job.created_at,
+        "run_after": job.run_after,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+    if include_result:
+        out["result"] = json.loads(job.result_json) if job.result_json else None
+    return out
@@ -0,0 +1,180 @@
+# app/services/live_games.py
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Dict, List, Optional, Set
+
+import httpx
+
+from app.core.config import settings
+from app.core.game_config import SEASON_ID
+from app.db.session import SessionLocal
+from app.models.fixtures import Fixture
+from app.scrapers.acb_live_stats import LIVE_STATS_URL, diff_player_rows
+from app.scrapers.http import make_async_client
+from app.services.stats_ingest import local_now
+
+# In-game polling + push (SSE, see app/api/routes/public_live.py).
+# - the poller only runs while at least one client is subscribed
+# - games in progress = kickoff passed, not finished, within the expected duration + slack
+# - each poll is a conditional GET (If-None-Match / If-Modified-Since): 304 => nothing to do
+# - on 200 only the player rows whose markup changed are parsed (diff_player_rows)
+# - events carry absolute values and deltas, so a dropped event never desyncs a client
+
+
+@dataclass
+class LiveGame:
+    acb_game_id: str
+    fixture_id: int
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fingerprints: Dict[str, int] = field(default_factory=dict)
+    players: Dict[str, dict] = field(default_factory=dict)  # acb_player_id -> latest row
+    updated_at: Optional[float] = None
+
+    def snapshot(self) -> dict:
+        return {
+            "acb_game_id": self.acb_game_id,
+            "fixture_id": self.fixture_id,
+            "updated_at": self.updated_at,
+            "players": list(self.players.values()),
+        }
+
+
+def _load_live_fixtures() -> Dict[str, int]:
+    now = local_now()
+    window = timedelta(minutes=settings.INGEST_GAME_DURATION_MIN + settings.LIVE_WINDOW_SLACK_MIN)
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(Fixture.acb_game_id, Fixture.id)
+            .filter(
+                Fixture.season_id == SEASON_ID,
+                Fixture.acb_game_id.isnot(None),
+                Fixture.is_finished == False,  # noqa: E712
+                Fixture.is_postponed == False,  # noqa: E712
+                Fixture.kickoff_at.isnot(None),
+                Fixture.kickoff_at <= now,
+                Fixture.kickoff_at >= now - window,
+            )
+            .all()
+        )
+        return {gid: fid for gid, fid in rows}
+    finally:
+        db.close()
+
+
+def _delta(old: Optional[int], new: Optional[int]) -> Optional[int]:
+    if new is None:
+        return None
+    return new - (old or 0)
+
+
+class LiveHub:
+    QUEUE_SIZE = 100
+
+    def __init__(self):
+        self.games: Dict[str, LiveGame] = {}
+        self._subs: Dict[asyncio.Queue, Optional[Set[str]]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    # --- subscribers (event loop only) ---
+
+    def subscribe(self, game_ids: Optional[Set[str]] = None) -> asyncio.Queue:
+        q: asyncio.Queue = asyncio.Queue(maxsize=self.QUEUE_SIZE)
+        self._subs[q] = game_ids or None
+        for g in self.games.values():
+            if game_ids is None or g.acb_game_id in game_ids:
+                q.put_nowait(("snapshot", g.snapshot()))
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return q
+
+    def unsubscribe(self, q: asyncio.Queue) -> None:
+        self._subs.pop(q, None)
+
+    def _publish(self, event: str, data: dict) -> None:
+        gid = data.get("acb_game_id")
+        for q, wanted in self._subs.items():
+            if wanted is not None and gid not in wanted:
+                continue
+            try:
+                q.put_nowait((event, data))
+            except asyncio.QueueFull:
+                pass  # slow client: it catches up with the next event's absolute values
+
+    # --- poller ---
+
+    async def _run(self) -> None:
+        me = asyncio.current_task()
+        async with make_async_client(max_connections=settings.SCRAPER_CONCURRENCY) as client:
+            while self._subs:
+                t0 = time.monotonic()
+                try:
+                    await self.poll_once(client)
+                except Exception as e:
+                    print(f"[live] poll failed: {type(e).__name__}: {e}", flush=True)
+                await asyncio.sleep(max(0.0, settings.LIVE_POLL_INTERVAL_S - (time.monotonic() - t0)))
+            # Hand over before closing the client (an await): from here on a subscribe
+            # starts a new poller instead of waiting on this finishing one
+            if self._task is me:
+                self._task = None
+                self.games.clear()
+
+    async def poll_once(self, client: httpx.AsyncClient) -> None:
+        live = await asyncio.to_thread(_load_live_fixtures)
+
+        for gid in [g for g in self.games if g not in live]:
+            self.games.pop(gid)
+            self._publish("ended", {"acb_game_id": gid})
+        for gid, fid in live.items():
+            self.games.setdefault(gid, LiveGame(acb_game_id=gid, fixture_id=fid))
+
+        sem = asyncio.Semaphore(settings.SCRAPER_CONCURRENCY)
+        await asyncio.gather(*(self._poll_game(client, sem, g) for g in list(self.games.values())))
+
+    async def _poll_game(self, client: httpx.AsyncClient, sem: asyncio.Semaphore, g: LiveGame) -> None:
+        headers = {}
+        if g.etag:
+            headers["If-None-Match"] = g.etag
+        if g.last_modified:
+            headers["If-Modified-Since"] = g.last_modified
+        try:
+            async with sem:
+                # No retries: the next poll comes in LIVE_POLL_INTERVAL_S anyway
+                resp = await client.get(LIVE_STATS_URL.format(game_id=g.acb_game_id), headers=headers,
+                                        extensions={"retries": 0})
+        except httpx.HTTPError as e:
+            print(f"[live] game {g.acb_game_id}: {type(e).__name__}: {e}", flush=True)
+            return
+        if resp.status_code != 200:
+            return  # 304 Not Modified (or an error page): keep the last state
+
+        g.etag = resp.headers.get("ETag")
+        g.last_modified = resp.headers.get("Last-Modified")
+        changed, g.fingerprints = await asyncio.to_thread(diff_player_rows, resp.text, g.fingerprints)
+        if not changed:
+            return
+
+        players: List[dict] = []
+        for row in changed:
+            old = g.players.get(row["acb_player_id"], {})
+            players.append({
+                **row,
+                "d_minutes_seconds": _delta(old.get("minutes_seconds"), row["minutes_seconds"]),
+                "d_plus_minus": _delta(old.get("plus_minus"), row["plus_minus"]),
+            })
+            g.players[row["acb_player_id"]] = row
+        g.updated_at = time.time()
+        self._publish("delta", {
+            "acb_game_id": g.acb_game_id,
+            "fixture_id": g.fixture_id,
+            "updated_at": g.updated_at,
+            "players": players,
+        })
+
+
+live_hub = LiveHub()
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import threading
+from array import array
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.game_config import SEASON_ID
+from app.models.market import MarketPlayerPrice, MarketVersion
+
+# Índice de mercado en memoria, uno por proceso y temporada, inmutable:
+# - player_id -> fila; precio / posición / equipo en arrays compactos (posición y
+#   equipo como códigos sobre tuplas de valores distintos)
+# - se reconstruye solo cuando cambia market_version (que suben los eventos de
+#   sesión de app/models/market.py en cada escritura de precios)
+# - por request: 1 lookup por PK de la versión; las validaciones de plantilla
+#   (posiciones, máx. por equipo, precios) son aritmética de conjuntos sin queries
+
+
+class MarketEntry(NamedTuple):
+    # Mismos nombres que MarketPlayerPrice: las rutas lo usan igual que la fila ORM
+    player_id: str
+    name: str
+    position: str
+    team_id: str
+    team_name: str
+    price_current: int
+
+
+class MarketIndex:
+    __slots__ = ("season_id", "version", "_row", "_ids", "_names", "_team_names",
+                 "_price", "_pos", "_team", "positions", "teams")
+
+    def __init__(self, season_id: str, version: int, rows: Iterable[tuple]):
+        self.season_id = season_id
+        self.version = version
+        rows = sorted(rows)  # (player_id, name, position, team_id, team_name, price)
+        self.positions: Tuple[str, ...] = tuple(sorted({r[2] for r in rows}))
+        self.teams: Tuple[str, ...] = tuple(sorted({r[3] for r in rows}))
+        pos_code = {p: i for i, p in enumerate(self.positions)}
+        team_code = {t: i for i, t in enumerate(self.teams)}
+
+        self._ids = tuple(r[0] for r in rows)
+        self._row: Dict[str, int] = {pid: i for i, pid in enumerate(self._ids)}
+        self._names = tuple(r[1] for r in rows)
+        self._team_names = tuple(r[4] for r in rows)
+        self._price = array("q", (int(r[5]) for r in rows))
+        self._pos = array("B", (pos_code[r[2]] for r in rows))
+        self._team = array("H", (team_code[r[3]] for r in rows))
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, player_id: str) -> bool:
+        return player_id in self._row
+
+    def get(self, player_id: str) -> Optional[MarketEntry]:
+        i = self._row.get(player_id)
+        if i is None:
+            return None
+        return MarketEntry(self._ids[i], self._names[i], self.positions[self._pos[i]],
+                           self.teams[self._team[i]], self._team_names[i], self._price[i])
+
+    def missing(self, player_ids: Iterable[str]) -> set[str]:
+        return {pid for pid in player_ids if pid not in self._row}
+
+    def total_price(self, player_ids: Iterable[str]) -> int:
+        return sum(self._price[self._row[pid]] for pid in player_ids if pid in self._row)
+
+    def position_counts(self, player_ids: Iterable[str]) -> Dict[str, int]:
+        """Players per position (ids not in the market are ignored)."""
+        counts: Dict[str, int] = {}
+        for pid in player_ids:
+            i = self._row.get(pid)
+            if i is not None:
+                pos = self.positions[self._pos[i]]
+                counts[pos] = counts.get(pos, 0) + 1
+        return counts
+
+    def team_counts(self, player_ids: Iterable[str]) -> Dict[str, int]:
+        """Players per real team (ids not in the market are ignored)."""
+        counts: Dict[str, int] = {}
+        for pid in player_ids:
+            i = self._row.get(pid)
+            if i is not None:
+                team = self.teams[self._team[i]]
+                counts[team] = counts.get(team, 0) + 1
+        return counts
+
+
+_indexes: Dict[str, MarketIndex] = {}
+_lock = threading.Lock()
+
+
+def _current_version(db: Session, season_id: str) -> int:
+    v = db.query(MarketVersion.version).filter(MarketVersion.season_id == season_id).scalar()
+    return int(v or 0)
+
+
+def get_market_index(db: Session, season_id: str = SEASON_ID) -> MarketIndex:
+    """Market index for the season at the DB's current market_version (rebuilt on change)."""
+    version = _current_version(db, season_id)
+    idx = _indexes.get(season_id)
+    if idx is not None and idx.version == version:
+        return idx
+    with _lock:
+        idx = _indexes.get(season_id)
+        if idx is None or idx.version != version:
+            rows = (
+                db.query(
+                    MarketPlayerPrice.player_id,
+                    MarketPlayerPrice.name,
+                    MarketPlayerPrice.position,
+                    MarketPlayerPrice.team_id,
+                    MarketPlayerPrice.team_name,
+                    MarketPlayerPrice.price_current,
+                )
+                .filter(MarketPlayerPrice.season_id == season_id)
+                .all()
+            )
+            idx = MarketIndex(season_id, version, rows)
+            _indexes[season_id] = idx
+        return idx
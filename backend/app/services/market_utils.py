@@ -1,15 +1,16 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 from typing import Optional
 
+from sqlalchemy import delete, exists, insert, or_, select, update
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 
 from app.core.game_config import SEASON_ID
+from app.crud.crud_round_state import get_active_round_state, get_round_state
+from app.models.round_state import RoundState
 from app.models.season import SeasonState
-from app.models.fixtures import Fixture
 
 from app.models.roster import UserRosterBase, UserRosterDraft, UserSeasonState, UserCaptain
 from app.models.user import User
@@ -46,36 +47,9 @@ def get_or_create_season_state(db: Session) -> SeasonState:
 
 
 def get_active_round(db: Session) -> Optional[int]:
-    # Jornadas ordenadas
-    rounds = (
-        db.query(Fixture.round_number)
-        .filter(Fixture.season_id == SEASON_ID)
-        .distinct()
-        .order_by(Fixture.round_number.asc())
-        .all()
-    )
-    round_numbers = [r[0] for r in rounds]
-
-    for rn in round_numbers:
-        fixtures = (
-            db.query(Fixture)
-            .filter(Fixture.season_id == SEASON_ID)
-            .filter(Fixture.round_number == rn)
-            .filter(Fixture.is_advanced == False)  # noqa: E712
-            .all()
-        )
-
-        relevant = [f for f in fixtures if (not f.is_postponed)]  # aquí advanced ya está filtrado
-        # Si no hay relevantes, no sabemos si “cuenta”: la consideramos NO resuelta para que no salte
-        if len(relevant) == 0:
-            return rn
-
-        round_resolved = all(f.is_finished for f in relevant)
-        if not round_resolved:
-            return rn
-
-    # Si todas las jornadas están resueltas, devuelve la última (o None)
-    return round_numbers[-1] if round_numbers else None
+    # Primera jornada no resuelta (si todas lo están, la última); ver round_state
+    st = get_active_round_state(db, SEASON_ID)
+    return st.round_number if st is not None else None
 
 
 def refresh_market_window(db: Session) -> None:
@@ -84,52 +58,19 @@ def refresh_market_window(db: Session) -> None:
     compute_market_status(db)
 
 
-def compute_market_status_for_round(db: Session, round_number: int, now: Optional[datetime] = None) -> MarketStatus:
+def _market_status_from_state(st: Optional[RoundState], round_number: Optional[int],
+                              now: Optional[datetime]) -> MarketStatus:
     if now is None:
         now = datetime.now(timezone.utc)
 
-    fixtures = (
-        db.query(Fixture)
-        .filter(Fixture.season_id == SEASON_ID)
-        .filter(Fixture.round_number == round_number)
-        .filter(Fixture.is_advanced == False)  # noqa: E712
-        .all()
-    )
-
-    # Partidos "relevantes" para mercado: no avanzados.
-    # - kickoff puede ser None (future/planned/postponed)
-    # - is_postponed=True => ignorar para cierres/aperturas (pero cuenta como "resuelto" para abrir)
-    # - is_finished=True + scores => jugado
-
-    # 1) Cierre: 1h antes del primer kickoff de un partido válido (no postponed) con kickoff definido
-    scheduled_with_time = [
-        f for f in fixtures
-        if (not f.is_postponed) and (f.kickoff_at is not None)
-    ]
-    first_kickoff = min((_as_utc(f.kickoff_at) for f in scheduled_with_time), default=None)
-    market_closes_at = first_kickoff - timedelta(hours=1) if first_kickoff else None
-
-    # 2) Apertura: 24h después del último partido "jugado" de la jornada,
-    # siempre que NO queden partidos con kickoff futuro (scheduled) pendientes excepto postponed.
-    # Interpretación:
-    # - Si existe algún fixture con kickoff definido y no postponed y NOT finished => jornada NO resuelta => no abre
-    relevant = [
-        f for f in fixtures
-        if (not f.is_advanced) and (not f.is_postponed)
-    ]
-
-    # Jornada resuelta si todos los relevantes están finished (si no hay relevantes, la tratamos como no resuelta)
-    round_resolved = (len(relevant) > 0) and all(f.is_finished for f in relevant)
-
-    if not round_resolved:
-        market_opens_at = None
-    else:
-        finished_with_time = [f for f in relevant if f.is_finished and f.kickoff_at is not None]
-        last_kickoff = max((_as_utc(f.kickoff_at) for f in finished_with_time), default=None)
-        market_opens_at = (last_kickoff + timedelta(hours=24)) if last_kickoff else None
-
+    # Ventana precalculada en round_state (crud_round_state.refresh_round_state):
+    # - cierre: 1h antes del primer kickoff de un partido válido (ni adelantado ni aplazado)
+    # - apertura: 24h después del último partido jugado, solo con la jornada resuelta
+    #   (todos los relevantes finished; sin relevantes => no resuelta)
+    market_closes_at = _as_utc(st.market_closes_at) if st is not None else None
+    market_opens_at = _as_utc(st.market_opens_at) if st is not None else None
 
-    # 3) is_open
+    # is_open
     # Reglas:
     # - Si no hay market_closes_at -> está abierto (jornada futura sin fechas definidas)
     # - Si hay closes_at y now >= closes_at -> cerrado
@@ -155,18 +96,29 @@ def compute_market_status_for_round(db: Session, round_number: int, now: Optiona
     )
 
 
-def compute_market_status(db: Session, now: Optional[datetime] = None) -> MarketStatus:
-    # Asegura season_state exista (aunque aún no lo usemos)
-    get_or_create_season_state(db)
+def compute_market_status_for_round(db: Session, round_number: int, now: Optional[datetime] = None) -> MarketStatus:
+    return _market_status_from_state(get_round_state(db, SEASON_ID, round_number), round_number, now)
 
-    active_round = get_active_round(db)
-    if active_round is None:
+
+def compute_market_status(db: Session, now: Optional[datetime] = None) -> MarketStatus:
+    # Un único lookup indexado (ix_round_state_active)
+    st = get_active_round_state(db, SEASON_ID)
+    if st is None:
         # sin fixtures: mercado abierto por defecto
         if now is None:
             now = datetime.now()
         return MarketStatus(SEASON_ID, None, now, None, None, True)
 
-    return compute_market_status_for_round(db, active_round, now=now)
+    return _market_status_from_state(st, st.round_number, now)
+
+def next_market_transition(db: Session, now: Optional[datetime] = None) -> Optional[datetime]:
+    # Próximo cierre/apertura de la jornada activa (para el scheduler del worker)
+    ms = compute_market_status(db, now=now)
+    for t in (ms.market_closes_at, ms.market_opens_at):
+        if t is not None and t > ms.now:
+            return t
+    return None
+
 
 def _user_can_edit_when_closed(
     db: Session,
@@ -213,13 +165,63 @@ def freeze_user_if_ready(db: Session, user_id: int, active_round: int) -> None:
     db.commit()
 
 
+def commit_all_rosters(db: Session, season_id: str) -> dict:
+    """
+    draft -> base y budget_base = budget_current para todos los usuarios con estado de temporada,
+    en 3 sentencias por conjuntos (sin bucle por usuario). No hace commit: va en la transacción
+    del que llama. Solo se escribe lo que cambia:
+    - DELETE de filas base que ya no están en el draft
+    - INSERT .. SELECT de filas del draft que faltan en base
+    - UPDATE de presupuestos distintos
+    """
+    b = UserRosterBase.__table__
+    d = UserRosterDraft.__table__
+    s = UserSeasonState.__table__
+    users = select(s.c.user_id).where(s.c.season_id == season_id, s.c.user_id.in_(select(User.__table__.c.user_id)))
+
+    deleted = db.execute(
+        delete(b).where(
+            b.c.season_id == season_id,
+            b.c.user_id.in_(users),
+            ~exists().where(d.c.user_id == b.c.user_id, d.c.season_id == b.c.season_id, d.c.player_id == b.c.player_id),
+        )
+    ).rowcount
+    inserted = db.execute(
+        insert(b).from_select(
+            ["user_id", "season_id", "player_id"],
+            select(d.c.user_id, d.c.season_id, d.c.player_id).where(
+                d.c.season_id == season_id,
+                d.c.user_id.in_(users),
+                ~exists().where(b.c.user_id == d.c.user_id, b.c.season_id == d.c.season_id, b.c.player_id == d.c.player_id),
+            ),
+        )
+    ).rowcount
+    budgets = db.execute(
+        update(s)
+        .where(
+            s.c.season_id == season_id,
+            s.c.user_id.in_(select(User.__table__.c.user_id)),
+            s.c.budget_base != s.c.budget_current,
+        )
+        .values(budget_base=s.c.budget_current)
+    ).rowcount
+    return {"base_deleted": deleted, "base_inserted": inserted, "budgets_updated": budgets}
+
+
 def commit_round_if_needed(db: Session, now: Optional[datetime] = None) -> Optional[int]:
+    """
+    Commit de jornada (draft -> base, budget_base = budget_current) una vez cerrado el mercado.
+    Lo ejecuta el worker (app/worker.py) en el momento del cierre, no las requests.
+    Exactamente una vez por jornada aunque haya varios workers: se "reclama" con un UPDATE
+    condicional sobre season_state.last_committed_round en la misma transacción que el commit.
+    """
     st = get_or_create_season_state(db)
-    active_round = get_active_round(db)
-    if active_round is None:
+    rs = get_active_round_state(db, SEASON_ID)
+    if rs is None:
         return None
+    active_round = rs.round_number
 
-    ms = compute_market_status_for_round(db, active_round, now=now)
+    ms = _market_status_from_state(rs, active_round, now)
     if ms.market_closes_at is None:
         return None
 
@@ -228,30 +230,27 @@ def commit_round_if_needed(db: Session, now: Optional[datetime] = None) -> Optio
         return None
 
     # Si ya se commiteó esta jornada, no repetir
-    if st.last_committed_round == active_round:
+    if st.last_committed_round is not None and st.last_committed_round >= active_round:
         return None
 
-    # COMMIT: draft -> base y budget_base = budget_current
-    users = db.query(User).all()
-    for u in users:
-        # Asegura state usuario (tú ya tienes _get_or_create_state; si quieres reusar, lo movemos luego)
-        us = db.query(UserSeasonState).filter_by(user_id=u.user_id, season_id=SEASON_ID).first()
-        if not us:
-            continue
-
-        draft_ids = [r.player_id for r in db.query(UserRosterDraft).filter_by(user_id=u.user_id, season_id=SEASON_ID).all()]
-
-        # Reemplazar base por draft (sí, aquí es correcto)
-        db.query(UserRosterBase).filter_by(user_id=u.user_id, season_id=SEASON_ID).delete()
-        db.add_all([UserRosterBase(user_id=u.user_id, season_id=SEASON_ID, player_id=pid) for pid in draft_ids])
-
-        us.budget_base = us.budget_current
-
-    # fin de pretemporada global al primer cierre real (asumimos jornada 1)
-    if st.is_preseason:
-        st.is_preseason = False
+    claimed = db.execute(
+        update(SeasonState)
+        .where(
+            SeasonState.season_id == SEASON_ID,
+            or_(SeasonState.last_committed_round.is_(None), SeasonState.last_committed_round < active_round),
+        )
+        .values(
+            last_committed_round=active_round,
+            # fin de pretemporada global al primer cierre real (asumimos jornada 1)
+            is_preseason=False,
+            updated_at=datetime.now(timezone.utc),
+        )
+    )
+    if claimed.rowcount != 1:
+        db.rollback()  # otro worker se adelantó
+        return None
 
-    st.last_committed_round = active_round
-    st.updated_at = datetime.now(timezone.utc)
+    # COMMIT: draft -> base y budget_base = budget_current
+    commit_all_rosters(db, SEASON_ID)
     db.commit()
     return active_round
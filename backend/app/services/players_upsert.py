@@ -1,15 +1,135 @@
-from typing import List, Dict, Tuple
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import insert, update
 from sqlalchemy.orm import Session
 
 from app.models.players import Player
 
 
+@dataclass(slots=True)
+class PlayerState:
+    id: Optional[int]  # None => pending insert
+    acb_player_id: Optional[str]
+    name: str
+    team_pk_id: Optional[int]
+    position: Optional[str]
+    is_active: bool
+
+
+class SeasonPlayers:
+    """
+    Every player of a season, loaded with one query and indexed by acb_player_id
+    (or (name, team_pk_id) for rows without one). Roster diffs are applied in memory;
+    flush() writes all inserts and all updates as two bulk statements.
+    """
+
+    def __init__(self, db: Session, season_id: str):
+        self.db = db
+        self.season_id = season_id
+        self.by_acb: Dict[str, PlayerState] = {}
+        self.by_name_team: Dict[Tuple[str, Optional[int]], PlayerState] = {}
+        self._new: List[PlayerState] = []
+        self._dirty: Dict[int, PlayerState] = {}
+
+        rows = (
+            db.query(Player.id, Player.acb_player_id, Player.name, Player.team_pk_id, Player.position, Player.is_active)
+            .filter(Player.season_id == season_id)
+            .order_by(Player.id.asc())
+        )
+        for pid, acb_id, name, team_pk_id, position, is_active in rows:
+            self._index(PlayerState(pid, acb_id, name, team_pk_id, position, bool(is_active)))
+
+    def _index(self, st: PlayerState) -> None:
+        if st.acb_player_id:
+            self.by_acb.setdefault(st.acb_player_id, st)
+        else:
+            self.by_name_team.setdefault((st.name, st.team_pk_id), st)
+
+    def find(self, acb_player_id: Optional[str], name: str, team_pk_id: Optional[int]) -> Optional[PlayerState]:
+        if acb_player_id:
+            return self.by_acb.get(acb_player_id)
+        return self.by_name_team.get((name, team_pk_id))
+
+    def add(self, *, acb_player_id: Optional[str], name: str, position: Optional[str],
+            team_pk_id: Optional[int]) -> PlayerState:
+        st = PlayerState(None, acb_player_id, name, team_pk_id, position, True)
+        self._new.append(st)
+        self._index(st)
+        return st
+
+    def set(self, st: PlayerState, **changes) -> bool:
+        """Apply changes to st; returns True if anything actually changed."""
+        changed = False
+        for k, v in changes.items():
+            if getattr(st, k) != v:
+                if k in ("name", "team_pk_id") and not st.acb_player_id:
+                    # (name, team) is the index key for rows without an ACB id
+                    self.by_name_team.pop((st.name, st.team_pk_id), None)
+                setattr(st, k, v)
+                changed = True
+        if changed:
+            if not st.acb_player_id:
+                self.by_name_team.setdefault((st.name, st.team_pk_id), st)
+            if st.id is not None:
+                self._dirty[st.id] = st
+        return changed
+
+    def deactivate_missing(self, team_pk_id: int, seen_acb_ids: Iterable[str]) -> int:
+        """Deactivate active players with an ACB id on this team that aren't in the scraped roster."""
+        seen = set(seen_acb_ids)
+        n = 0
+        for st in self.by_acb.values():
+            if st.team_pk_id == team_pk_id and st.is_active and st.acb_player_id not in seen:
+                self.set(st, is_active=False)
+                n += 1
+        return n
+
+    def flush(self) -> None:
+        if self._new:
+            self.db.execute(insert(Player), [
+                {
+                    "season_id": self.season_id,
+                    "acb_player_id": st.acb_player_id,
+                    "name": st.name,
+                    "position": st.position,
+                    "team_pk_id": st.team_pk_id,
+                    "is_active": st.is_active,
+                }
+                for st in self._new
+            ])
+            self._new.clear()
+        if self._dirty:
+            # ORM bulk UPDATE by primary key (one executemany)
+            self.db.execute(update(Player), [
+                {
+                    "id": st.id,
+                    "name": st.name,
+                    "position": st.position,
+                    "team_pk_id": st.team_pk_id,
+                    "is_active": st.is_active,
+                }
+                for st in self._dirty.values()
+            ])
+            self._dirty.clear()
+
+
 def upsert_roster_players(
     db: Session,
     season_id: str,
     team_pk_id: int,
     items: List[Dict[str, str]],
+    *,
+    players: Optional[SeasonPlayers] = None,
 ) -> Tuple[int, int]:
+    """
+    Pass a shared `players` index to batch several teams (caller flushes);
+    without it the season is loaded and flushed here.
+    """
+    own = players is None
+    if own:
+        players = SeasonPlayers(db, season_id)
+
     inserted = 0
     updated = 0
 
@@ -21,40 +141,13 @@ def upsert_roster_players(
         if not name:
             continue
 
-        q = db.query(Player).filter(Player.season_id == season_id)
-
-        if acb_player_id:
-            q = q.filter(Player.acb_player_id == acb_player_id)
-        else:
-            q = q.filter(Player.name == name, Player.team_pk_id == team_pk_id)
-
-        obj = q.first()
-        if obj is None:
-            db.add(Player(
-                season_id=season_id,
-                acb_player_id=acb_player_id,
-                name=name,
-                position=position,
-                team_pk_id=team_pk_id,
-                is_active=True,
-            ))
+        st = players.find(acb_player_id, name, team_pk_id)
+        if st is None:
+            players.add(acb_player_id=acb_player_id, name=name, position=position, team_pk_id=team_pk_id)
             inserted += 1
-        else:
-            changed = False
-            if obj.name != name:
-                obj.name = name
-                changed = True
-            if obj.position != position:
-                obj.position = position
-                changed = True
-            if obj.team_pk_id != team_pk_id:
-                obj.team_pk_id = team_pk_id
-                changed = True
-            if obj.is_active is not True:
-                obj.is_active = True
-                changed = True
-
-            if changed:
-                updated += 1
+        elif players.set(st, name=name, position=position, team_pk_id=team_pk_id, is_active=True):
+            updated += 1
 
+    if own:
+        players.flush()
     return inserted, updated
@@ -0,0 +1,191 @@
+# app/services/playerstats_reseed.py
+from __future__ import annotations
+
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.crud.crud_game_box_score import upsert_box_scores_bulk
+from app.crud.crud_game_player_stat import (
+    box_score_hash,
+    get_game_digests,
+    save_game_digests,
+    upsert_game_player_stats_bulk,
+)
+from app.models.fixtures import Fixture
+from app.models.game_box_scores import GameBoxScore
+from app.models.game_player_stats import GamePlayerStat, GameStatsDigest
+from app.schemas.wiki_games import ReseedPlayerStatsIn, ReseedPlayerStatsOut
+from app.services.stats_fetch import GameFetchResult, fetch_games_stats
+
+# Games buffered per bulk upsert (one SELECT + one INSERT .. ON CONFLICT each)
+STATS_WRITE_BATCH_GAMES = 20
+
+
+def reseed_playerstats_from_final(
+    db: Session,
+    payload: ReseedPlayerStatsIn,
+    *,
+    progress: Optional[Callable[..., None]] = None,
+    fetch: Callable[..., list] = fetch_games_stats,
+) -> ReseedPlayerStatsOut:
+    """
+    Fetch final stats for every fixture with acb_game_id in the round range and upsert them.
+    Incremental: finished games whose final box score is already hashed are skipped
+    (unless force/replace), and games whose content hash didn't change aren't written.
+    `progress(done, total, **detail)` is called after every write batch (at least once per round).
+    `fetch`: page source, fetch_games_stats (acb.com) or stats_fetch.archived_games_stats (offline).
+    """
+    end_round = payload.start_round_number + payload.rounds - 1
+
+    fixtures = (
+        db.query(Fixture)
+        .filter(
+            Fixture.season_id == payload.season_id,
+            Fixture.round_number >= payload.start_round_number,
+            Fixture.round_number <= end_round,
+        )
+        .order_by(Fixture.round_number.asc(), Fixture.id.asc())
+        .all()
+    )
+
+    warnings: list[str] = []
+    games_processed = 0
+    rows_created = 0
+    rows_updated = 0
+
+    with_game = [f for f in fixtures if f.acb_game_id]
+    games_found = len(with_game)
+
+    if games_found == 0:
+        warnings.append("No fixtures with acb_game_id. Did you reseed fixtures after adding acb_game_id extraction?")
+        return ReseedPlayerStatsOut(
+            season_id=payload.season_id,
+            rounds_requested=payload.rounds,
+            games_found=0,
+            games_processed=0,
+            rows_created=0,
+            rows_updated=0,
+            warnings=warnings,
+        )
+
+    if payload.replace:
+        game_ids = [f.acb_game_id for f in with_game if f.acb_game_id]
+        for model in (GamePlayerStat, GameStatsDigest):
+            db.query(model).filter(
+                model.season_id == payload.season_id,
+                model.acb_game_id.in_(game_ids),
+            ).delete(synchronize_session=False)
+        db.query(GameBoxScore).filter(
+            GameBoxScore.acb_game_id.in_([int(g) for g in game_ids]),
+        ).delete(synchronize_session=False)
+        db.commit()
+
+    digests = get_game_digests(db, payload.season_id, [f.acb_game_id for f in with_game])
+    games_skipped = 0
+    games_unchanged = 0
+    games_empty = 0
+    if not (payload.force or payload.replace):
+        # Finished games with a final box score on record: nothing to fetch
+        todo = [f for f in with_game if not (f.is_finished and digests.get(f.acb_game_id, ("", False))[1])]
+        games_skipped = len(with_game) - len(todo)
+        with_game = todo
+    total = len(with_game)
+
+    fixture_by_game = {f.acb_game_id: f for f in with_game}
+
+    pending: dict[str, list[dict]] = {}
+    pending_box: dict[str, list[tuple]] = {}
+    pending_digests: dict[str, tuple[str, int, bool]] = {}
+    games_done = 0
+    last_round = None
+
+    def _write(gids: list[str]) -> None:
+        # One transaction for these games; counters move only once it's committed
+        nonlocal games_processed, rows_created, rows_updated
+        rows = {g: pending[g] for g in gids if g in pending}
+        box = {g: pending_box[g] for g in gids if g in pending_box}
+        r = {}
+        if rows:
+            r = upsert_game_player_stats_bulk(db, payload.season_id, rows, commit=False, prune_missing=True)
+        if box:
+            upsert_box_scores_bulk(db, payload.season_id, box, commit=False)
+        save_game_digests(db, payload.season_id, {g: pending_digests[g] for g in gids})
+        db.commit()
+        rows_created += int(r.get("created", 0))
+        rows_updated += int(r.get("updated", 0))
+        games_processed += len(rows)
+
+    def _flush():
+        if pending_digests:
+            try:
+                _write(list(pending_digests))
+            except Exception:
+                db.rollback()
+                # One bad game must not cost the whole batch (with replace its rows are
+                # already gone): retry one game per transaction, drop only the failing ones
+                for gid in pending_digests:
+                    try:
+                        _write([gid])
+                    except Exception as e:
+                        db.rollback()
+                        warnings.append(f"game_id={gid} fixture_id={fixture_by_game[gid].id}: {type(e).__name__}: {e}")
+            pending.clear()
+            pending_box.clear()
+            pending_digests.clear()
+        if progress is not None:
+            progress(games_done, total, round_number=last_round,
+                     rows_created=rows_created, rows_updated=rows_updated)
+
+    def _store(res: GameFetchResult):
+        # Called in fixture order, in this thread: DB writes stay sequential
+        nonlocal games_done, last_round, games_unchanged, games_empty
+        gid = res.acb_game_id
+        f = fixture_by_game[gid]
+        games_done += 1
+        last_round = f.round_number
+        # Flush at round boundaries too, so progress is reported per round
+        next_f = with_game[games_done] if games_done < total else None
+        round_ends = next_f is None or next_f.round_number != f.round_number
+        if res.error is not None:
+            warnings.append(f"game_id={gid} fixture_id={f.id}: {res.error}")
+        elif res.rows:
+            h = box_score_hash(res.box if res.box is not None else res.rows)
+            # Final only once partidos says so (minutes alone can't tell regulation from overtime)
+            is_final = bool(f.is_finished)
+            old = digests.get(gid)
+            if old is not None and old[0] == h:
+                games_unchanged += 1
+                if is_final and not old[1]:
+                    pending_digests[gid] = (h, len(res.rows), True)
+            else:
+                pending[gid] = res.rows
+                if res.box is not None:
+                    pending_box[gid] = res.box
+                pending_digests[gid] = (h, len(res.rows), is_final)
+        else:
+            games_empty += 1
+            warnings.append(f"game_id={gid} fixture_id={f.id}: no player rows parsed")
+        if len(pending_digests) >= STATS_WRITE_BATCH_GAMES or round_ends:
+            _flush()
+
+    # Fetches FINAL official stats via acb.com, concurrently on a shared client
+    fetch(
+        [f.acb_game_id for f in with_game],
+        concurrency=payload.concurrency,
+        on_result=_store,
+        final_game_ids=[f.acb_game_id for f in with_game if f.is_finished],
+    )
+
+    return ReseedPlayerStatsOut(
+        season_id=payload.season_id,
+        rounds_requested=payload.rounds,
+        games_found=games_found,
+        games_processed=games_processed,
+        rows_created=rows_created,
+        rows_updated=rows_updated,
+        games_skipped=games_skipped,
+        games_unchanged=games_unchanged,
+        games_empty=games_empty,
+        warnings=warnings,
+    )
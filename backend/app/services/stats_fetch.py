@@ -0,0 +1,158 @@
+# app/services/stats_fetch.py
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Callable, Iterable, List, Optional, Set
+
+from app.core.config import settings
+from app.scrapers.acb_live_stats import (
+    LIVE_STATS_URL,
+    fetch_live_stats_html_async,
+    parse_box_score_tuples,
+    rows_from_box,
+)
+from app.scrapers.archive import HtmlArchive, get_archive
+from app.scrapers.http import make_async_client
+from app.scrapers.parse_pool import aparse
+
+
+# ============================
+# Concurrent fetch engine
+# ============================
+# - One shared httpx.AsyncClient (keep-alive) for the whole batch
+# - At most `concurrency` requests in flight against acb.com
+# - HTML parsing runs in the parser process pool (app/scrapers/parse_pool.py),
+#   never on the event loop; workers send back compact box-score tuples
+#   (one parse per page: minutes/+/- rows and the full box score)
+# - Results are handed to `on_result` strictly in input order, so DB writes
+#   stay ordered (and in the caller's thread) while later games keep downloading
+
+
+@dataclass
+class GameFetchResult:
+    acb_game_id: str
+    rows: Optional[List[dict]] = None  # parse_minutes_plusminus schema
+    box: Optional[List[tuple]] = None  # full box score, acb_live_stats.BOX_FIELDS tuples
+    error: Optional[str] = None
+
+
+async def _fetch_one(client, sem: asyncio.Semaphore, game_id: str, immutable: bool) -> GameFetchResult:
+    try:
+        async with sem:
+            html = await fetch_live_stats_html_async(client, game_id, immutable=immutable)
+        box = await aparse(parse_box_score_tuples, html)
+        return GameFetchResult(acb_game_id=game_id, rows=rows_from_box(box), box=box)
+    except Exception as e:
+        return GameFetchResult(acb_game_id=game_id, error=f"{type(e).__name__}: {e}")
+
+
+async def _fetch_all(
+    game_ids: List[str],
+    concurrency: int,
+    on_result: Optional[Callable[[GameFetchResult], None]],
+    final_ids: Set[str],
+) -> List[GameFetchResult]:
+    sem = asyncio.Semaphore(concurrency)
+    out: List[GameFetchResult] = []
+
+    async with make_async_client(max_connections=concurrency) as client:
+        tasks = [
+            asyncio.create_task(_fetch_one(client, sem, gid, gid in final_ids))
+            for gid in game_ids
+        ]
+        # Consume in order: a slow early game only delays the writes, not the downloads
+        for t in tasks:
+            res = await t
+            if on_result is not None:
+                on_result(res)
+            out.append(res)
+
+    return out
+
+
+def fetch_games_stats(
+    game_ids: Iterable[str],
+    *,
+    concurrency: Optional[int] = None,
+    on_result: Optional[Callable[[GameFetchResult], None]] = None,
+    final_game_ids: Iterable[str] = (),
+) -> List[GameFetchResult]:
+    """
+    Fetch + parse final stats for many games concurrently (sync entry point).
+    Must be called from a thread without a running event loop (sync FastAPI
+    routes and scripts are fine).
+    `final_game_ids`: finished games, whose stats pages are cached as immutable.
+    """
+    ids = [str(g) for g in game_ids if g]
+    if not ids:
+        return []
+    n = max(1, int(concurrency or settings.SCRAPER_CONCURRENCY))
+    return asyncio.run(_fetch_all(ids, n, on_result, {str(g) for g in final_game_ids}))
+
+
+# ============================
+# Archive replay (no network)
+# ============================
+# Same contract as fetch_games_stats, but pages come from the raw HTML archive
+# (app/scrapers/archive.py): latest archived version of each stats page, parsed
+# in the process pool. Used to re-run the current parsers over past seasons.
+
+
+async def _parse_archived(archive: HtmlArchive, game_id: str, workers: Optional[int]) -> GameFetchResult:
+    try:
+        page = archive.latest(LIVE_STATS_URL.format(game_id=game_id))
+        if page is None:
+            return GameFetchResult(acb_game_id=game_id, error="not archived")
+        box = await aparse(parse_box_score_tuples, page.text, workers=workers)
+        return GameFetchResult(acb_game_id=game_id, rows=rows_from_box(box), box=box)
+    except Exception as e:
+        return GameFetchResult(acb_game_id=game_id, error=f"{type(e).__name__}: {e}")
+
+
+async def _parse_all_archived(
+    archive: HtmlArchive,
+    game_ids: List[str],
+    concurrency: int,
+    on_result: Optional[Callable[[GameFetchResult], None]],
+    workers: Optional[int],
+) -> List[GameFetchResult]:
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(gid: str) -> GameFetchResult:
+        async with sem:
+            return await _parse_archived(archive, gid, workers)
+
+    out: List[GameFetchResult] = []
+    tasks = [asyncio.create_task(one(gid)) for gid in game_ids]
+    for t in tasks:
+        res = await t
+        if on_result is not None:
+            on_result(res)
+        out.append(res)
+    return out
+
+
+def archived_games_stats(
+    game_ids: Iterable[str],
+    *,
+    concurrency: Optional[int] = None,
+    on_result: Optional[Callable[[GameFetchResult], None]] = None,
+    final_game_ids: Iterable[str] = (),
+    archive: Optional[HtmlArchive] = None,
+    workers: Optional[int] = None,
+) -> List[GameFetchResult]:
+    """
+    Drop-in replacement for fetch_games_stats that reads the HTML archive instead of acb.com.
+    Games never archived come back with error="not archived".
+    `final_game_ids` is accepted for signature compatibility (the archive is immutable).
+    `workers`: parser pool size (default SCRAPER_PARSE_WORKERS).
+    """
+    ids = [str(g) for g in game_ids if g]
+    archive = archive or get_archive()
+    if not ids:
+        return []
+    if archive is None:
+        raise RuntimeError("HTML archive disabled (SCRAPER_ARCHIVE_ENABLED=false)")
+    n = max(1, int(concurrency or settings.SCRAPER_CONCURRENCY))
+    return asyncio.run(_parse_all_archived(archive, ids, n, on_result, workers))
@@ -0,0 +1,180 @@
+# app/services/stats_ingest.py
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.game_config import SEASON_ID
+from app.crud.crud_game_box_score import upsert_box_scores_bulk
+from app.crud.crud_game_player_stat import (
+    box_score_hash,
+    get_game_digests,
+    save_game_digests,
+    upsert_game_player_stats_bulk,
+)
+from app.models.fixtures import Fixture
+from app.models.game_player_stats import GameStatsDigest
+from app.models.jobs import Job
+from app.schemas.wiki_games import IngestGameStatsIn, IngestGameStatsOut
+from app.scrapers.acb_live_stats import (
+    LIVE_STATS_URL,
+    box_score_reached_regulation,
+    fetch_live_stats_html,
+    parse_box_score_tuples,
+    rows_from_box,
+)
+from app.scrapers.acb_partidos import TZ
+from app.scrapers.cache import get_cache
+from app.services.jobs import RetryLater, enqueue_job
+from app.services.market_utils import refresh_market_window
+
+# Kickoff-driven stats ingestion:
+# - schedule_due_ingestions() (run periodically by app/worker.py) queues one
+#   "ingest_game_stats" job per game once kickoff + duration + delay has passed
+# - the job re-queues itself with backoff (RetryLater) until the box score is final:
+#   partidos marked the fixture finished, or the box score reached regulation minutes
+#   AND came back identical from two polls INGEST_FINAL_STABLE_MIN apart (an overtime
+#   game already has regulation minutes while it's still being played)
+
+INGEST_JOB_KIND = "ingest_game_stats"
+
+
+def ingest_dedupe_key(season_id: str, acb_game_id: str) -> str:
+    return f"ingest_stats:{season_id}:{acb_game_id}"
+
+
+def local_now() -> datetime:
+    # kickoff_at is stored as naive Europe/Madrid wall time (SQLite drops the offset)
+    return datetime.now(TZ).replace(tzinfo=None) if TZ else datetime.now()
+
+
+def schedule_due_ingestions(db: Session, now: Optional[datetime] = None, *, season_id: str = SEASON_ID) -> dict:
+    """
+    Queue an ingestion job for every game whose expected end + INGEST_DELAY_AFTER_END_MIN
+    has passed (within INGEST_LOOKBACK_DAYS) and that was never queued before.
+    Finished fixtures that already have a final box score hash are left alone.
+    """
+    now = now or local_now()
+    wait = timedelta(minutes=settings.INGEST_GAME_DURATION_MIN + settings.INGEST_DELAY_AFTER_END_MIN)
+    due = (
+        db.query(Fixture.id, Fixture.acb_game_id, Fixture.is_finished)
+        .filter(
+            Fixture.season_id == season_id,
+            Fixture.acb_game_id.isnot(None),
+            Fixture.is_postponed == False,  # noqa: E712
+            Fixture.kickoff_at.isnot(None),
+            Fixture.kickoff_at <= now - wait,
+            Fixture.kickoff_at >= now - timedelta(days=settings.INGEST_LOOKBACK_DAYS),
+        )
+        .order_by(Fixture.kickoff_at.asc(), Fixture.id.asc())
+        .all()
+    )
+    if not due:
+        return {"due": 0, "queued": 0, "skipped": 0}
+
+    keys = {gid: ingest_dedupe_key(season_id, gid) for _, gid, _ in due}
+    # Any status: a done/failed ingestion isn't retried by the scheduler (use the wiki reseed)
+    seen = {k for (k,) in db.query(Job.dedupe_key).filter(Job.dedupe_key.in_(list(keys.values())))}
+    digests = get_game_digests(db, season_id, keys)
+
+    queued = 0
+    for _, gid, is_finished in due:
+        if keys[gid] in seen or (is_finished and digests.get(gid, ("", False))[1]):
+            continue
+        enqueue_job(
+            db,
+            INGEST_JOB_KIND,
+            {"season_id": season_id, "acb_game_id": gid},
+            dedupe_key=keys[gid],
+        )
+        queued += 1
+
+    return {"due": len(due), "queued": queued, "skipped": len(due) - queued}
+
+
+def _require_stable_box_score(db: Session, season_id: str, gid: str, rows: list[dict], h: str) -> None:
+    """RetryLater unless this box score has regulation minutes and hasn't changed for INGEST_FINAL_STABLE_MIN."""
+    if not box_score_reached_regulation(rows):
+        played = sum(r.get("minutes_seconds") or 0 for r in rows) // 60
+        raise RetryLater(f"game_id={gid}: box score not final yet ({played} player-minutes)")
+
+    seen = (
+        db.query(GameStatsDigest.content_hash, GameStatsDigest.updated_at)
+        .filter(GameStatsDigest.season_id == season_id, GameStatsDigest.acb_game_id == gid)
+        .first()
+    )
+    if seen is None or seen.content_hash != h:
+        # First sighting of this content (or it changed, e.g. overtime): remember it.
+        # Committed here, the job runner rolls back on RetryLater.
+        save_game_digests(db, season_id, {gid: (h, len(rows), False)})
+        db.commit()
+        raise RetryLater(f"game_id={gid}: box score changed, waiting for it to settle")
+
+    # updated_at: server CURRENT_TIMESTAMP (UTC) of the write that stored this hash
+    stable_since = seen.updated_at.replace(tzinfo=None)
+    if datetime.utcnow() - stable_since < timedelta(minutes=settings.INGEST_FINAL_STABLE_MIN):
+        raise RetryLater(f"game_id={gid}: box score unchanged since {stable_since:%H:%M} UTC, not long enough")
+
+
+def ingest_game_stats(
+    db: Session,
+    payload: IngestGameStatsIn,
+    *,
+    progress: Optional[Callable[..., None]] = None,
+) -> IngestGameStatsOut:
+    """
+    Fetch one game's box score; raise RetryLater while it isn't final.
+    Final = the fixture is already finished (partidos), or the box score has
+    regulation minutes and its hash is unchanged since a poll at least
+    INGEST_FINAL_STABLE_MIN ago (the non-final digest records that first sighting).
+    Once final: upsert the rows and the full box score, mark the fixture finished,
+    pin the page in the HTML cache and refresh the market window (active round
+    depends on is_finished).
+    """
+    gid = payload.acb_game_id
+    fixture = (
+        db.query(Fixture)
+        .filter(Fixture.season_id == payload.season_id, Fixture.acb_game_id == gid)
+        .first()
+    )
+
+    box = parse_box_score_tuples(fetch_live_stats_html(gid))
+    rows = rows_from_box(box)
+    if not rows:
+        raise RetryLater(f"game_id={gid}: no box score yet")
+    h = box_score_hash(box)
+    if not (fixture is not None and fixture.is_finished):
+        _require_stable_box_score(db, payload.season_id, gid, rows, h)
+
+    res = upsert_game_player_stats_bulk(db, payload.season_id, {gid: rows}, commit=False, prune_missing=True)
+    upsert_box_scores_bulk(db, payload.season_id, {gid: box}, commit=False)
+    save_game_digests(db, payload.season_id, {gid: (h, len(rows), True)})
+
+    marked_finished = False
+    if fixture is not None and not fixture.is_finished:
+        fixture.is_finished = True
+        marked_finished = True
+    db.commit()
+
+    cache = get_cache()
+    if cache is not None:
+        cache.touch(LIVE_STATS_URL.format(game_id=gid), immutable=True)
+
+    if marked_finished:
+        refresh_market_window(db)
+
+    if progress is not None:
+        progress(1, 1, acb_game_id=gid, rows=len(rows))
+
+    return IngestGameStatsOut(
+        season_id=payload.season_id,
+        acb_game_id=gid,
+        fixture_id=fixture.id if fixture is not None else None,
+        rows_created=int(res["created"]),
+        rows_updated=int(res["updated"]),
+        rows_unchanged=int(res["unchanged"]),
+        marked_finished=marked_finished,
+    )
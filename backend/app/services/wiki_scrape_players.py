@@ -0,0 +1,128 @@
+# app/services/wiki_scrape_players.py
+from __future__ import annotations
+
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.teams import Team
+from app.schemas.wiki_players import WikiPlayersScrapeRequest
+from app.scrapers.acb_players import fetch_team_rosters_html, parse_roster_players, canonicalize_position
+from app.services.players_upsert import SeasonPlayers, upsert_roster_players
+
+
+def scrape_players(
+    db: Session,
+    payload: WikiPlayersScrapeRequest,
+    *,
+    progress: Optional[Callable[..., None]] = None,
+) -> dict:
+    """
+    Scrape the roster of every requested (or every active) team and upsert it.
+    `progress(done, total, **detail)` is called after every team.
+    """
+    # If team_ids is omitted/empty => scrape ALL active teams for that season.
+    requested_team_ids = [t.strip().upper() for t in (payload.team_ids or []) if t and t.strip()]
+
+    q = db.query(Team).filter(
+        Team.season_id == payload.temporada_id,
+        Team.is_active == True,  # noqa: E712
+    )
+
+    if requested_team_ids:
+        q = q.filter(Team.team_id.in_(requested_team_ids))
+
+    teams = q.all()
+    if not teams:
+        return {"ok": False, "detail": "No matching teams found for this season/team_ids"}
+
+    results = []
+    total_inserted = 0
+    total_updated = 0
+    total_deactivated = 0
+    total_players = 0
+
+    # All roster pages in parallel first; DB work below runs in one transaction
+    fetched = fetch_team_rosters_html(
+        [team.acb_club_id for team in teams if team.acb_club_id],
+        season_id=payload.temporada_id,
+        include_html=True,
+    )
+
+    # Whole season loaded once; diffs applied in memory and flushed in bulk at the end
+    season_players = None if payload.dry_run else SeasonPlayers(db, payload.temporada_id)
+
+    for team in teams:
+        if not team.acb_club_id:
+            results.append({"team_id": team.team_id, "ok": False, "detail": "missing acb_club_id"})
+            if progress is not None:
+                progress(len(results), len(teams), team_id=team.team_id, ok=False)
+            continue
+
+        fetch_info = fetched[str(team.acb_club_id)]
+        if fetch_info.get("status_code") != 200:
+            results.append({"team_id": team.team_id, "ok": False, "detail": "ACB request failed", "fetch": fetch_info})
+            if progress is not None:
+                progress(len(results), len(teams), team_id=team.team_id, ok=False)
+            continue
+
+        html = fetch_info.get("html", "")
+        players = parse_roster_players(html)
+        fetch_info.pop("html", None)
+
+        preview = []
+        for p in players:
+            preview.append({
+                "acb_player_id": p["acb_player_id"],
+                "name": p["name"],
+                "position_raw": p["position_raw"],
+                "position": canonicalize_position(p["position_raw"]),
+            })
+
+        ins = upd = deactivated = 0
+
+        if not payload.dry_run:
+            ins, upd = upsert_roster_players(db, payload.temporada_id, team.id, preview, players=season_players)
+            total_inserted += ins
+            total_updated += upd
+
+            # Deactivate players that were previously active for this team+season but are not in the scraped roster now
+            seen_ids = {p.get("acb_player_id") for p in preview if p.get("acb_player_id")}
+            if seen_ids:
+                deactivated = season_players.deactivate_missing(team.id, seen_ids)
+                total_deactivated += deactivated
+
+        total_players += len(preview)
+
+        results.append({
+            "team_id": team.team_id,
+            "acb_club_id": team.acb_club_id,
+            "players_count": len(preview),
+            "players_sample": preview[:5],  # keep response small
+            "db": {"inserted": ins, "updated": upd, "deactivated": deactivated},
+            "fetch": fetch_info,
+            "ok": True,
+        })
+        if progress is not None:
+            progress(len(results), len(teams), team_id=team.team_id, players=len(preview))
+
+    if not payload.dry_run:
+        season_players.flush()
+        db.commit()
+
+    return {
+        "ok": True,
+        "step": "7.1_multi_team",
+        "season_id": payload.temporada_id,
+        "dry_run": payload.dry_run,
+        "requested_team_ids": requested_team_ids,
+        "totals": {
+            "teams_requested": len(teams),
+            "teams_processed": sum(1 for r in results if r.get("ok")),
+            "players_parsed": total_players,
+            "inserted": total_inserted,
+            "updated": total_updated,
+            "deactivated": total_deactivated,
+        },
+        "results": results,
+    }
@@ -0,0 +1,162 @@
+# app/worker.py
+# Background worker for the SQLite job queue (app/services/jobs.py).
+#
+#   cd backend
+#   python -m app.worker            # run forever
+#   python -m app.worker --once     # drain the queue and exit
+#
+# Run one or more next to uvicorn; the API only enqueues and reads job rows.
+# At least one must run the round-commit thread (the default): without it rounds
+# are never committed and team edits stay blocked with 503 once the market closes.
+# Every INGEST_SCHEDULER_INTERVAL_S the worker also queues stats ingestion for
+# games that should have ended (app/services/stats_ingest.py), and a separate
+# thread commits each round right when its market closes (market_utils.commit_round_if_needed).
+import argparse
+import os
+import signal
+import socket
+import threading
+import time
+from datetime import datetime, timezone
+
+from app.core.config import settings
+from app.db.init_db import init_db
+from app.db.session import SessionLocal
+from app.services.jobs import (
+    claim_next_job,
+    heartbeat,
+    job_kind_names,
+    requeue_stale_jobs,
+    run_job,
+    worker_heartbeat,
+)
+from app.services.market_utils import commit_round_if_needed, next_market_transition
+from app.services.stats_ingest import schedule_due_ingestions
+
+
+class _Heartbeat:
+    """Keeps heartbeat_at fresh while a handler is busy without reporting progress."""
+
+    def __init__(self, job_id: int, every_s: float):
+        self._stop = threading.Event()
+        self._t = threading.Thread(target=self._run, args=(job_id, every_s), daemon=True)
+
+    def _run(self, job_id: int, every_s: float):
+        while not self._stop.wait(every_s):
+            heartbeat(job_id)
+
+    def __enter__(self):
+        self._t.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._t.join(timeout=5)
+
+
+def _round_commit_tick(worker_id: str) -> float:
+    """Commit the round if its market has closed; seconds until the next check."""
+    db = SessionLocal()
+    try:
+        # Lets the API see that someone commits rounds (team guard / startup warning)
+        worker_heartbeat(db, worker_id, round_commit=True)
+        rn = commit_round_if_needed(db)
+        if rn is not None:
+            print(f"[worker] committed round {rn}", flush=True)
+        nxt = next_market_transition(db)
+    except Exception as e:
+        db.rollback()
+        print(f"[worker] round commit failed: {type(e).__name__}: {e}", flush=True)
+        nxt = None
+    finally:
+        db.close()
+    wait = settings.ROUND_COMMIT_RECHECK_S
+    if nxt is not None:
+        # Wake up just past the close/open time (schedule edits are seen on the next recheck)
+        wait = min(wait, max(0.0, (nxt - datetime.now(timezone.utc)).total_seconds()) + 0.5)
+    return wait
+
+
+class _RoundCommitScheduler:
+    """Sleeps until the next market close/open transition and commits the round there."""
+
+    def __init__(self, worker_id: str, stopping: threading.Event):
+        self._worker_id = worker_id
+        self._stopping = stopping
+        self._t = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._stopping.wait(_round_commit_tick(self._worker_id))
+
+    def start(self):
+        self._t.start()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--once", action="store_true", help="Exit when the queue is empty")
+    ap.add_argument("--poll-s", type=float, default=settings.JOB_POLL_INTERVAL_S)
+    ap.add_argument("--no-scheduler", action="store_true", help="Don't queue kickoff-driven stats ingestion")
+    ap.add_argument("--no-round-commit", action="store_true", help="Don't commit rounds when the market closes")
+    args = ap.parse_args()
+
+    init_db()
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    stopping = threading.Event()
+
+    def _stop(signum, _frame):
+        # Finish the current job, then exit
+        print(f"[worker] signal {signum}: stopping after current job", flush=True)
+        stopping.set()
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+
+    print(f"[worker] {worker_id} kinds={job_kind_names()}", flush=True)
+    last_stale_check = 0.0
+    last_schedule = 0.0
+    schedule = settings.INGEST_SCHEDULER_ENABLED and not args.no_scheduler
+
+    if settings.ROUND_COMMIT_SCHEDULER_ENABLED and not args.no_round_commit:
+        if args.once:
+            _round_commit_tick(worker_id)
+        else:
+            _RoundCommitScheduler(worker_id, stopping).start()
+
+    while not stopping.is_set():
+        db = SessionLocal()
+        try:
+            if time.monotonic() - last_stale_check > settings.JOB_STALE_AFTER_S / 2:
+                n = requeue_stale_jobs(db, settings.JOB_STALE_AFTER_S)
+                if n:
+                    print(f"[worker] recovered {n} stale job(s)", flush=True)
+                last_stale_check = time.monotonic()
+            if schedule and time.monotonic() - last_schedule > settings.INGEST_SCHEDULER_INTERVAL_S:
+                try:
+                    res = schedule_due_ingestions(db)
+                    if res["queued"]:
+                        print(f"[worker] scheduled stats ingestion: {res}", flush=True)
+                except Exception as e:
+                    db.rollback()
+                    print(f"[worker] ingestion scheduler failed: {type(e).__name__}: {e}", flush=True)
+                last_schedule = time.monotonic()
+            job = claim_next_job(db, worker_id)
+        finally:
+            db.close()
+
+        if job is None:
+            if args.once:
+                break
+            stopping.wait(args.poll_s)
+            continue
+
+        t0 = time.time()
+        print(f"[worker] job {job.id} {job.kind} attempt {job.attempts}/{job.max_attempts} ...", flush=True)
+        with _Heartbeat(job.id, settings.JOB_HEARTBEAT_S):
+            run_job(job)
+        print(f"[worker] job {job.id} finished in {time.time() - t0:.1f}s", flush=True)
+
+
+if __name__ == "__main__":
+    main()
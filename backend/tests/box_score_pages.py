@@ -0,0 +1,52 @@
+# acb.com /partido/estadisticas pages built from per-player rows, for parser and ingestion tests.
+# Same markup as the real page: one <section class="partido"> per team (the away one also
+# "visitante"), a two-row header (groups, then labels) and equipo/entrenador/totales rows.
+
+GROUP_ROW = (
+    '<tr><th colspan="4">&nbsp;</th><th colspan="2">T2</th><th colspan="2">T3</th><th colspan="2">T1</th>'
+    '<th colspan="3">Rebotes</th><th>&nbsp;</th><th>&nbsp;</th><th>&nbsp;</th><th>&nbsp;</th>'
+    '<th colspan="2">Tapones</th><th>&nbsp;</th><th colspan="2">Faltas</th><th>&nbsp;</th><th>&nbsp;</th></tr>'
+)
+LABELS = ("D", "Nombre", "Min", "P", "T2", "T2 %", "T3", "T3 %", "T1", "T1 %",
+          "T", "D", "O", "A", "BR", "BP", "C", "F", "C", "M", "C", "R", "+/-", "V")
+
+
+def player_cells(pid: str, dorsal: str, minutes: str, stats: dict) -> list[str]:
+    """<td>s for one player; `stats` keys: LABELS after "Min" (repeated labels as C1/C2/C3, D as RD)."""
+    return [
+        f'<td class="dorsal">{dorsal}</td>',
+        f'<td class="nombre jugador"><a href="/jugador/ver/{pid}-J.-Jugador.html">J. Jugador</a></td>',
+        f"<td>{minutes}</td>",
+    ] + [f"<td>{stats[k]}</td>" for k in ("P", "T2", "T2 %", "T3", "T3 %", "T1", "T1 %", "T", "RD", "O", "A",
+                                          "BR", "BP", "C1", "F", "C2", "M", "C3", "R", "+/-", "V")]
+
+
+def team_section(cls: str, player_rows: list[list[str]], labels=LABELS) -> str:
+    width = len(labels)
+    head = "".join(f"<th>{c}</th>" for c in labels)
+    rows = [f"<tr>{''.join(cells)}</tr>" for cells in player_rows]
+    rows.append('<tr class="equipo"><td></td><td class="nombre">Equipo</td>' + "<td>&nbsp;</td>" * (width - 2) + "</tr>")
+    rows.append('<tr><td></td><td class="nombre entrenador">E. Entrenador</td>' + "<td></td>" * (width - 2) + "</tr>")
+    rows.append('<tr class="totales"><td></td><td>Total</td><td>200:00</td>' + "<td>0</td>" * (width - 3) + "</tr>")
+    return (f'<section class="{cls}"><h2>Equipo</h2><table data-toggle="table-estadisticas">'
+            f"<thead>{GROUP_ROW}<tr>{head}</tr></thead><tbody>{''.join(rows)}</tbody></table></section>")
+
+
+def page(home_rows: list[list[str]], away_rows: list[list[str]], labels=LABELS) -> str:
+    return ("<html><head><title>Estadísticas</title></head><body>"
+            + team_section("partido", home_rows, labels)
+            + team_section("partido visitante", away_rows, labels)
+            + "</body></html>")
+
+
+def plain_stats(points: int, plus_minus: int) -> dict:
+    return {"P": points, "T2": "2/4", "T2 %": "50", "T3": "1/3", "T3 %": "33,3", "T1": "1/1", "T1 %": "100",
+            "T": 3, "RD": 2, "O": 1, "A": 1, "BR": 0, "BP": 1, "C1": 0, "F": 0, "C2": 0, "M": 0,
+            "C3": 2, "R": 1, "+/-": plus_minus, "V": points}
+
+
+def uniform_game(minutes_each: str, points: int, base_id: int = 30000000) -> str:
+    """5 players per team, each playing `minutes_each` (e.g. "40:00" = full regulation)."""
+    home = [player_cells(str(base_id + i), f"*{i}", minutes_each, plain_stats(points + i, i)) for i in range(5)]
+    away = [player_cells(str(base_id + 50 + i), f"*{i}", minutes_each, plain_stats(points - i, -i)) for i in range(5)]
+    return page(home, away)
@@ -0,0 +1,36 @@
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+from app.db.base import Base
+from app.services import market_index
+
+
+@pytest.fixture
+def db(tmp_path):
+    # File-backed so Core statements on db.connection() and the ORM see the same data
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.sqlite'}")
+    Base.metadata.create_all(engine)
+    # The market index is cached per process by version, and versions restart in every test DB
+    market_index._indexes.clear()
+    session = sessionmaker(bind=engine, autoflush=False)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+@pytest.fixture
+def bound_params(db):
+    """Bound parameter count of every (non-executemany) statement run on the test DB."""
+    seen = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if not executemany:
+            seen.append(len(parameters))
+
+    event.listen(db.get_bind(), "before_cursor_execute", count)
+    yield seen
+    event.remove(db.get_bind(), "before_cursor_execute", count)
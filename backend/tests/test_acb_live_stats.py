@@ -0,0 +1,70 @@
+from pathlib import Path
+
+import pytest
+
+from app.scrapers.acb_live_stats import (
+    BOX_FIELDS,
+    _BOX_COLUMNS,
+    _header_columns,
+    parse_box_score_tuples,
+    parse_minutes_plusminus,
+    rows_from_box,
+)
+from tests.box_score_pages import LABELS, page, player_cells, plain_stats
+
+PAGE = (Path(__file__).parent / "fixtures" / "acb_estadisticas_header.html").read_text(encoding="utf-8")
+
+HOME = {
+    "acb_player_id": "30001234", "play_time": "31:24", "seconds": 1884, "is_started": True,
+    "points": 17, "t2_made": 5, "t2_att": 8, "t3_made": 2, "t3_att": 4, "t1_made": 1, "t1_att": 2,
+    "reb_off": 3, "reb_def": 6, "reb_total": 9, "assists": 10, "steals": 2, "turnovers": 5, "fastbreaks": 1,
+    "blocks": 7, "blocks_against": 8, "dunks": 0, "fouls": 4, "fouls_drawn": 11, "plus_minus": -12,
+    "valoracion": 21,
+}
+AWAY = {
+    "acb_player_id": "30005678", "play_time": "18:05", "seconds": 1085, "is_started": False,
+    "points": 6, "t2_made": 3, "t2_att": 3, "t3_made": 0, "t3_att": 0, "t1_made": 0, "t1_att": 1,
+    "reb_off": 1, "reb_def": 4, "reb_total": 5, "assists": 0, "steals": 1, "turnovers": 2, "fastbreaks": 0,
+    "blocks": 3, "blocks_against": 1, "dunks": 2, "fouls": 5, "fouls_drawn": 2, "plus_minus": 4,
+    "valoracion": 9,
+}
+
+# Column index of every mapped field in the page header (D, Nombre, Min, then the box score)
+PAGE_COLUMNS = {
+    "play_time": 2, "points": 3, "t2": 4, "t2_pct": 5, "t3": 6, "t3_pct": 7, "t1": 8, "t1_pct": 9,
+    "reb_total": 10, "reb_def": 11, "reb_off": 12, "assists": 13, "steals": 14, "turnovers": 15,
+    "fastbreaks": 16, "blocks": 17, "blocks_against": 18, "dunks": 19, "fouls": 20, "fouls_drawn": 21,
+    "plus_minus": 22, "valoracion": 23,
+}
+
+
+def test_header_maps_every_box_column():
+    cols = _header_columns(list(LABELS))
+    assert cols == PAGE_COLUMNS
+    assert set(cols) == {"play_time"} | {name for name, _labels in _BOX_COLUMNS}
+
+
+def test_page_parses_every_field():
+    rows = {r[0]: dict(zip(BOX_FIELDS, r)) for r in parse_box_score_tuples(PAGE)}
+    assert rows == {HOME["acb_player_id"]: HOME, AWAY["acb_player_id"]: AWAY}
+    assert set(HOME) == set(BOX_FIELDS)
+
+
+def test_box_rows_match_minutes_parser():
+    assert rows_from_box(parse_box_score_tuples(PAGE)) == parse_minutes_plusminus(PAGE)
+
+
+@pytest.mark.parametrize("labels", [
+    ("D", "Nombre", "Min", "PTS", "T2", "T2%", "T3", "T3%", "T1", "T1%",
+     "REB", "RD", "RO", "AS", "BR", "BP", "CONT", "TAPF", "TAPC", "M", "FP", "FR", "+/-", "VAL"),
+    ("D", "Nombre", "Min", "P", "T2", "T2 %", "T3", "T3 %", "T1", "T1 %",
+     "RT", "D", "O", "A", "BR", "BP", "C", "TAP", "C", "M", "C", "R", "+/-", "V"),
+])
+def test_alternate_labels(labels):
+    assert _header_columns(list(labels)) == PAGE_COLUMNS
+    stats = {**plain_stats(17, -12), "C1": 1, "F": 7, "C2": 8, "M": 0, "C3": 4, "R": 11}
+    html = page([player_cells("30001234", "*7", "31:24", stats)], [], labels)
+    (row,) = parse_box_score_tuples(html)
+    row = dict(zip(BOX_FIELDS, row))
+    assert (row["fastbreaks"], row["blocks"], row["blocks_against"], row["dunks"],
+            row["fouls"], row["fouls_drawn"], row["plus_minus"]) == (1, 7, 8, 0, 4, 11, -12)
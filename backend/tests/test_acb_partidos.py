@@ -0,0 +1,126 @@
+import base64
+import json
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from app.core.config import settings
+from app.core.game_config import ACB_COMPETICION_ID, ACB_JORNADA_ID_ROUND1
+from app.scrapers.acb_partidos import (
+    PARTIDOS_URL,
+    _parse_partidos_dom,
+    _parse_partidos_next_data,
+    parse_partidos_html,
+)
+from app.scrapers.replay import iter_corpus_urls, load_response
+
+ROUND = 5
+JORNADA_ID = 5888
+URL = PARTIDOS_URL.format(competicion=1, jornada_id=JORNADA_ID)
+CLUBS = ["1", "2", "3", "4", "5", "6", "7", "8", "9", "10", "11", "12", "13", "14", "15", "16", "17", "18"]
+
+
+def _match(home, away, *, game_id, kickoff="2025-10-25T18:00:00+02:00", **extra):
+    return {
+        "matchId": game_id,
+        "startDateTime": kickoff,
+        "homeTeam": {"clubId": home, "name": f"Club {home}"},
+        "awayTeam": {"clubId": away, "name": f"Club {away}"},
+        **extra,
+    }
+
+
+def _page(payload, clubs=CLUBS):
+    links = "".join(f'<a href="/club/plantilla/id/{c}">Club {c}</a>' for c in clubs)
+    data = json.dumps({"props": {"pageProps": payload}})
+    return (f'<html><body>{links}<script id="__NEXT_DATA__" type="application/json">{data}</script>'
+            "</body></html>")
+
+
+def _parse(html):
+    return _parse_partidos_next_data(html, round_number=ROUND, source_url=URL)
+
+
+def test_reads_round_matches_with_naive_madrid_kickoff():
+    html = _page({"matches": [
+        _match("1", "2", game_id=104501, jornada={"id": JORNADA_ID, "name": "Jornada 5"}),
+        _match("3", "4", game_id=104502, kickoff=1761408000000, roundNumber=ROUND),  # epoch ms
+    ]})
+    fixtures = {(f.home_team_id, f.away_team_id): f for f in _parse(html)}
+    assert set(fixtures) == {("1", "2"), ("3", "4")}
+    first = fixtures[("1", "2")]
+    assert first.acb_game_id == "104501" and first.round_number == ROUND
+    assert first.kickoff_at == datetime(2025, 10, 25, 18, 0)  # naive wall time, like the DOM path
+    assert fixtures[("3", "4")].kickoff_at == datetime(2025, 10, 25, 18, 0)
+    assert fixtures[("3", "4")].kickoff_at.tzinfo is None
+
+
+def test_skips_matches_from_other_rounds():
+    html = _page({
+        "matches": [_match("1", "2", game_id=104501, round=ROUND)],
+        "precedentes": [_match("2", "1", game_id=103301, round=12)],
+        "calendar": [_match("5", "6", game_id=104611, jornada={"number": 6, "id": JORNADA_ID + 1})],
+    })
+    assert [(f.home_team_id, f.away_team_id) for f in _parse(html)] == [("1", "2")]
+
+
+def test_ignores_generic_home_away_keys():
+    widget = {"id": 99, "home": {"id": "7"}, "away": {"id": "8"}}  # e.g. a standings/calendar widget
+    html = _page({"matches": [_match("1", "2", game_id=104501)], "widget": widget})
+    assert [(f.home_team_id, f.away_team_id) for f in _parse(html)] == [("1", "2")]
+
+
+def test_no_team_links_falls_back_to_dom():
+    html = _page({"matches": [_match("1", "2", game_id=104501)]}, clubs=[])
+    assert _parse(html) is None
+    assert parse_partidos_html(html, season_id="2025-26", round_number=ROUND, source_url=URL) == []
+
+
+def test_implausible_round_falls_back_to_dom():
+    ten_games = [_match(CLUBS[i], CLUBS[i + 1], game_id=104500 + i) for i in range(0, 18, 2)]
+    ten_games.append(_match("1", "3", game_id=104599))
+    assert _parse(_page({"matches": ten_games})) is None
+
+    club_twice = [_match("1", "2", game_id=104501), _match("1", "3", game_id=104502)]
+    assert _parse(_page({"matches": club_twice})) is None
+
+
+def test_unlinked_team_ids_fall_back_to_dom():
+    html = _page({"matches": [_match("1", "99", game_id=104501)]})
+    assert _parse(html) is None
+
+
+# Recorded acb.com partidos pages (app/scrapers/replay.py corpus format): the ones checked
+# in under tests/fixtures/corpus plus the local SCRAPER_CORPUS_DIR, if any. Record with
+#   SCRAPER_HTTP_MODE=record python -m app.seed.seed_fixtures_from_partidos --season-id 2025-26 \
+#       --competicion 1 --start-jornada-id 5884 --rounds 1
+# and copy the partidos *.json.gz files into tests/fixtures/corpus.
+def _recorded_partidos_pages():
+    prefix = PARTIDOS_URL.format(competicion=ACB_COMPETICION_ID, jornada_id="")
+    pages = []
+    for corpus_dir in (Path(__file__).parent / "fixtures" / "corpus", Path(settings.SCRAPER_CORPUS_DIR)):
+        if not corpus_dir.is_dir():
+            continue
+        for url in iter_corpus_urls(corpus_dir):
+            if not url.startswith(prefix):
+                continue
+            doc = load_response(corpus_dir, url)
+            if doc["status"] == 200:
+                jornada_id = int(parse_qs(urlsplit(url).query)["jornada"][0])
+                pages.append((url, jornada_id - ACB_JORNADA_ID_ROUND1 + 1,
+                              base64.b64decode(doc["body_b64"]).decode("utf-8")))
+    return pages
+
+
+def test_recorded_pages_take_the_json_path():
+    pages = _recorded_partidos_pages()
+    if not pages:
+        pytest.skip("no recorded partidos page in tests/fixtures/corpus or SCRAPER_CORPUS_DIR")
+    for url, round_number, html in pages:
+        from_json = _parse_partidos_next_data(html, round_number=round_number, source_url=url)
+        assert from_json is not None, f"{url}: JSON path not taken (DOM fallback)"
+        from_dom = _parse_partidos_dom(html, season_id="", round_number=round_number, source_url=url)
+        assert ({(f.home_team_id, f.away_team_id, f.acb_game_id) for f in from_json}
+                == {(f.home_team_id, f.away_team_id, f.acb_game_id) for f in from_dom}), url
@@ -0,0 +1,97 @@
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.models.roster import UserRosterBase, UserRosterDraft, UserSeasonState
+from app.models.user import User
+from app.services.market_utils import commit_all_rosters
+
+SEASON = "2025-26"
+OTHER = "2024-25"
+
+
+def _per_user_commit(db, season_id):
+    # The loop commit_all_rosters replaced (per user: base <- draft, budget_base <- budget_current)
+    for u in db.query(User).all():
+        us = db.query(UserSeasonState).filter_by(user_id=u.user_id, season_id=season_id).first()
+        if not us:
+            continue
+        draft_ids = [r.player_id for r in db.query(UserRosterDraft).filter_by(user_id=u.user_id, season_id=season_id)]
+        db.query(UserRosterBase).filter_by(user_id=u.user_id, season_id=season_id).delete()
+        db.add_all([UserRosterBase(user_id=u.user_id, season_id=season_id, player_id=p) for p in draft_ids])
+        us.budget_base = us.budget_current
+
+
+def _league(db):
+    def user(uid):
+        db.add(User(user_id=uid, email=f"u{uid}@test", password_hash="x", team_name=f"t{uid}", username=f"u{uid}"))
+
+    def state(uid, base_budget, budget, season=SEASON):
+        db.add(UserSeasonState(user_id=uid, season_id=season, budget_base=base_budget, budget_current=budget))
+
+    def rows(model, uid, ids, season=SEASON):
+        db.add_all([model(user_id=uid, season_id=season, player_id=p) for p in ids])
+
+    # 1: two transfers and a cheaper roster
+    user(1)
+    state(1, 100, 130)
+    rows(UserRosterBase, 1, ["a", "b", "c"])
+    rows(UserRosterDraft, 1, ["a", "d", "e"])
+    # 2: nothing changed
+    user(2)
+    state(2, 50, 50)
+    rows(UserRosterBase, 2, ["a", "b"])
+    rows(UserRosterDraft, 2, ["a", "b"])
+    # 3: sold everyone (empty draft)
+    user(3)
+    state(3, 0, 90)
+    rows(UserRosterBase, 3, ["f", "g"])
+    # 4: first team (empty base)
+    user(4)
+    state(4, 500, 20)
+    rows(UserRosterDraft, 4, ["h", "i"])
+    # 5: no season state: not committed
+    user(5)
+    rows(UserRosterBase, 5, ["x"])
+    rows(UserRosterDraft, 5, ["y"])
+    # 6: state and rosters but the user row is gone: not committed
+    state(6, 1, 2)
+    rows(UserRosterBase, 6, ["x"])
+    rows(UserRosterDraft, 6, ["y"])
+    # 1 in another season: untouched
+    state(1, 7, 8, season=OTHER)
+    rows(UserRosterBase, 1, ["old"], season=OTHER)
+    rows(UserRosterDraft, 1, ["new"], season=OTHER)
+    db.commit()
+
+
+def _snapshot(db):
+    return (
+        sorted((r.user_id, r.season_id, r.player_id) for r in db.query(UserRosterBase)),
+        sorted((r.user_id, r.season_id, r.player_id) for r in db.query(UserRosterDraft)),
+        sorted((s.user_id, s.season_id, s.budget_base, s.budget_current) for s in db.query(UserSeasonState)),
+    )
+
+
+def test_set_based_commit_matches_per_user_loop(db, tmp_path):
+    _league(db)
+    _per_user_commit(db, SEASON)
+    db.commit()
+    expected = _snapshot(db)
+    db.rollback()
+
+    # Same league in a fresh database, committed set-based
+    engine = create_engine(f"sqlite:///{tmp_path / 'bulk.sqlite'}")
+    Base.metadata.create_all(engine)
+    bulk = sessionmaker(bind=engine, autoflush=False)()
+    try:
+        _league(bulk)
+        out = commit_all_rosters(bulk, SEASON)
+        bulk.commit()
+        assert _snapshot(bulk) == expected
+        # Only what changed is written: user 1 (-b -c +d +e), 3 (-f -g), 4 (+h +i); budgets 1, 3, 4
+        assert out == {"base_deleted": 4, "base_inserted": 4, "budgets_updated": 3}
+        assert commit_all_rosters(bulk, SEASON) == {"base_deleted": 0, "base_inserted": 0, "budgets_updated": 0}
+    finally:
+        bulk.close()
+        engine.dispose()
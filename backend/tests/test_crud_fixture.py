@@ -0,0 +1,21 @@
+from datetime import datetime, timedelta
+
+from app.crud.crud_fixture import FixtureRow, upsert_fixtures
+from app.models.fixtures import Fixture
+
+SEASON = "2025-26"
+
+
+def test_bulk_upsert_stays_under_999_parameters(db, bound_params):
+    ko = datetime(2025, 10, 4, 18, 0)
+    rows = [FixtureRow(round_number=r, home_team_id=f"H{g}", away_team_id=f"A{g}", kickoff_at=ko + timedelta(days=7 * r),
+                       acb_game_id=str(100000 + 100 * r + g))
+            for r in range(1, 35) for g in range(9)]  # a whole season: 306 rows
+
+    assert upsert_fixtures(db, SEASON, rows) == {"created": 306, "updated": 0, "total": 306}
+    for row in rows:
+        row.is_finished = True
+    assert upsert_fixtures(db, SEASON, rows) == {"created": 0, "updated": 306, "total": 306}
+
+    assert db.query(Fixture).filter_by(is_finished=True).count() == 306
+    assert max(bound_params) <= 999
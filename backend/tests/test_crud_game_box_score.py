@@ -0,0 +1,23 @@
+from app.crud.crud_game_box_score import upsert_box_scores_bulk
+from app.models.game_box_scores import GameBoxScore
+from app.scrapers.acb_live_stats import BOX_FIELDS
+
+SEASON = "2025-26"
+
+
+def _box(gid: int, players: range) -> list[tuple]:
+    row = {f: 1 for f in BOX_FIELDS}
+    return [tuple({**row, "acb_player_id": str(gid * 100 + p), "play_time": "20:00", "seconds": 1200,
+                   "is_started": p < 5}[f] for f in BOX_FIELDS) for p in players]
+
+
+def test_bulk_upsert_and_prune_stay_under_999_parameters(db, bound_params):
+    games = {str(104000 + g): _box(104000 + g, range(12)) for g in range(40)}  # 480 rows
+    assert upsert_box_scores_bulk(db, SEASON, games) == {"written": 480, "deleted": 0}
+
+    # Two players per game drop out of the box score
+    trimmed = {gid: box[:10] for gid, box in games.items()}
+    assert upsert_box_scores_bulk(db, SEASON, trimmed) == {"written": 400, "deleted": 80}
+
+    assert db.query(GameBoxScore).count() == 400
+    assert max(bound_params) <= 999
@@ -0,0 +1,50 @@
+import asyncio
+import contextlib
+
+from app.core.config import settings
+from app.services import live_games
+from app.services.live_games import LiveHub
+
+
+def test_subscribe_while_poller_closes_starts_a_new_one(monkeypatch):
+    monkeypatch.setattr(settings, "LIVE_POLL_INTERVAL_S", 0.01)
+
+    async def main():
+        closing = asyncio.Event()
+        release = asyncio.Event()
+        clients = []
+
+        @contextlib.asynccontextmanager
+        async def fake_client(**kw):
+            clients.append(object())
+            try:
+                yield clients[-1]
+            finally:
+                closing.set()
+                await release.wait()  # client close still in flight
+
+        polled = []
+
+        async def poll_once(client):
+            polled.append(client)
+
+        monkeypatch.setattr(live_games, "make_async_client", fake_client)
+        hub = LiveHub()
+        monkeypatch.setattr(hub, "poll_once", poll_once)
+
+        q = hub.subscribe()
+        first = hub._task
+        await asyncio.sleep(0.02)
+        hub.unsubscribe(q)
+        await closing.wait()  # first poller left its loop, closing its client
+
+        hub.subscribe()
+        assert hub._task is not first and not hub._task.done()
+        release.set()
+        await asyncio.sleep(0.05)
+        assert first.done() and not hub._task.done()
+        assert polled[-1] is clients[1]
+        hub._subs.clear()
+        await hub._task
+
+    asyncio.run(main())
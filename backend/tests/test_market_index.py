@@ -0,0 +1,65 @@
+from app.models.market import MarketPlayerPrice, MarketVersion
+from app.services.market_index import MarketEntry, get_market_index
+
+SEASON = "2025-26"
+
+
+def _price(pid, position, team_id, price, season=SEASON):
+    return MarketPlayerPrice(season_id=season, player_id=pid, name=f"Player {pid}", position=position,
+                             team_id=team_id, team_name=f"Team {team_id}", price_current=price)
+
+
+def _version(db, season=SEASON):
+    return db.query(MarketVersion.version).filter_by(season_id=season).scalar()
+
+
+def test_index_rebuilds_only_when_market_version_changes(db):
+    db.add_all([_price("1", "BASE", "RMA", 100), _price("2", "PIVOT", "RMA", 250), _price("3", "BASE", "FCB", 80)])
+    db.commit()
+    assert _version(db) == 1
+
+    idx = get_market_index(db, SEASON)
+    assert len(idx) == 3 and "4" not in idx
+    assert idx.get("2") == MarketEntry("2", "Player 2", "PIVOT", "RMA", "Team RMA", 250)
+    assert idx.total_price(["1", "2", "4"]) == 350
+    assert idx.position_counts(["1", "2", "3"]) == {"BASE": 2, "PIVOT": 1}
+    assert idx.team_counts(["1", "2", "3", "4"]) == {"RMA": 2, "FCB": 1}
+    assert idx.missing(["1", "4"]) == {"4"}
+    assert get_market_index(db, SEASON) is idx  # same version: no rebuild
+
+    # ORM update
+    db.query(MarketPlayerPrice).filter_by(player_id="2").one().price_current = 300
+    db.commit()
+    assert _version(db) == 2
+    idx2 = get_market_index(db, SEASON)
+    assert idx2 is not idx and idx2.get("2").price_current == 300
+
+    # ORM insert + delete in one flush
+    db.add(_price("4", "ALERO", "BAS", 120))
+    db.delete(db.query(MarketPlayerPrice).filter_by(player_id="3").one())
+    db.commit()
+    idx3 = get_market_index(db, SEASON)
+    assert idx3.version == _version(db) == 3
+    assert "3" not in idx3 and idx3.get("4").team_id == "BAS"
+
+    # Bulk query update (season unknown to the hook: every season is bumped)
+    db.query(MarketPlayerPrice).filter(MarketPlayerPrice.position == "BASE").update({"price_current": 90})
+    db.commit()
+    assert get_market_index(db, SEASON).get("1").price_current == 90
+
+    # A rolled-back write doesn't bump the version
+    db.query(MarketPlayerPrice).filter_by(player_id="1").one().price_current = 1
+    db.flush()
+    db.rollback()
+    v = _version(db)
+    assert get_market_index(db, SEASON).get("1").price_current == 90 and get_market_index(db, SEASON).version == v
+
+
+def test_other_season_writes_keep_the_index(db):
+    db.add(_price("1", "BASE", "RMA", 100))
+    db.commit()
+    idx = get_market_index(db, SEASON)
+    db.add(_price("1", "BASE", "RMA", 999, season="2024-25"))
+    db.commit()
+    assert get_market_index(db, SEASON) is idx
+    assert get_market_index(db, "2024-25").get("1").price_current == 999
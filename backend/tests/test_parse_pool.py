@@ -0,0 +1,16 @@
+from app.scrapers import parse_pool
+
+
+def test_pools_are_keyed_by_size():
+    try:
+        one = parse_pool.get_parse_pool(1)
+        fut = one.submit(sum, [1, 2, 3])
+        two = parse_pool.get_parse_pool(2)
+        # Another size doesn't shut down the first pool or its running futures
+        assert two is not one
+        assert fut.result(timeout=60) == 6
+        assert parse_pool.get_parse_pool(1) is one
+        assert parse_pool.get_parse_pool(0) is None
+    finally:
+        parse_pool.shutdown_parse_pool()
+    assert parse_pool._pools == {}
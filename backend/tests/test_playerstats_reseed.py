@@ -0,0 +1,77 @@
+from datetime import datetime
+
+from app.crud import crud_game_player_stat
+from app.models.fixtures import Fixture
+from app.models.game_player_stats import GamePlayerStat, GameStatsDigest
+from app.schemas.wiki_games import ReseedPlayerStatsIn
+from app.services import playerstats_reseed
+from app.services.stats_fetch import GameFetchResult
+
+SEASON = "2025-26"
+GAMES = ["104501", "104502", "104503"]
+BAD = "104502"
+
+
+def _rows(gid):
+    return [{"acb_player_id": f"{gid}{i}", "play_time": "40:00", "minutes_seconds": 2400,
+             "plus_minus": i, "is_started": True} for i in range(3)]
+
+
+def _fake_fetch(game_ids, *, concurrency, on_result, final_game_ids):
+    for gid in game_ids:
+        on_result(GameFetchResult(acb_game_id=gid, rows=_rows(gid)))
+
+
+def test_one_bad_game_does_not_sink_its_batch(db, monkeypatch):
+    teams = [("BRE", "RMA"), ("FCB", "MAN"), ("GCA", "TEN")]
+    db.add_all([Fixture(season_id=SEASON, round_number=1, home_team_id=h, away_team_id=a, is_finished=True,
+                        kickoff_at=datetime(2025, 10, 4, 18, 0), acb_game_id=gid)
+                for (h, a), gid in zip(teams, GAMES)])
+    db.commit()
+
+    real_upsert = crud_game_player_stat.upsert_game_player_stats_bulk
+
+    def upsert(db, season_id, rows_by_game, **kw):
+        if BAD in rows_by_game:
+            raise ValueError("corrupt row")
+        return real_upsert(db, season_id, rows_by_game, **kw)
+
+    monkeypatch.setattr(playerstats_reseed, "upsert_game_player_stats_bulk", upsert)
+
+    out = playerstats_reseed.reseed_playerstats_from_final(
+        db, ReseedPlayerStatsIn(season_id=SEASON, rounds=1, replace=True), fetch=_fake_fetch
+    )
+
+    stored = {g for (g,) in db.query(GamePlayerStat.acb_game_id).distinct()}
+    assert stored == {"104501", "104503"}
+    assert {g for (g,) in db.query(GameStatsDigest.acb_game_id)} == {"104501", "104503"}
+    assert out.games_processed == 2 and out.rows_created == 6
+    assert len(out.warnings) == 1 and out.warnings[0].startswith(f"game_id={BAD} ")
+
+
+def test_games_without_rows_are_counted_and_warned(db):
+    db.add_all([Fixture(season_id=SEASON, round_number=1, home_team_id=h, away_team_id=a, is_finished=True,
+                        kickoff_at=datetime(2025, 10, 4, 18, 0), acb_game_id=gid)
+                for (h, a), gid in zip([("BRE", "RMA"), ("FCB", "MAN")], GAMES)])
+    db.commit()
+
+    def fetch(game_ids, *, concurrency, on_result, final_game_ids):
+        for gid in game_ids:
+            on_result(GameFetchResult(acb_game_id=gid, rows=[] if gid == GAMES[1] else _rows(gid)))
+
+    out = playerstats_reseed.reseed_playerstats_from_final(
+        db, ReseedPlayerStatsIn(season_id=SEASON, rounds=1), fetch=fetch
+    )
+
+    assert (out.games_found, out.games_processed, out.games_empty) == (2, 1, 1)
+    assert out.warnings == [f"game_id={GAMES[1]} fixture_id=2: no player rows parsed"]
+
+
+def test_bulk_statements_stay_under_999_parameters(db, bound_params):
+    rows = {str(100000 + g): _rows(str(100000 + g)) for g in range(300)}  # 900 rows
+    assert crud_game_player_stat.upsert_game_player_stats_bulk(db, SEASON, rows)["created"] == 900
+    crud_game_player_stat.save_game_digests(db, SEASON, {g: ("h", 3, True) for g in rows})
+    # Every player moved: the prune deletes all 900 through the (game, player) IN list
+    moved = {g: [{**r, "acb_player_id": r["acb_player_id"] + "x"} for r in rs] for g, rs in rows.items()}
+    assert crud_game_player_stat.upsert_game_player_stats_bulk(db, SEASON, moved, prune_missing=True)["deleted"] == 900
+    assert max(bound_params) <= 999
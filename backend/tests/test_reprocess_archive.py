@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from app.core.game_config import ACB_COMPETICION_ID, ACB_JORNADA_ID_ROUND1
+from app.crud.crud_round_state import get_round_state
+from app.models.fixtures import Fixture
+from app.scrapers.acb_partidos import PARTIDOS_URL, ParsedFixture
+from app.seed import reprocess_archive
+
+SEASON = "2025-26"
+KO = datetime(2025, 10, 4, 18, 0)
+
+
+class _FakeArchive:
+    def __init__(self, rounds):
+        self.rounds = rounds
+
+    def iter_latest(self, prefix=""):
+        for rn in self.rounds:
+            url = PARTIDOS_URL.format(competicion=ACB_COMPETICION_ID, jornada_id=ACB_JORNADA_ID_ROUND1 + rn - 1)
+            yield SimpleNamespace(url=url, text=f"<html>{rn}</html>")
+
+
+def _season(db):
+    # Round 2's BRE-RMA was moved past the start of round 3: postponed
+    db.add_all([
+        Fixture(season_id=SEASON, round_number=1, home_team_id="FCB", away_team_id="MAN", kickoff_at=KO),
+        Fixture(season_id=SEASON, round_number=2, home_team_id="FCB", away_team_id="RMA",
+                kickoff_at=KO + timedelta(days=7)),
+        Fixture(season_id=SEASON, round_number=2, home_team_id="BRE", away_team_id="RMA",
+                kickoff_at=KO + timedelta(days=30), is_postponed=True),
+        Fixture(season_id=SEASON, round_number=3, home_team_id="MAN", away_team_id="BRE",
+                kickoff_at=KO + timedelta(days=14)),
+    ])
+    db.commit()
+
+
+def _parsed(rn, home, away, kickoff=None):
+    return ParsedFixture(round_number=rn, home_team_id=home, away_team_id=away, kickoff_at=kickoff,
+                         is_finished=False, home_score=None, away_score=None, is_postponed=False,
+                         is_advanced=False, source_url="")
+
+
+def test_partial_run_keeps_postponed_flags(db, monkeypatch):
+    _season(db)
+    # Skeleton page for round 2: no kickoffs, so the stored ones are kept
+    monkeypatch.setattr(reprocess_archive, "parse_partidos_html",
+                        lambda html, **kw: [_parsed(2, "FCB", "RMA"), _parsed(2, "BRE", "RMA")])
+
+    out = reprocess_archive.reprocess_partidos(db, _FakeArchive([2]), season_id=SEASON,
+                                               start_round=2, end_round=2, workers=0)
+
+    assert (out["rounds"], out["updated"]) == (1, 2)
+    f = db.query(Fixture).filter_by(round_number=2, home_team_id="BRE").one()
+    assert (f.is_postponed, f.kickoff_at) == (True, KO + timedelta(days=30))
+    assert get_round_state(db, SEASON, 2).n_relevant == 1
+
+
+def test_partial_run_recomputes_flags_from_new_kickoffs(db, monkeypatch):
+    _season(db)
+    # The postponed game was brought back inside its round
+    monkeypatch.setattr(reprocess_archive, "parse_partidos_html", lambda html, **kw: [
+        _parsed(2, "FCB", "RMA", KO + timedelta(days=7)),
+        _parsed(2, "BRE", "RMA", KO + timedelta(days=8)),
+    ])
+
+    reprocess_archive.reprocess_partidos(db, _FakeArchive([2]), season_id=SEASON,
+                                         start_round=2, end_round=2, workers=0)
+
+    f = db.query(Fixture).filter_by(round_number=2, home_team_id="BRE").one()
+    db.refresh(f)
+    assert f.is_postponed is False
+    assert get_round_state(db, SEASON, 2).n_relevant == 2
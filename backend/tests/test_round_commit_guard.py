@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import update
+
+from app.api.routes.team import _guard_market_for_action
+from app.models.fixtures import Fixture
+from app.models.jobs import WorkerHeartbeat
+from app.models.user import User
+from app.services.jobs import round_commit_worker_alive, worker_heartbeat
+from app.services.market_utils import commit_round_if_needed
+
+SEASON = "2025-26"
+
+
+@pytest.fixture
+def closed_market(db):
+    # Round 1 kicked off an hour ago: market closed since 2h ago
+    ko = datetime.now() - timedelta(hours=1)
+    db.add(User(user_id=1, email="u@test", password_hash="x", team_name="t", username="u"))
+    db.add(Fixture(season_id=SEASON, round_number=1, home_team_id="BRE", away_team_id="RMA", kickoff_at=ko))
+    db.commit()
+    return db
+
+
+@pytest.mark.parametrize("action", ["ADD", "UNDO", "REMOVE", "CAPTAIN", "RESET"])
+def test_edits_blocked_until_round_is_committed(closed_market, action):
+    with pytest.raises(HTTPException) as e:
+        _guard_market_for_action(closed_market, 1, action)
+    assert e.value.status_code == 503 and e.value.detail == "Round commit pending"
+
+
+def test_repair_allowed_once_committed(closed_market):
+    assert commit_round_if_needed(closed_market) == 1
+    ms, active_round, _st = _guard_market_for_action(closed_market, 1, "ADD")  # empty draft: repair
+    assert not ms.is_open and active_round == 1
+    with pytest.raises(HTTPException) as e:
+        _guard_market_for_action(closed_market, 1, "REMOVE")
+    assert e.value.status_code == 403
+
+
+def test_round_commit_worker_heartbeat(db):
+    assert not round_commit_worker_alive(db)
+    worker_heartbeat(db, "host:1", round_commit=False)
+    assert not round_commit_worker_alive(db)
+    worker_heartbeat(db, "host:2", round_commit=True)
+    assert round_commit_worker_alive(db)
+    db.execute(update(WorkerHeartbeat).values(last_seen_at=datetime.utcnow() - timedelta(hours=1)))
+    db.commit()
+    assert not round_commit_worker_alive(db)
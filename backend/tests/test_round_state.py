@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta
+
+from app.crud.crud_round_state import backfill_round_state, get_active_round_state, get_round_state
+from app.models.fixtures import Fixture
+from app.models.round_state import RoundState
+from app.schemas.wiki_fixtures import ReseedFixturesIn
+from app.services import fixtures_reseed
+
+SEASON = "2025-26"
+
+
+def _fixtures(db):
+    ko = datetime(2025, 10, 4, 18, 0)
+    db.add_all([
+        Fixture(season_id=SEASON, round_number=1, home_team_id="BRE", away_team_id="RMA", kickoff_at=ko),
+        Fixture(season_id=SEASON, round_number=1, home_team_id="FCB", away_team_id="MAN", kickoff_at=ko),
+        Fixture(season_id=SEASON, round_number=2, home_team_id="RMA", away_team_id="FCB",
+                kickoff_at=ko + timedelta(days=7)),
+    ])
+    db.commit()
+
+
+def test_orm_writes_maintain_round_state(db):
+    _fixtures(db)
+    st = get_round_state(db, SEASON, 1)
+    assert (st.n_fixtures, st.n_unfinished, st.is_resolved) == (2, 2, False)
+    assert get_active_round_state(db, SEASON).round_number == 1
+
+    for f in db.query(Fixture).filter_by(round_number=1):
+        f.is_finished = True
+    db.commit()
+    assert get_round_state(db, SEASON, 1).is_resolved
+    assert get_active_round_state(db, SEASON).round_number == 2
+
+
+def test_replace_rounds_drops_rounds_left_empty(db, monkeypatch):
+    _fixtures(db)
+    # acb.com returns nothing for round 1 this time
+    monkeypatch.setattr(fixtures_reseed, "scrape_partidos", lambda **kw: [])
+
+    out = fixtures_reseed.reseed_fixtures_from_acb(
+        db, ReseedFixturesIn(season_id=SEASON, start_round_number=1, rounds=1, replace_rounds=True)
+    )
+
+    assert out.rounds_incomplete[0]["parsed"] == 0
+    assert db.query(Fixture).filter_by(round_number=1).count() == 0
+    assert get_round_state(db, SEASON, 1) is None
+    assert get_active_round_state(db, SEASON).round_number == 2
+
+
+def test_reads_have_no_side_effects_and_backfill_covers_every_round(db):
+    _fixtures(db)
+    # Pre-round_state DB, then one ORM write touches round 2 only
+    db.execute(RoundState.__table__.delete())
+    db.commit()
+    f = db.query(Fixture).filter_by(round_number=2).one()
+    f.is_finished = True
+    db.commit()
+
+    assert get_round_state(db, SEASON, 1) is None
+    assert get_active_round_state(db, SEASON).round_number == 2  # partial data, nothing written
+    assert db.query(RoundState).count() == 1
+
+    assert backfill_round_state(db) == [SEASON]
+    db.commit()
+    assert get_active_round_state(db, SEASON).round_number == 1
+    assert backfill_round_state(db) == []
@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+
+from app.models.fixtures import Fixture
+from app.models.game_player_stats import GamePlayerStat, GameStatsDigest
+from app.schemas.wiki_games import IngestGameStatsIn
+from app.scrapers.acb_live_stats import box_score_reached_regulation, parse_box_score_tuples, rows_from_box
+from app.services import stats_ingest
+from app.services.jobs import RetryLater
+from tests.box_score_pages import uniform_game
+
+SEASON = "2025-26"
+GAME_ID = "104459"
+
+END_OF_REGULATION = uniform_game("40:00", points=15)  # tied at the buzzer, overtime follows
+OVERTIME = uniform_game("45:00", points=19)
+
+
+class _FakeCache:
+    def __init__(self):
+        self.touched = []
+
+    def touch(self, url, *, immutable=False):
+        self.touched.append((url, immutable))
+
+
+@pytest.fixture
+def ingest(db, monkeypatch):
+    db.add(Fixture(season_id=SEASON, round_number=1, home_team_id="BRE", away_team_id="RMA",
+                   kickoff_at=datetime(2025, 10, 12, 18, 30), acb_game_id=GAME_ID))
+    db.commit()
+
+    page = {"html": END_OF_REGULATION}
+    cache = _FakeCache()
+    monkeypatch.setattr(stats_ingest, "fetch_live_stats_html", lambda gid: page["html"])
+    monkeypatch.setattr(stats_ingest, "get_cache", lambda: cache)
+
+    def run(html):
+        page["html"] = html
+        return stats_ingest.ingest_game_stats(db, IngestGameStatsIn(season_id=SEASON, acb_game_id=GAME_ID))
+
+    run.cache = cache
+    return run
+
+
+def _fixture(db):
+    db.expire_all()
+    return db.query(Fixture).filter_by(acb_game_id=GAME_ID).one()
+
+
+def _digest(db):
+    return db.query(GameStatsDigest).filter_by(season_id=SEASON, acb_game_id=GAME_ID).one_or_none()
+
+
+def _age_digest(db, minutes):
+    db.execute(update(GameStatsDigest).values(updated_at=datetime.utcnow() - timedelta(minutes=minutes)))
+    db.commit()
+
+
+def test_regulation_minutes_alone_are_not_final():
+    # The hazard: the minutes check already passes at the end of regulation
+    assert box_score_reached_regulation(rows_from_box(parse_box_score_tuples(END_OF_REGULATION)))
+
+
+def test_end_of_regulation_then_overtime(db, ingest):
+    with pytest.raises(RetryLater):
+        ingest(END_OF_REGULATION)
+    assert not _fixture(db).is_finished
+    assert _digest(db).is_final is False
+    assert db.query(GamePlayerStat).count() == 0
+    assert ingest.cache.touched == []
+
+    # Overtime under way / over: different content => starts a new stability window
+    _age_digest(db, 30)
+    with pytest.raises(RetryLater, match="changed"):
+        ingest(OVERTIME)
+    assert not _fixture(db).is_finished
+
+    # Same content again, but too soon
+    with pytest.raises(RetryLater, match="not long enough"):
+        ingest(OVERTIME)
+    assert not _fixture(db).is_finished
+    assert ingest.cache.touched == []
+
+    # Same content INGEST_FINAL_STABLE_MIN later: final
+    _age_digest(db, 10)
+    out = ingest(OVERTIME)
+    assert out.marked_finished
+    assert _fixture(db).is_finished
+    assert _digest(db).is_final is True
+    seconds = {s for (s,) in db.query(GamePlayerStat.minutes_seconds)}
+    assert seconds == {45 * 60}  # overtime stats, not the frozen end-of-regulation ones
+    assert ingest.cache.touched == [(stats_ingest.LIVE_STATS_URL.format(game_id=GAME_ID), True)]
+
+
+def test_finished_in_partidos_is_final_right_away(db, ingest):
+    f = _fixture(db)
+    f.is_finished = True
+    db.commit()
+    out = ingest(OVERTIME)
+    assert not out.marked_finished
+    assert _digest(db).is_final is True
+    assert db.query(GamePlayerStat).count() == 10
+
+
+def test_partial_box_score_is_not_stored(db, ingest):
+    with pytest.raises(RetryLater, match="player-minutes"):
+        ingest(uniform_game("30:00", points=10))
+    assert _digest(db) is None
@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.routes import team
+from app.core.security import get_current_user
+from app.db.session import get_db
+from app.models.fixtures import Fixture
+from app.models.market import MarketPlayerPrice
+from app.models.roster import UserCaptain, UserDraftAction, UserRosterBase, UserRosterDraft, UserSeasonState
+from app.models.user import User
+
+SEASON = "2025-26"
+POSITIONS = ["BASE", "BASE", "ESCOLTA", "ESCOLTA", "ALERO", "ALERO", "ALA-PIVOT", "ALA-PIVOT", "PIVOT", "PIVOT"]
+TEAM = [f"p{i:02d}" for i in range(1, 11)]  # one real team each, 400k each, captain p01
+
+
+@pytest.fixture
+def client(db):
+    prices = [(pid, pos, f"T{i}", 400_000) for i, (pid, pos) in enumerate(zip(TEAM, POSITIONS), start=1)]
+    prices += [("x1", "BASE", "T1", 300_000), ("x2", "BASE", "T11", 2_000_000), ("x3", "PIVOT", "T1", 100_000)]
+    db.add_all([
+        MarketPlayerPrice(season_id=SEASON, player_id=pid, name=pid, position=pos, team_id=t, team_name=t,
+                          price_current=price)
+        for pid, pos, t, price in prices
+    ])
+    db.add(User(user_id=1, email="u@test", password_hash="x", team_name="t", username="u"))
+    db.add(UserSeasonState(user_id=1, season_id=SEASON, budget_base=1_000_000, budget_current=1_000_000))
+    db.add_all([model(user_id=1, season_id=SEASON, player_id=pid) for pid in TEAM
+                for model in (UserRosterBase, UserRosterDraft)])
+    db.add(UserCaptain(user_id=1, season_id=SEASON, captain_player_id="p01"))
+    db.commit()
+
+    app = FastAPI()
+    app.include_router(team.router)
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: db.get(User, 1)
+    return TestClient(app)
+
+
+def _batch(client, *ops):
+    return client.post("/api/v1/me/team/batch", json={"ops": [{"op": op, "player_id": pid} for op, pid in ops]})
+
+
+def _state(db):
+    db.expire_all()
+    st = db.query(UserSeasonState).filter_by(user_id=1).one()
+    cap = db.query(UserCaptain).filter_by(user_id=1).one()
+    return (
+        sorted(r.player_id for r in db.query(UserRosterDraft).filter_by(user_id=1)),
+        st.budget_current,
+        cap.captain_player_id,
+        [(a.action, a.player_id) for a in db.query(UserDraftAction).order_by(UserDraftAction.id)],
+    )
+
+
+def test_batch_is_all_or_nothing(client, db):
+    before = _state(db)
+
+    r = _batch(client, ("REMOVE", "p02"), ("ADD", "x1"), ("ADD", "nope"))
+    assert r.status_code == 404 and r.json()["detail"] == "ops[2] ADD nope: Player not found in market"
+    assert _state(db) == before
+
+    # Every op is valid alone, the final draft isn't: x1 + x3 + p01 = 3 players of T1
+    r = _batch(client, ("REMOVE", "p02"), ("REMOVE", "p10"), ("ADD", "x1"), ("ADD", "x3"))
+    assert r.status_code == 400 and r.json()["detail"] == "Max 2 players per real team"
+    assert _state(db) == before
+
+
+def test_budget_is_checked_on_the_final_draft(client, db):
+    db.query(UserSeasonState).filter_by(user_id=1).update({"budget_current": 100_000})
+    db.commit()
+
+    r = _batch(client, ("REMOVE", "p02"), ("ADD", "x2"))
+    assert r.status_code == 400 and r.json()["detail"] == "Not enough budget"
+
+    # ADD first would be over budget (and over 10 players) on its own: fine once REMOVE is applied
+    r = _batch(client, ("ADD", "x1"), ("REMOVE", "p02"))
+    assert r.status_code == 200, r.text
+    assert r.json() == {"ok": True, "budget": 200_000, "count": 10, "captain_player_id": "p01", "applied": 2}
+    draft, budget, captain, actions = _state(db)
+    assert "x1" in draft and "p02" not in draft and budget == 200_000
+    assert actions == [("ADD", "x1"), ("REMOVE", "p02")]
+
+    # UNDO of that REMOVE: needs the slot and the budget back
+    r = _batch(client, ("REMOVE", "x1"), ("UNDO", "p02"))
+    assert r.status_code == 200 and r.json()["budget"] == 100_000
+
+
+def test_captain_rules(client, db):
+    r = _batch(client, ("REMOVE", "p01"), ("ADD", "x1"))
+    assert r.status_code == 400
+    assert r.json()["detail"] == "You must change captain before removing the current captain"
+
+    r = _batch(client, ("CAPTAIN", "x1"))
+    assert r.status_code == 400 and r.json()["detail"] == "Captain must be in your current team"
+
+    # New captain added in the same batch, old one sold
+    r = _batch(client, ("REMOVE", "p01"), ("ADD", "x1"), ("CAPTAIN", "x1"))
+    assert r.status_code == 200, r.text
+    assert _state(db)[2] == "x1"
+
+
+def test_closed_market_before_round_commit(client, db):
+    db.add(Fixture(season_id=SEASON, round_number=1, home_team_id="T1", away_team_id="T2",
+                   kickoff_at=datetime.now() - timedelta(hours=1)))
+    db.commit()
+    before = _state(db)
+
+    r = _batch(client, ("REMOVE", "p02"), ("ADD", "x1"))
+    assert r.status_code == 503 and r.json()["detail"] == "Round commit pending"
+    assert "retry-after" in r.headers
+    assert _state(db) == before
+
+
+def test_empty_batch_is_rejected(client):
+    assert client.post("/api/v1/me/team/batch", json={"ops": []}).status_code == 422
@@ -0,0 +1,221 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.scrapers import throttle
+from app.scrapers.throttle import CircuitOpenError, ResilientTransport, get_host_policy
+
+URL = "https://acb.com/partido/estadisticas/id/1"
+
+
+@pytest.fixture(autouse=True)
+def _breaker(monkeypatch):
+    # Opens on the first failure; cooldown 0 => the next request is the half-open probe
+    monkeypatch.setattr(settings, "SCRAPER_BREAKER_FAILURES", 1)
+    monkeypatch.setattr(settings, "SCRAPER_BREAKER_COOLDOWN_S", 0.0)
+    throttle.reset_host_policies()
+    yield
+    throttle.reset_host_policies()
+
+
+def _handler(outcomes):
+    def handle(request):
+        out = outcomes.pop(0)
+        if isinstance(out, BaseException):
+            raise out
+        return httpx.Response(out, request=request)
+    return handle
+
+
+def _transport(outcomes):
+    handle = _handler(outcomes)
+
+    async def ahandle(request):
+        return handle(request)
+
+    return ResilientTransport(sync_inner=httpx.MockTransport(handle), async_inner=httpx.MockTransport(ahandle),
+                              retries=0, rate_limit=False)
+
+
+@pytest.mark.parametrize("error", [ValueError("boom"), httpx.DecodingError("bad gzip"), KeyboardInterrupt()])
+def test_probe_released_when_it_raises(error):
+    t = _transport([503, error, 200])
+    with httpx.Client(transport=t) as c:
+        assert c.get(URL).status_code == 503  # opens the circuit
+        with pytest.raises(type(error)):
+            c.get(URL)  # the probe
+        breaker = get_host_policy("acb.com").breaker
+        assert breaker.state == "half_open"
+        assert c.get(URL).status_code == 200  # not blocked: the next probe goes out and closes it
+    assert breaker.state == "closed"
+
+
+def test_async_probe_released_when_cancelled():
+    async def main():
+        started = asyncio.Event()
+
+        async def hang(request):
+            started.set()
+            await asyncio.sleep(3600)
+
+        t = ResilientTransport(async_inner=httpx.MockTransport(hang), retries=0, rate_limit=False)
+        breaker = get_host_policy("acb.com").breaker
+        breaker.record_failure()  # open
+        async with httpx.AsyncClient(transport=t) as c:
+            task = asyncio.create_task(c.get(URL))
+            await started.wait()
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+        return breaker
+
+    breaker = asyncio.run(main())
+    assert breaker.state == "half_open" and breaker.allow()
+
+
+def test_open_circuit_fails_fast(monkeypatch):
+    monkeypatch.setattr(settings, "SCRAPER_BREAKER_COOLDOWN_S", 3600.0)
+    throttle.reset_host_policies()
+    t = _transport([503])
+    with httpx.Client(transport=t) as c:
+        c.get(URL)
+        with pytest.raises(CircuitOpenError):
+            c.get(URL)
+
+
+class _Clock:
+    """Fake time.monotonic/time.sleep: sleeping advances the clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, s):
+        self.sleeps.append(s)
+        self.now += s
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    c = _Clock()
+    monkeypatch.setattr(throttle.time, "monotonic", c.monotonic)
+    monkeypatch.setattr(throttle.time, "sleep", c.sleep)
+    monkeypatch.setattr(throttle.random, "uniform", lambda a, b: 0.0)  # no backoff jitter
+    return c
+
+
+def _responses(*specs):
+    # (status, Retry-After or None) per attempt; returns (transport, calls)
+    calls = []
+
+    def handle(request):
+        status, retry_after = specs[len(calls)]
+        calls.append(request)
+        headers = {"Retry-After": retry_after} if retry_after is not None else {}
+        return httpx.Response(status, headers=headers, request=request)
+
+    return handle, calls
+
+
+def _http_date(seconds_from_now):
+    return format_datetime(datetime.now(timezone.utc) + timedelta(seconds=seconds_from_now), usegmt=True)
+
+
+def test_retry_after_parsing():
+    def parse(value):
+        headers = {"Retry-After": value} if value is not None else {}
+        return throttle.retry_after_s(httpx.Response(429, headers=headers))
+
+    assert parse("7") == 7.0
+    assert 25 < parse(_http_date(30)) <= 30
+    assert parse(_http_date(-30)) == 0.0  # already past
+    assert parse(None) is None
+    assert parse("soon") is None
+
+
+@pytest.mark.parametrize("retry_after", ["5", "http-date"])
+def test_retry_after_is_honoured_and_pauses_the_host(clock, retry_after):
+    value = _http_date(5) if retry_after == "http-date" else retry_after
+    handle, calls = _responses((429, value), (200, None))
+    t = ResilientTransport(sync_inner=httpx.MockTransport(handle), retries=2)
+    with httpx.Client(transport=t) as c:
+        assert c.get(URL).status_code == 200
+    assert len(calls) == 2
+    assert 4 < clock.sleeps[0] <= 5  # waited Retry-After, not the (zero) backoff
+    # The whole host was paused, not just this request
+    assert get_host_policy("acb.com").bucket._paused_until == pytest.approx(1000.0 + clock.sleeps[0], abs=1)
+
+
+def test_retry_after_beyond_max_returns_the_response(clock):
+    handle, calls = _responses((503, "600"), (200, None))
+    t = ResilientTransport(sync_inner=httpx.MockTransport(handle), retries=3, retry_after_max_s=120.0)
+    with httpx.Client(transport=t) as c:
+        assert c.get(URL).status_code == 503
+    assert len(calls) == 1 and clock.sleeps == []
+    assert get_host_policy("acb.com").bucket._paused_until == 0.0
+
+
+def test_429_does_not_trip_the_breaker(clock):
+    # Breaker opens on the first failure (autouse fixture): 429 isn't one, 503 is
+    handle, calls = _responses((429, None), (429, None), (200, None), (503, None))
+    t = ResilientTransport(sync_inner=httpx.MockTransport(handle), retries=0, rate_limit=False)
+    breaker = get_host_policy("acb.com").breaker
+    with httpx.Client(transport=t) as c:
+        assert c.get(URL).status_code == 429
+        assert c.get(URL).status_code == 429
+        assert breaker.state == "closed" and breaker.failures == 0
+        assert c.get(URL).status_code == 200
+        assert c.get(URL).status_code == 503
+    assert breaker.state != "closed"
+
+
+def test_token_bucket_waits(clock):
+    bucket = throttle.TokenBucket(rate_per_s=2.0, burst=2)
+    assert [bucket.reserve() for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]  # burst, then 1 / rate each
+    clock.now += 1.5  # refill 3 tokens over the -2 owed: 1 available, then queued again
+    assert [bucket.reserve() for _ in range(2)] == [0.0, 0.5]
+
+    unlimited = throttle.TokenBucket(rate_per_s=0, burst=1)
+    assert [unlimited.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    unlimited.pause(3.0)
+    assert unlimited.reserve() == 3.0
+
+
+def test_transport_waits_for_the_bucket(clock, monkeypatch):
+    monkeypatch.setattr(settings, "SCRAPER_RATE_PER_HOST_S", 4.0)
+    monkeypatch.setattr(settings, "SCRAPER_RATE_BURST", 1)
+    throttle.reset_host_policies()
+    handle, calls = _responses(*[(200, None)] * 3)
+    t = ResilientTransport(sync_inner=httpx.MockTransport(handle))
+    with httpx.Client(transport=t) as c:
+        for _ in range(3):
+            c.get(URL)
+    assert clock.sleeps == [0.25, 0.25]  # first request uses the burst token
+
+
+def test_async_retry_after_is_honoured(monkeypatch):
+    slept = []
+
+    async def fake_sleep(s):
+        slept.append(s)
+
+    monkeypatch.setattr(throttle.asyncio, "sleep", fake_sleep)
+    handle, calls = _responses((429, "3"), (200, None))
+
+    async def ahandle(request):
+        return handle(request)
+
+    async def main():
+        t = ResilientTransport(async_inner=httpx.MockTransport(ahandle), retries=1, rate_limit=False)
+        async with httpx.AsyncClient(transport=t) as c:
+            return (await c.get(URL)).status_code
+
+    assert asyncio.run(main()) == 200
+    assert len(calls) == 2 and slept[0] >= 3.0